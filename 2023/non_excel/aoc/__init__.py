@@ -0,0 +1,11 @@
+"""
+Shared tooling for the 2023 non-excel solutions
+
+Every day lives in its own dayNN directory, as a standalone script following
+template.py: an Input class parsing the input file, and Part1/Part2 classes
+taking the parsed input and returning the answer from run().
+
+This package contains code to find, load and run those days, and helpers that
+are shared between multiple days. A single day can be run with
+python3 -m aoc 2023 <day> [--part N] <input file>, see aoc.__main__.
+"""
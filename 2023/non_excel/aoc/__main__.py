@@ -0,0 +1,101 @@
+"""
+Run a single day, importing only that day
+
+Usage: python3 -m aoc 2023 <day> [--part N] [--selftest] [--mapped] [--map-dir DIR] [-p name=value ...] [<input file>]
+
+Solves both parts, or only --part, and prints the answers as the day scripts
+do. Unlike the day scripts, doctests are only run with --selftest, which runs
+the doctests of the modules of the requested parts, before solving if an input
+is given.
+
+--mapped loads the grids of grid days as memory mapped grids, see aoc.mmgrid,
+backed by temporary files in --map-dir, which implies --mapped.
+
+-p passes keyword parameters to the parts taking them, for example
+-p max_dist=6 for day21 Part1. A parameter no part takes is an error.
+"""
+
+import os
+import sys
+import argparse
+
+from aoc.days import get_day, load_module, parse_param
+
+YEAR = 2023
+
+def _parameters(Part):
+    """
+    Get names of the keyword parameters of Part
+    """
+    # Imported when used, as inspect is slow to import
+    import inspect
+    return set(inspect.signature(Part).parameters)
+
+def selftest(day, parts):
+    """
+    Run doctests of the source files of parts. Returns number of failures
+    """
+    import doctest
+    failed = 0
+    for path in dict.fromkeys(day.source(part) for part in parts):
+        result = doctest.testmod(load_module(path))
+        print(f"{day} {path}: {result.attempted} tests, {result.failed} failed", file=sys.stderr)
+        failed += result.failed
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m aoc", description="Solve a single day")
+    parser.add_argument("year", type=int)
+    parser.add_argument("day", type=int)
+    parser.add_argument("input", nargs="?", help="input file")
+    parser.add_argument("--part", type=int, choices=[1, 2], help="part to solve (default: both)")
+    parser.add_argument("--selftest", action="store_true", help="run doctests of the day")
+    parser.add_argument("--mapped", action="store_true", help="load grids memory mapped")
+    parser.add_argument("--map-dir", metavar="DIR", help="directory of temporary files of mapped grids")
+    parser.add_argument("-p", "--param", type=parse_param, action="append", default=[], help="parameter to PartN, as name=value")
+    args = parser.parse_intermixed_args(argv)
+
+    if args.year != YEAR:
+        parser.error(f"only {YEAR} is available")
+    if args.input is None and not args.selftest:
+        parser.error("an input file is required, unless running --selftest")
+    try:
+        day = get_day(args.day)
+    except LookupError as e:
+        parser.error(str(e))
+    parts = [args.part] if args.part else day.parts()
+    if len(parts) == 0 or day.source(parts[0]) is None:
+        parser.error(f"{day} has no Part{args.part}")
+
+    if args.mapped or args.map_dir is not None:
+        from aoc import mmgrid
+        mmgrid.enable(args.map_dir)
+
+    if args.selftest and selftest(day, parts) > 0:
+        return 1
+    if args.input is None:
+        return 0
+
+    params = dict(args.param)
+    loaded = [(part, *day.load(part)) for part in parts]
+    taken = {part: _parameters(Part) for part, Input, Part in loaded} if len(params) > 0 else {}
+    for name in params:
+        if not any(name in names for names in taken.values()):
+            parser.error(f"no part of {day} takes parameter {name}")
+
+    load = lambda Input, path: Input(path)
+    if os.environ.get("AOC_CACHE", "") != "":
+        # Imported when used, as it is slow to import
+        from aoc.cache import load_input as load
+
+    # Parts from the same source share the parsed input, as in the day scripts
+    inputs = {}
+    for part, Input, Part in loaded:
+        if Input not in inputs:
+            inputs[Input] = load(Input, args.input)
+        kwargs = {k: v for k, v in params.items() if k in taken[part]}
+        print(f"Part{part}: {Part(inputs[Input], **kwargs).run()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
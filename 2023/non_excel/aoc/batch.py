@@ -0,0 +1,137 @@
+"""
+Run the parts of a day against many input files
+
+Usage: python3 -m aoc.batch [-j jobs] [-f csv|json] <day> <dir, glob or file> ...
+       ./parts.py --batch[=FORMAT] [--jobs=N] <dir, glob or file> ...
+
+Directories are expanded to all files in them. Each input is a job in a
+process pool of at most jobs workers, parsed once and solved for all parts.
+Jobs are submitted largest input first, so a big input isn't left running alone
+at the end while the other workers are idle.
+
+Results are streamed as each job finishes, either as csv with a header line, or
+as one json object per line, with the parse, wall and cpu time of each job.
+"""
+
+import os
+import sys
+import csv
+import glob
+import json
+import argparse
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aoc.days import Day, get_day
+from aoc.cache import load_input
+from aoc.runner import solve, timed
+
+FIELDS = ["input", "size", "day", "part", "parse_wall", "wall", "cpu", "answer", "error"]
+
+def expand(patterns):
+    """
+    List input files matching any of patterns, without duplicates
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(os.path.join(pattern, name) for name in os.listdir(pattern))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+        else:
+            matches = [pattern]
+        paths += [path for path in matches if os.path.isfile(path)]
+    return list(dict.fromkeys(paths))
+
+def solve_file(day_path, path):
+    """
+    Solve all parts of a day for one input, in a worker process. Parts with
+    the same Input class share the parsed input, and each reports the time
+    it took to parse
+    """
+    day = Day(day_path)
+    inputs = {}
+
+    def load(Input, path):
+        if Input not in inputs:
+            inputs[Input] = timed(lambda: load_input(Input, path))
+        return inputs[Input][0]
+
+    results = []
+    for part in day.parts():
+        result = solve(day_path, part, path, load=load)
+        if result.error is None:
+            Input, Part = day.load(part)
+            result.parse_wall = inputs[Input][1]
+        results.append(result)
+    return results
+
+def run_batch(day, paths, max_workers=None):
+    """
+    Run all parts of day for each input, and iterate the results as each
+    input finishes
+    """
+    jobs = sorted(((os.path.getsize(path), path) for path in paths), reverse=True)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(solve_file, day.path, path): size
+            for size, path in jobs
+        }
+        for future in as_completed(futures):
+            for result in future.result():
+                result.size = futures[future]
+                yield result
+
+class Writer:
+    def __init__(self, format, file=sys.stdout):
+        if format not in ["csv", "json"]:
+            raise ValueError(f"Unknown format {format}, expected csv or json")
+        self.format = format
+        self.file = file
+        if format == "csv":
+            self.csv = csv.writer(file)
+            self.csv.writerow(FIELDS)
+
+    def write(self, result):
+        row = {
+            "input": result.input_path,
+            "size": result.size,
+            "day": result.day,
+            "part": result.part,
+            "parse_wall": result.parse_wall,
+            "wall": result.wall,
+            "cpu": result.cpu,
+            "answer": result.answer,
+            "error": result.error,
+        }
+        if self.format == "csv":
+            self.csv.writerow(row[k] for k in FIELDS)
+        else:
+            print(json.dumps(row), file=self.file)
+        self.file.flush()
+
+def main(day, patterns, format="csv", max_workers=None):
+    """
+    Run a batch and write the results to stdout. Returns the exit status, which
+    is 1 if any job failed
+    """
+    writer = Writer(format)
+    paths = expand(patterns)
+    if len(paths) == 0:
+        print(f"No input files in {' '.join(patterns)}", file=sys.stderr)
+        return 1
+    failed = False
+    for result in run_batch(day, paths, max_workers):
+        writer.write(result)
+        failed = failed or result.error is not None
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.batch", description="Run a day against many inputs")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: cpu count)")
+    parser.add_argument("-f", "--format", choices=["csv", "json"], default="csv", help="output format (default: %(default)s)")
+    parser.add_argument("day", type=int, help="day to run")
+    parser.add_argument("inputs", nargs="+", help="input files, directories or glob patterns")
+    args = parser.parse_args()
+
+    sys.exit(main(get_day(args.day), args.inputs, args.format, args.jobs))
@@ -0,0 +1,188 @@
+"""
+Benchmark parsing and solving of every day
+
+Usage: python3 -m aoc.bench [-w warmup] [-r repeat] [-i input] [-o out.json] [day ...]
+
+Each iteration parses the input from scratch with Input(...), and times
+PartN(input).run() separately, so work done when creating PartN is included. The input is parsed for every iteration since
+some solvers extend their input while running (for example day09 Sequence),
+which would otherwise change the answer between iterations.
+
+Timing is done in-process, without the interpreter startup and doctests of the
+day scripts. Garbage collection is disabled during the timed calls, as timeit
+does.
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import contextlib
+import statistics
+
+from aoc.days import find_days
+from aoc.runner import jobs
+
+def percentile(samples, p):
+    """
+    Get percentile p (0-100) of samples, interpolating between closest ranks
+
+    >>> percentile([1, 2, 3, 4, 5], 50)
+    3
+    >>> percentile([1, 2, 3, 4, 5], 95)
+    4.8
+    >>> percentile([7], 95)
+    7
+    """
+    samples = sorted(samples)
+    pos = (len(samples) - 1) * p / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(samples) - 1)
+    if lo == hi or pos == lo:
+        return samples[lo]
+    return samples[lo] + (samples[hi] - samples[lo]) * (pos - lo)
+
+def mad(samples):
+    """
+    Median absolute deviation
+
+    >>> mad([1, 1, 2, 2, 4, 6, 9])
+    1
+    """
+    med = statistics.median(samples)
+    return statistics.median(abs(s - med) for s in samples)
+
+def summarize(samples):
+    """
+    Summarize a list of timings as a dict, suitable for json output
+    """
+    return {
+        'n': len(samples),
+        'median': statistics.median(samples),
+        'p95': percentile(samples, 95),
+        'mad': mad(samples),
+        'min': min(samples),
+        'max': max(samples),
+        'samples': samples,
+    }
+
+def _time_call(fn, disable_gc=True):
+    gc_was_enabled = gc.isenabled()
+    if disable_gc:
+        gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+def bench_part(day, part, input_path, warmup=1, repeat=5, disable_gc=True):
+    """
+    Benchmark a single part of a day
+
+    Returns a dict with parse and run summaries, and the answer from the last
+    iteration
+    """
+    Input, Part = day.load(part)
+    parse_times = []
+    run_times = []
+    answer = None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(warmup + repeat):
+            input, t_parse = _time_call(lambda: Input(input_path), disable_gc)
+            answer, t_run = _time_call(lambda: Part(input).run(), disable_gc)
+            if i >= warmup:
+                parse_times.append(t_parse)
+                run_times.append(t_run)
+
+    return {
+        'day': day.name,
+        'part': part,
+        'input': input_path,
+        'answer': str(answer),
+        'parse': summarize(parse_times),
+        'run': summarize(run_times),
+    }
+
+def bench(days, pattern, parts=(1, 2), warmup=1, repeat=5, disable_gc=True, progress=None):
+    """
+    Benchmark all parts of days, and return a json-serializable report
+    """
+    results = []
+    for day, part, path in jobs(days, pattern):
+        if part not in parts:
+            continue
+        try:
+            result = bench_part(day, part, path, warmup, repeat, disable_gc)
+        except Exception as e:
+            result = {'day': day.name, 'part': part, 'input': path, 'error': f"{type(e).__name__}: {e}"}
+        if progress is not None:
+            progress(result)
+        results.append(result)
+
+    return {
+        'meta': {
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'warmup': warmup,
+            'repeat': repeat,
+            'gc_disabled': disable_gc,
+        },
+        'results': results,
+    }
+
+def _fmt_ms(t):
+    return f"{t*1000:10.3f}"
+
+def print_result(result, file=sys.stdout):
+    if 'error' in result:
+        print(f"{result['day']:6} {result['part']:4}  <{result['error']}>", file=file)
+        return
+    parse = result['parse']
+    run = result['run']
+    print(
+        f"{result['day']:6} {result['part']:4} "
+        f"{_fmt_ms(parse['median'])} {_fmt_ms(run['median'])} {_fmt_ms(run['p95'])} {_fmt_ms(run['mad'])}"
+        f"  {result['answer']}",
+        file=file
+    )
+
+def print_header(file=sys.stdout):
+    print(f"{'day':6} {'part':>4} {'parse ms':>10} {'run ms':>10} {'p95 ms':>10} {'mad ms':>10}  answer", file=file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.bench", description="Benchmark parsing and solving of 2023 days")
+    parser.add_argument("-w", "--warmup", type=int, default=1, help="untimed iterations before measuring (default: %(default)s)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="timed iterations (default: %(default)s)")
+    parser.add_argument("-i", "--input", default="{day}/input.txt", help="input file pattern, formatted with {day} and {num} (default: %(default)s)")
+    parser.add_argument("-p", "--part", type=int, action="append", choices=[1, 2], help="only benchmark given part, may be repeated")
+    parser.add_argument("-o", "--output", help="write json report to file")
+    parser.add_argument("--gc", action="store_true", help="keep garbage collection enabled while timing")
+    parser.add_argument("days", nargs="*", type=int, help="days to benchmark (default: all)")
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    days = find_days(nums=args.days or None)
+
+    print_header()
+    report = bench(
+        days, args.input,
+        parts=args.part or (1, 2),
+        warmup=args.warmup,
+        repeat=args.repeat,
+        disable_gc=not args.gc,
+        progress=print_result
+    )
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
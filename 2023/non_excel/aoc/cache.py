@@ -0,0 +1,216 @@
+"""
+Opt-in on-disk cache for parsed inputs and expensive intermediate results
+
+The cache is enabled by setting AOC_CACHE to a directory. AOC_CACHE_SIZE sets
+max size in MB (default 1024). When full, least recently used entries are
+evicted.
+
+Entries are pickled, and keyed on:
+
+- the sha256 of the input file
+- the code version, which is a hash of all sources of the day, and of this
+  package
+- the source file, module and name of the Input class. A day run as a script
+  pickles its classes under __main__, which can't be loaded when the day is
+  imported as a module, so these are cached apart
+- for artifacts, the artifact name and parameters
+
+Parse an input with load_input(Input, path) instead of Input(path). The parsed
+input is then tagged with its cache key, so solvers can store intermediate
+results with artifact(input, name, fn, *params). If the cache is disabled, or
+the input isn't loaded through the cache, artifact() simply calls fn().
+
+Objects that can't be pickled are silently not cached. That includes inputs
+with mapped grids, see aoc.mmgrid, which are keyed apart from inputs in memory.
+"""
+
+import os
+import sys
+import pickle
+import hashlib
+
+_package_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Code versions, keyed on directory
+_versions = {}
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(repr(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def code_version(day_dir):
+    """
+    Hash of all python sources in day_dir and in this package
+    """
+    if day_dir not in _versions:
+        h = hashlib.sha256()
+        for d in [day_dir, _package_dir]:
+            for name in sorted(os.listdir(d)):
+                if name.endswith(".py"):
+                    h.update(name.encode())
+                    with open(os.path.join(d, name), "rb") as f:
+                        h.update(f.read())
+        _versions[day_dir] = h.hexdigest()
+    return _versions[day_dir]
+
+class Cache:
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.pickle")
+
+    def get(self, key):
+        """
+        Return the tuple (found, value)
+        """
+        path = self._file(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # Corrupt, or classes no longer loadable. Drop it
+            self.remove(key)
+            return False, None
+        # Mark as recently used
+        os.utime(path)
+        return True, value
+
+    def put(self, key, value):
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return False
+        if len(data) > self.max_bytes:
+            return False
+
+        path = self._file(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.evict()
+        return True
+
+    def remove(self, key):
+        try:
+            os.remove(self._file(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """
+        Remove least recently used entries until within max size
+        """
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith(".pickle"):
+                try:
+                    st = os.stat(os.path.join(self.path, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for mtime, size, name in entries)
+        entries.sort()
+        for mtime, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.path):
+            if name.endswith(".pickle"):
+                os.remove(os.path.join(self.path, name))
+
+def get_cache():
+    """
+    Get the cache configured by environment, or None if disabled
+    """
+    path = os.environ.get("AOC_CACHE", "")
+    if path == "":
+        return None
+    max_mb = int(os.environ.get("AOC_CACHE_SIZE", "1024"))
+    return Cache(path, max_mb << 20)
+
+def _source_file(cls):
+    return os.path.abspath(sys.modules[cls.__module__].__file__)
+
+def load_input(Input, f, *params):
+    """
+    Parse input through the cache
+
+    Extra params are passed on to Input, and are part of the key
+    """
+    cache = get_cache()
+    if cache is None or type(f) != str:
+        return Input(f, *params)
+
+    # Imported when used, as only grid days need it
+    from aoc import mmgrid
+    source = _source_file(Input)
+    key = _digest(
+        "input",
+        file_digest(f),
+        code_version(os.path.dirname(source)),
+        os.path.basename(source),
+        Input.__module__,
+        Input.__qualname__,
+        params,
+        mmgrid.enabled
+    )
+    found, input = cache.get(key)
+    if not found:
+        input = Input(f, *params)
+        input.cache_key = key
+        cache.put(key, input)
+    return input
+
+def artifact(input, name, fn, *params):
+    """
+    Get a named intermediate result derived from input
+
+    fn() is called to calculate it if not cached. The result is shared, so
+    callers must not modify it
+    """
+    cache = get_cache()
+    input_key = getattr(input, 'cache_key', None)
+    if cache is None or input_key is None:
+        return fn()
+
+    key = _digest("artifact", input_key, name, params)
+    found, value = cache.get(key)
+    if not found:
+        value = fn()
+        cache.put(key, value)
+    return value
+
+if __name__ == "__main__":
+    # Usage: python3 -m aoc.cache clear
+    cache = get_cache()
+    if cache is None:
+        print("Cache disabled, set AOC_CACHE to a directory to enable")
+        sys.exit(1)
+    if len(sys.argv) >= 2 and sys.argv[1] == "clear":
+        cache.clear()
+    else:
+        entries = [n for n in os.listdir(cache.path) if n.endswith(".pickle")]
+        size = sum(os.path.getsize(os.path.join(cache.path, n)) for n in entries)
+        print(f"{cache.path}: {len(entries)} entries, {size / (1 << 20):.1f} of {cache.max_bytes >> 20} MB")
@@ -0,0 +1,103 @@
+"""
+Detect when a sequence of states starts repeating
+
+Only a fingerprint of each state is stored, so memory per state is constant
+regardless of how large the state is. Fingerprints of bytes-like keys are
+64-bit blake2b digests, other keys use hash(), so keys can be bytes, strings,
+or tuples.
+
+A fingerprint match could in theory be a collision. With verify set, a match
+is only a candidate period. The full key at the match is kept, and the cycle
+is confirmed when the state one period later has an equal key. This costs
+stepping one extra period.
+
+>>> seq = [7, 0, 1, 2, 3, 4, 2, 3, 4, 2, 3, 4, 2, 3]
+>>> finder = CycleFinder()
+>>> for v in seq:
+...     if finder.add(v):
+...         break
+>>> finder.prefix, finder.period, finder.time
+(3, 3, 6)
+>>> seq[finder.time + finder.remaining(13)] == seq[13]
+True
+>>> finder = CycleFinder(verify=True)
+>>> any(finder.add(v) for v in seq)
+True
+>>> finder.prefix, finder.period, finder.time
+(3, 3, 9)
+
+States can be added at selected times only, as long as the repeats are too:
+
+>>> finder = CycleFinder(verify=True)
+>>> any(finder.add(v, t) for t, v in enumerate(seq) if v != 3)
+True
+>>> finder.prefix, finder.period, finder.time
+(3, 3, 9)
+"""
+
+import hashlib
+
+def fingerprint(key):
+    """
+    Get a 64-bit fingerprint of a key
+    """
+    if isinstance(key, (bytes, bytearray, memoryview)):
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+    return hash(key)
+
+class CycleFinder:
+    def __init__(self, key=None, verify=False):
+        """
+        key(state) gives the value identifying a state, default the state
+        itself. It must not share memory with a state that is modified later
+        """
+        self.key = key
+        self.verify = verify
+        self.prefix = None
+        self.period = None
+        self.time = None
+        self._seen = {}
+        self._candidate = None
+
+    def add(self, state, time=None):
+        """
+        Add the next state, at time (default: number of states added before)
+
+        Returns True when the state repeats an earlier state. prefix is then
+        the time of the first occurrence, and period the time between
+        """
+        if time is None:
+            time = 0 if self.time is None else self.time + 1
+        self.time = time
+        key = state if self.key is None else self.key(state)
+
+        if self._candidate is not None:
+            check_time, check_key, prefix, period = self._candidate
+            # States may be added at irregular times, so a candidate not
+            # confirmed at exactly one period later is dropped
+            if time >= check_time + period:
+                self._candidate = None
+                if time == check_time + period and key == check_key:
+                    self.prefix = prefix
+                    self.period = period
+                    return True
+
+        fp = fingerprint(key)
+        first = self._seen.setdefault(fp, time)
+        if first == time or self._candidate is not None:
+            return False
+        if not self.verify:
+            self.prefix = first
+            self.period = time - first
+            return True
+        self._candidate = (time, key, first, time - first)
+        return False
+
+    def remaining(self, target):
+        """
+        Number of steps from the current state, to a state equal to the state
+        at time target
+        """
+        if target < self.time:
+            raise ValueError(f"Target {target} is before current time {self.time}")
+        return (target - self.time) % self.period
@@ -0,0 +1,229 @@
+"""
+Long running solver daemon, serving solve requests over a Unix socket
+
+Usage: python3 -m aoc.daemon [-s socket] serve [-j jobs]
+       python3 -m aoc.daemon [-s socket] solve <day> <part> <input> [name=value ...]
+       python3 -m aoc.daemon [-s socket] stop
+
+The daemon keeps a process pool where every worker has all days imported, and
+keeps parsed inputs resident, so a request only pays for running the part.
+The socket defaults to AOC_DAEMON_SOCKET, or aoc-daemon-<uid>.sock in the
+temp directory.
+
+Requests and responses are json objects, one per line. Each request is solved
+as soon as it arrives, so both concurrent clients and multiple requests on one
+connection are served in parallel, and responses may come out of order. An
+"id" in the request is returned in its response to match them up.
+
+  {"id": 1, "day": 21, "part": 1, "input": "/path/input.txt", "params": {"max_dist": 6}}
+  {"id": 1, "day": "day21", "part": 1, "answer": "16", "error": null, "resident": false, ...}
+
+params are passed as keyword arguments to PartN, for example max_dist for
+day21 part1, steps for day21 part2 or expansion for day11. Relative input
+paths are relative to the 2023/non_excel directory. {"op": "ping"} and
+{"op": "stop"} check and stop the daemon.
+
+Resident inputs are kept pickled, and unpickled for each request, since some
+solvers modify their input while running. They are keyed on the input file
+path, size and modification time. Day scripts are only imported at start, so
+restart the daemon after changing them.
+"""
+
+import os
+import sys
+import json
+import pickle
+import socket
+import signal
+import asyncio
+import argparse
+import tempfile
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from aoc.days import ROOT, find_days, get_day, parse_param
+from aoc.runner import solve
+
+# Max number of resident inputs per worker
+MAX_INPUTS = 64
+
+# Resident inputs of this worker, as pickled data keyed on input file and Input
+# class
+_inputs = OrderedDict()
+_last_resident = False
+
+def default_socket():
+    path = os.environ.get("AOC_DAEMON_SOCKET", "")
+    if path != "":
+        return path
+    return os.path.join(tempfile.gettempdir(), f"aoc-daemon-{os.getuid()}.sock")
+
+def _preload():
+    """
+    Worker initializer, importing all days up front
+    """
+    for day in find_days():
+        day.parts()
+
+def _load_resident(Input, path):
+    global _last_resident
+    st = os.stat(path)
+    key = (Input.__module__, Input.__qualname__, path, st.st_size, st.st_mtime_ns)
+    data = _inputs.get(key)
+    _last_resident = data is not None
+    if data is not None:
+        _inputs.move_to_end(key)
+        return pickle.loads(data)
+
+    input = Input(path)
+    try:
+        _inputs[key] = pickle.dumps(input, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        # Can't be kept, so it's parsed for every request
+        return input
+    if len(_inputs) > MAX_INPUTS:
+        _inputs.popitem(last=False)
+    return input
+
+def _solve(day_path, part, input_path, params):
+    """
+    Solve a request in a worker process. Returns the result as a dict
+    """
+    global _last_resident
+    _last_resident = False
+    result = solve(day_path, part, input_path, params=params, load=_load_resident)
+    response = dict(vars(result))
+    response["resident"] = _last_resident
+    return response
+
+class Daemon:
+    def __init__(self, path, max_workers=None):
+        self.path = path
+        self.workers = max_workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_preload)
+        self.stopped = None
+
+    async def handle_request(self, request):
+        if request.get("op") == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if request.get("op") == "stop":
+            self.stopped.set()
+            return {"ok": True}
+
+        day = get_day(int(request["day"]))
+        part = int(request["part"])
+        path = os.path.join(ROOT, request["input"])
+        params = request.get("params") or {}
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No input {path}")
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, _solve, day.path, part, path, params)
+
+    async def respond(self, line, writer):
+        request = {}
+        try:
+            request = json.loads(line)
+            response = await self.handle_request(request)
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        if "id" in request:
+            response["id"] = request["id"]
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip() == b"":
+                    continue
+                task = asyncio.create_task(self.respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            # Client went away, or the daemon is stopping
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        self.stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in [signal.SIGINT, signal.SIGTERM]:
+            loop.add_signal_handler(sig, self.stopped.set)
+
+        # Start all workers now, so the first requests don't wait for imports
+        await asyncio.gather(*(
+            loop.run_in_executor(self.pool, os.getpid)
+            for _ in range(self.workers)
+        ))
+
+        server = await asyncio.start_unix_server(self.handle_client, self.path)
+        print(f"Serving on {self.path}", file=sys.stderr)
+        try:
+            async with server:
+                await self.stopped.wait()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+def _remove_stale(path):
+    """
+    Remove a socket left by a daemon that is no longer running
+    """
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX) as s:
+        try:
+            s.connect(path)
+        except ConnectionRefusedError:
+            os.remove(path)
+            return
+    raise RuntimeError(f"A daemon is already serving on {path}")
+
+def request(path, requests):
+    """
+    Send requests to the daemon, and iterate the responses as they arrive
+    """
+    with socket.socket(socket.AF_UNIX) as s:
+        s.connect(path)
+        s.sendall("".join(json.dumps(r) + "\n" for r in requests).encode())
+        s.shutdown(socket.SHUT_WR)
+        with s.makefile("r") as f:
+            for line in f:
+                yield json.loads(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.daemon", description="Solver daemon for the 2023 days")
+    parser.add_argument("-s", "--socket", default=default_socket(), help="socket path (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the daemon")
+    serve.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: cpu count)")
+    client = commands.add_parser("solve", help="solve a part using a running daemon")
+    client.add_argument("day", type=int)
+    client.add_argument("part", type=int)
+    client.add_argument("input")
+    client.add_argument("params", nargs="*", type=parse_param, help="parameters to PartN, as name=value")
+    commands.add_parser("stop", help="stop a running daemon")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        _remove_stale(args.socket)
+        asyncio.run(Daemon(args.socket, args.jobs).serve())
+    elif args.command == "solve":
+        [response] = request(args.socket, [{
+            "day": args.day,
+            "part": args.part,
+            "input": os.path.abspath(args.input),
+            "params": dict(args.params),
+        }])
+        if response.get("error") is not None:
+            print(response["error"], file=sys.stderr)
+            sys.exit(1)
+        print(response["answer"])
+    elif args.command == "stop":
+        list(request(args.socket, [{"op": "stop"}]))
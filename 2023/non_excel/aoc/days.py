@@ -0,0 +1,150 @@
+"""
+Locate and load the day scripts
+
+A day is a directory named dayNN. It either contains a single parts.py, or is
+split in part1.py and part2.py, where part2.py sometimes imports part1.py with
+"from part1 import *". Each part is looked up as:
+
+1. parts.py
+2. partN.py
+3. any other part*.py
+
+and the first module having both Input and PartN is used for that part.
+"""
+
+import os
+import re
+import sys
+import importlib.util
+
+# Root directory containing all dayNN directories
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module names used inside day directories. They collide between days, so they
+# are never left in sys.modules after a day is loaded
+_local_names = ['parts', 'part1', 'part2']
+
+_re_day = re.compile(r"day([0-9]+)")
+
+# Loaded modules, keyed on path
+_modules = {}
+
+def load_module(path):
+    """
+    Load a day script as a module, without running its __main__ section
+
+    The module is registered in sys.modules as dayNN_partN, so objects created
+    from it can be pickled to worker processes
+    """
+    path = os.path.abspath(path)
+    if path in _modules:
+        return _modules[path]
+
+    day_dir = os.path.dirname(path)
+    name = f"{os.path.basename(day_dir)}_{os.path.splitext(os.path.basename(path))[0]}"
+
+    saved = {k: sys.modules.pop(k) for k in _local_names if k in sys.modules}
+    sys.path.insert(0, day_dir)
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(day_dir)
+        for k in _local_names:
+            sys.modules.pop(k, None)
+        sys.modules.update(saved)
+
+    _modules[path] = module
+    return module
+
+class Day:
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.name = os.path.basename(self.path)
+        self.num = int(_re_day.fullmatch(self.name).group(1))
+
+    def __str__(self):
+        return self.name
+
+    def __lt__(self, other):
+        return self.num < other.num
+
+    def sources(self, part):
+        """
+        List candidate source files for a part, in order of preference
+        """
+        files = sorted(f for f in os.listdir(self.path) if re.fullmatch(r"parts?[0-9]*\.py", f))
+        order = ['parts.py', f"part{part}.py"]
+        return [os.path.join(self.path, f) for f in order if f in files] + \
+            [os.path.join(self.path, f) for f in files if f not in order]
+
+    def source(self, part):
+        """
+        Get the source file for a part, or None if the day doesn't solve it
+        """
+        for path in self.sources(part):
+            module = load_module(path)
+            if hasattr(module, 'Input') and hasattr(module, f"Part{part}"):
+                return path
+        return None
+
+    def load(self, part):
+        """
+        Return the tuple (Input, PartN) classes for a part
+
+        Raises LookupError if the part isn't available
+        """
+        path = self.source(part)
+        if path is None:
+            raise LookupError(f"{self.name} has no Part{part}")
+        module = load_module(path)
+        return module.Input, getattr(module, f"Part{part}")
+
+    def parts(self):
+        return [part for part in (1, 2) if self.source(part) is not None]
+
+def find_days(root=ROOT, nums=None):
+    """
+    Find all days in root, optionally only the day numbers in nums
+    """
+    days = []
+    for name in os.listdir(root):
+        m = _re_day.fullmatch(name)
+        if m and os.path.isdir(os.path.join(root, name)):
+            if nums is None or int(m.group(1)) in nums:
+                days.append(Day(os.path.join(root, name)))
+    days.sort()
+    return days
+
+def parse_param(arg):
+    """
+    Parse a command line parameter to PartN given as name=value, to the tuple
+    (name, value). Values are int when possible
+
+    >>> parse_param("max_dist=6")
+    ('max_dist', 6)
+    >>> parse_param("max_dist")
+    Traceback (most recent call last):
+    ...
+    argparse.ArgumentTypeError: expected name=value, got max_dist
+    """
+    name, sep, value = arg.partition("=")
+    if sep == "":
+        # Imported when used, as only command lines need it
+        import argparse
+        raise argparse.ArgumentTypeError(f"expected name=value, got {arg}")
+    try:
+        return name, int(value)
+    except ValueError:
+        return name, value
+
+def get_day(num, root=ROOT):
+    """
+    Get a single day by number
+    """
+    days = find_days(root, [num])
+    if len(days) == 0:
+        raise LookupError(f"No day {num} in {root}")
+    return days[0]
@@ -0,0 +1,605 @@
+"""
+Generate synthetic inputs for every day, at a given size
+
+Usage: python3 -m aoc.generate [-s seed] [-n size] [-o output] day ...
+
+The inputs follow the same structure as the puzzle inputs, so they can be used
+to measure how the solvers scale, far beyond puzzle sized inputs. The output is
+deterministic given seed and size.
+
+What size means depends on the day:
+
+  day01, 02, 04, 07, 09, 12    number of lines
+  day03, 10, 11, 14, 16, 17    N for an NxN grid
+  day21, 23                    N for an NxN grid (rounded up to odd for day21)
+  day05                        number of ranges per map
+  day06                        number of races (max 8, to keep part 2 in range)
+  day08                        length of the L/R path
+  day13                        number of patterns
+  day15                        number of steps
+  day18                        roughly the number of dig instructions
+  day19                        number of workflows, and of ratings
+  day20                        number of counter chains
+  day22                        number of bricks
+  day24                        number of hailstones
+
+Without size, a puzzle sized input is generated.
+"""
+
+import os
+import sys
+import math
+import random
+import argparse
+
+from aoc.days import ROOT
+
+# Puzzle-like sizes, used if no size is given
+DEFAULT_SIZES = {
+    1: 1000, 2: 100, 3: 140, 4: 200, 5: 30, 6: 4, 7: 1000, 8: 270,
+    9: 200, 10: 140, 11: 140, 12: 1000, 13: 100, 14: 100, 15: 4000,
+    16: 110, 17: 141, 18: 700, 19: 550, 20: 4, 21: 131, 22: 1400,
+    23: 141, 24: 300,
+}
+
+_digit_words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+_letters = "abcdefghijklmnopqrstuvwxyz"
+
+def _primes(lo, hi):
+    """
+    List primes p such as lo <= p < hi
+
+    >>> _primes(10, 30)
+    [11, 13, 17, 19, 23, 29]
+    """
+    return [p for p in range(max(lo, 2), hi) if all(p % d != 0 for d in range(2, math.isqrt(p) + 1))]
+
+def _names(rng, length, alphabet, exclude=()):
+    """
+    Generate unique random names, in random order
+
+    Raises ValueError once all names of length over alphabet are used
+
+    >>> names = _names(random.Random(0), 1, "ab", exclude=["a"])
+    >>> next(names)
+    'b'
+    >>> next(names)
+    Traceback (most recent call last):
+    ...
+    ValueError: All 2 names of 1 characters are used
+    """
+    used = set(exclude)
+    total = len(alphabet) ** length
+    remaining = total - sum(1 for name in used if len(name) == length and set(name) <= set(alphabet))
+    while remaining > 0:
+        name = "".join(rng.choice(alphabet) for i in range(length))
+        if name not in used:
+            used.add(name)
+            remaining -= 1
+            yield name
+    raise ValueError(f"All {total} names of {length} characters are used")
+
+#
+# Random regions, used for days needing a closed loop
+#
+# A region is a set of unit squares (x, y) in a grid. It is grown one square
+# at a time, and only accepts squares where the already added neighbours form
+# a single contiguous arc around the square. That way the region stays simply
+# connected without two squares touching only by the corner, so the boundary
+# is a single non self-intersecting loop.
+#
+
+# The 8 neighbours around a square, in order, starting with an edge neighbour
+_ring = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+
+def _can_add(region, x, y):
+    ring = [(x + dx, y + dy) in region for dx, dy in _ring]
+    count = sum(ring)
+    if count == 0:
+        return False
+    if count == 8:
+        return True
+    transitions = sum(1 for i in range(8) if ring[i] and not ring[(i + 1) % 8])
+    if transitions != 1:
+        return False
+    # A single neighbour must be an edge neighbour, not a corner
+    return count > 1 or any(ring[i] for i in range(0, 8, 2))
+
+def _grow_region(rng, w, h, fill):
+    region = {(w // 2, h // 2)}
+    target = max(1, int(w * h * fill))
+    candidates = [(w // 2 + dx, h // 2 + dy) for dx, dy in _ring[::2]]
+    while len(region) < target and len(candidates) > 0:
+        i = rng.randrange(len(candidates))
+        candidates[i], candidates[-1] = candidates[-1], candidates[i]
+        x, y = candidates.pop()
+        if (x, y) in region or x < 0 or y < 0 or x >= w or y >= h:
+            continue
+        if not _can_add(region, x, y):
+            continue
+        region.add((x, y))
+        candidates.extend((x + dx, y + dy) for dx, dy in _ring[::2] if (x + dx, y + dy) not in region)
+    return region
+
+def _boundary(region):
+    """
+    Get the boundary of a region, as a list of corner coordinates in order
+    """
+    nbrs = {}
+    def add_edge(a, b):
+        nbrs.setdefault(a, []).append(b)
+        nbrs.setdefault(b, []).append(a)
+
+    for x, y in region:
+        if (x, y - 1) not in region:
+            add_edge((x, y), (x + 1, y))
+        if (x, y + 1) not in region:
+            add_edge((x, y + 1), (x + 1, y + 1))
+        if (x - 1, y) not in region:
+            add_edge((x, y), (x, y + 1))
+        if (x + 1, y) not in region:
+            add_edge((x + 1, y), (x + 1, y + 1))
+
+    start = min(nbrs)
+    path = [start]
+    prev, cur = start, nbrs[start][0]
+    while cur != start:
+        path.append(cur)
+        a, b = nbrs[cur]
+        prev, cur = cur, (b if a == prev else a)
+    return path
+
+def _grid(lines):
+    return "".join(line + "\n" for line in lines)
+
+#
+# Generators per day. Each returns the content of the input file
+#
+
+def day01(rng, size):
+    lines = []
+    for i in range(size):
+        parts = []
+        for j in range(rng.randint(2, 8)):
+            r = rng.random()
+            if r < 0.3:
+                parts.append(str(rng.randint(1, 9)))
+            elif r < 0.6:
+                parts.append(rng.choice(_digit_words))
+            else:
+                parts.append("".join(rng.choice(_letters) for k in range(rng.randint(1, 5))))
+        # Part 1 needs at least one digit on every line
+        parts.insert(rng.randint(0, len(parts)), str(rng.randint(1, 9)))
+        lines.append("".join(parts))
+    return _grid(lines)
+
+def day02(rng, size):
+    lines = []
+    for id in range(1, size + 1):
+        draws = []
+        for j in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in colors))
+        lines.append(f"Game {id}: {'; '.join(draws)}")
+    return _grid(lines)
+
+def day03(rng, size):
+    rows = []
+    for y in range(size):
+        row = ""
+        while len(row) < size:
+            r = rng.random()
+            if r < 0.12:
+                row += str(rng.randint(1, 999))[:size - len(row)]
+                # Numbers need a separator to not merge with the next
+                row += "." if len(row) < size else ""
+            elif r < 0.17:
+                row += rng.choice("*#+$/=%@&-")
+            else:
+                row += "."
+        rows.append(row)
+    return _grid(rows)
+
+def day04(rng, size):
+    lines = []
+    for id in range(1, size + 1):
+        win = rng.sample(range(1, 100), 10)
+        own = rng.sample(range(1, 100), 25)
+        lines.append(f"Card {id:3}: {' '.join(f'{n:2}' for n in win)} | {' '.join(f'{n:2}' for n in own)}")
+    return _grid(lines)
+
+def day05(rng, size):
+    limit = 1 << 32
+    seeds = []
+    for i in range(size // 4 + 1):
+        start = rng.randrange(limit // 2)
+        seeds += [start, rng.randint(1, limit // (size + 4))]
+
+    chain = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    out = f"seeds: {' '.join(str(s) for s in seeds)}\n"
+    for src_name, dst_name in zip(chain, chain[1:]):
+        # Split the number space in random segments, and lay them out again in
+        # random order, so that neither source nor destination ranges overlap
+        cuts = sorted(rng.sample(range(1, limit), size * 2))
+        segments = [(a, b - a) for a, b in zip(cuts[::2], cuts[1::2])]
+        rng.shuffle(segments)
+        dst = rng.randrange(limit - sum(length for src, length in segments))
+        out += f"\n{src_name}-to-{dst_name} map:\n"
+        for src, length in segments:
+            out += f"{dst} {src} {length}\n"
+            dst += length
+    return out
+
+def day06(rng, size):
+    races = []
+    for i in range(min(max(size, 1), 8)):
+        time = rng.randint(20 if i == 0 else 10, 99)
+        # Needs to be possible to win. Max 3 digits, so the concatenated
+        # distance in part 2 is always beatable too
+        best = (time // 2) * (time - time // 2)
+        races.append((time, rng.randrange(min(best, 1000))))
+    return \
+        "Time:     " + "".join(f"{t:5}" for t, d in races) + "\n" + \
+        "Distance: " + "".join(f"{d:5}" for t, d in races) + "\n"
+
+def day07(rng, size):
+    return _grid(
+        "".join(rng.choice("23456789TJQKA") for i in range(5)) + f" {rng.randint(1, 1000)}"
+        for j in range(size)
+    )
+
+def day08(rng, size):
+    path = "".join(rng.choice("LR") for i in range(max(size, 1)))
+
+    # Only start and end nodes contains A or Z. Node names are 3 characters,
+    # as parsed by the solver, which limits the size to 958
+    alphabet = "BCDEFGHIJKLMNOPQRSTUVWXY0123456789"
+    primes = [2, 3, 5, 7, 11, 13]
+    needed = len(path) * sum(primes) - len(primes)
+    if needed > len(alphabet) ** 3:
+        raise ValueError(f"Size {size} needs {needed} node names, only {len(alphabet) ** 3} fit in 3 characters")
+    names = _names(rng, 3, alphabet)
+    prefixes = _names(rng, 2, alphabet)
+
+    # Each ghost walks a cycle of a length that is a multiple of the path,
+    # ending with a **Z node that leads back to the start of the cycle. The
+    # first ghost goes AAA -> ZZZ for part 1
+    lines = []
+    for g, prime in enumerate(primes):
+        prefix = "AA" if g == 0 else next(prefixes)
+        start = prefix + "A"
+        end = "ZZZ" if g == 0 else prefix + "Z"
+        cycle = [next(names) for i in range(len(path) * prime - 1)]
+        nodes = [start] + cycle + [end, cycle[0]]
+        for cur, nxt in zip(nodes, nodes[1:]):
+            lines.append(f"{cur} = ({nxt}, {nxt})")
+    rng.shuffle(lines)
+    return path + "\n\n" + _grid(lines)
+
+def day09(rng, size):
+    lines = []
+    for i in range(size):
+        # Sequences of only zeros can't be extrapolated
+        coeffs = [rng.randint(-9, 9) for j in range(rng.randint(0, 6))] + [rng.choice([-2, -1, 1, 2])]
+        lines.append(" ".join(str(sum(c * x**k for k, c in enumerate(coeffs))) for x in range(21)))
+    return _grid(lines)
+
+def day10(rng, size):
+    size = max(size, 3)
+    region = _grow_region(rng, size - 1, size - 1, 0.4)
+    loop = _boundary(region)
+
+    rows = [[rng.choice("|-LJ7F...") for x in range(size)] for y in range(size)]
+    pipes = {
+        frozenset("NS"): '|', frozenset("EW"): '-', frozenset("NE"): 'L',
+        frozenset("NW"): 'J', frozenset("SW"): '7', frozenset("SE"): 'F',
+    }
+    def direction(a, b):
+        return {(0, -1): "N", (1, 0): "E", (0, 1): "S", (-1, 0): "W"}[(b[0] - a[0], b[1] - a[1])]
+
+    for i, (x, y) in enumerate(loop):
+        prev = loop[i - 1]
+        nxt = loop[(i + 1) % len(loop)]
+        rows[y][x] = pipes[frozenset(direction((x, y), prev) + direction((x, y), nxt))]
+
+    # Start anywhere on the loop. Make sure no junk pipe points into the start
+    on_loop = set(loop)
+    sx, sy = rng.choice(loop)
+    rows[sy][sx] = 'S'
+    for dx, dy in [(0, -1), (1, 0), (0, 1), (-1, 0)]:
+        if 0 <= sx + dx < size and 0 <= sy + dy < size and (sx + dx, sy + dy) not in on_loop:
+            rows[sy + dy][sx + dx] = '.'
+    return _grid("".join(row) for row in rows)
+
+def day11(rng, size):
+    empty_rows = set(rng.sample(range(size), size // 10))
+    empty_cols = set(rng.sample(range(size), size // 10))
+    return _grid(
+        "".join(
+            '#' if y not in empty_rows and x not in empty_cols and rng.random() < 0.02 else '.'
+            for x in range(size)
+        )
+        for y in range(size)
+    )
+
+def day12(rng, size):
+    lines = []
+    for i in range(size):
+        # Generate a valid arrangement, and hide parts of it
+        groups = [rng.randint(1, 4) for j in range(rng.randint(1, 5))]
+        springs = "." * rng.randint(0, 2)
+        for g in groups:
+            springs += "#" * g + "." * rng.randint(1, 3)
+        springs = "".join('?' if rng.random() < 0.4 else c for c in springs)
+        lines.append(f"{springs} {','.join(str(g) for g in groups)}")
+    return _grid(lines)
+
+def day13(rng, size):
+    # Each pattern has a perfect reflection, either horizontal or vertical.
+    # Part 2 smudges aren't guaranteed to exist
+    patterns = []
+    for i in range(size):
+        w = rng.randint(5, 17)
+        h = rng.randint(5, 17)
+        rows = ["".join(rng.choice("#.") for x in range(w)) for y in range(h)]
+        # Mirror rows around the line between row line-1 and line
+        line = rng.randint(1, h - 1)
+        for i in range(min(line, h - line)):
+            rows[line + i] = rows[line - 1 - i]
+        if rng.random() < 0.5:
+            rows = ["".join(row[x] for row in rows) for x in range(w)]
+        patterns.append("\n".join(rows))
+    return "\n\n".join(patterns) + "\n"
+
+def day14(rng, size):
+    return _grid("".join(rng.choice("OO#.....") for x in range(size)) for y in range(size))
+
+def day15(rng, size):
+    labels = ["".join(rng.choice(_letters) for j in range(rng.randint(2, 6))) for i in range(max(size // 4, 1))]
+    steps = []
+    for i in range(size):
+        label = rng.choice(labels)
+        if rng.random() < 0.3:
+            steps.append(f"{label}-")
+        else:
+            steps.append(f"{label}={rng.randint(1, 9)}")
+    return ",".join(steps) + "\n"
+
+def day16(rng, size):
+    return _grid("".join(rng.choice("|-/\\" + "." * 20) for x in range(size)) for y in range(size))
+
+def day17(rng, size):
+    return _grid("".join(str(rng.randint(1, 9)) for x in range(size)) for y in range(size))
+
+def day18(rng, size):
+    # The boundary of a grown region is ragged, and has about
+    # 0.54 * side ** 1.55 corners, each starting a dig instruction
+    side = max(int((size / 0.54) ** (1 / 1.55)), 3)
+    loop = _boundary(_grow_region(rng, side, side, 0.4))
+
+    # Convert lattice corners to runs of (direction, from, to)
+    runs = []
+    for a, b in zip(loop, loop[1:] + loop[:1]):
+        d = {(1, 0): 'R', (0, 1): 'D', (-1, 0): 'L', (0, -1): 'U'}[(b[0] - a[0], b[1] - a[1])]
+        if len(runs) > 0 and runs[-1][0] == d:
+            runs[-1][2] = b
+        else:
+            runs.append([d, a, b])
+
+    # Map lattice lines to real coordinates, one mapping per part. Since the
+    # mappings are monotonic, the shape remains a non-intersecting loop
+    def mapping(max_gap):
+        crd = [0]
+        for i in range(side):
+            crd.append(crd[-1] + rng.randint(1, max_gap))
+        return crd
+    p1x, p1y = mapping(10), mapping(10)
+    p2x, p2y = mapping(max(0xfffff // (side + 1), 1)), mapping(max(0xfffff // (side + 1), 1))
+
+    # Make sure area turns out positive, as in the puzzle input
+    area = sum((p1y[b[1]] - p1y[a[1]]) * p1x[a[0]] for d, a, b in runs)
+    if area < 0:
+        runs = [[{'R': 'L', 'L': 'R', 'U': 'D', 'D': 'U'}[d], b, a] for d, a, b in runs[::-1]]
+
+    lines = []
+    for d, (ax, ay), (bx, by) in runs:
+        dist1 = abs(p1x[bx] - p1x[ax]) + abs(p1y[by] - p1y[ay])
+        dist2 = abs(p2x[bx] - p2x[ax]) + abs(p2y[by] - p2y[ay])
+        lines.append(f"{d} {dist1} (#{dist2:05x}{'RDLU'.index(d)})")
+    return _grid(lines)
+
+def day19(rng, size):
+    names = _names(rng, 3, _letters, exclude=["in"])
+    workflows = []
+    pending = ["in"]
+    budget = max(size, 1) - 1
+    while len(pending) > 0:
+        name = pending.pop(rng.randrange(len(pending)))
+        # Workflows forms a tree, so there are no loops. Keep at least one
+        # branch growing until all workflows are created
+        dests = []
+        for i in range(rng.randint(2, 4)):
+            if budget > 0 and (rng.random() < 0.6 or (i == 0 and len(pending) == 0)):
+                dests.append(next(names))
+                pending.append(dests[-1])
+                budget -= 1
+            else:
+                dests.append(rng.choice("AR"))
+        rules = [f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{dest}" for dest in dests[:-1]]
+        rules.append(dests[-1])
+        workflows.append(f"{name}{{{','.join(rules)}}}")
+    rng.shuffle(workflows)
+
+    ratings = [
+        "{" + ",".join(f"{k}={rng.randint(1, 4000)}" for k in "xmas") + "}"
+        for i in range(max(size, 1))
+    ]
+    return _grid(workflows) + "\n" + _grid(ratings)
+
+def day20(rng, size):
+    # The same structure as the puzzle input: each chain is a 12 bit counter
+    # of flip-flops, with a conjunction resetting it when reaching a prime.
+    # All chains are combined through inverters to the conjunction before rx
+    primes = _primes(1 << 11, 1 << 12)
+    chains = min(max(size, 1), len(primes))
+    names = _names(rng, 3, _letters, exclude=["broadcaster", "rx"])
+    final = next(names)
+    lines = []
+    firsts = []
+    for period in rng.sample(primes, chains):
+        ffs = [next(names) for i in range(12)]
+        conj = next(names)
+        inv = next(names)
+        firsts.append(ffs[0])
+        conj_out = [ffs[0]]
+        for bit, ff in enumerate(ffs):
+            outputs = [ffs[bit + 1]] if bit + 1 < len(ffs) else []
+            if period & (1 << bit):
+                outputs.append(conj)
+            elif bit > 0:
+                conj_out.append(ff)
+            rng.shuffle(outputs)
+            lines.append(f"%{ff} -> {', '.join(outputs)}")
+        conj_out.append(inv)
+        rng.shuffle(conj_out)
+        lines.append(f"&{conj} -> {', '.join(conj_out)}")
+        lines.append(f"&{inv} -> {final}")
+    lines.append(f"&{final} -> rx")
+    lines.append(f"broadcaster -> {', '.join(firsts)}")
+    rng.shuffle(lines)
+    return _grid(lines)
+
+def day21(rng, size):
+    size = max(size, 5) | 1
+    mid = size // 2
+    rows = []
+    for y in range(size):
+        row = ""
+        for x in range(size):
+            if x == mid and y == mid:
+                row += "S"
+            elif x in (0, mid, size - 1) or y in (0, mid, size - 1):
+                # Borders and cross from start needs to be free for part 2
+                row += "."
+            else:
+                row += "#" if rng.random() < 0.1 else "."
+        rows.append(row)
+    return _grid(rows)
+
+def day22(rng, size):
+    side = max(int(math.sqrt(size)), 3)
+    occupied = set()
+    bricks = []
+    z = 1
+    while len(bricks) < size:
+        axis = rng.randrange(3)
+        length = rng.randint(1, 4)
+        a = [rng.randrange(side), rng.randrange(side), z + rng.randrange(3)]
+        b = list(a)
+        b[axis] += length - 1
+        if axis < 2 and b[axis] >= side:
+            continue
+        cubes = {
+            (x, y, zz)
+            for x in range(a[0], b[0] + 1)
+            for y in range(a[1], b[1] + 1)
+            for zz in range(a[2], b[2] + 1)
+        }
+        if cubes & occupied:
+            z += 1
+            continue
+        occupied |= cubes
+        bricks.append(f"{a[0]},{a[1]},{a[2]}~{b[0]},{b[1]},{b[2]}")
+    rng.shuffle(bricks)
+    return _grid(bricks)
+
+def day23(rng, size):
+    # A lattice of up to 6x6 junctions, connected with corridors. Bigger grids
+    # gives longer corridors, but keeps the number of paths within reach.
+    # Slopes at junctions make the graph one-directional to right/down
+    size = max(size, 13)
+    k = min(max((size - 5) // 24, 2), 6)
+    gaps = [4] * (k - 1)
+    for i in range(size - 5 - 4 * (k - 1)):
+        gaps[rng.randrange(k - 1)] += 1
+    crd = [2]
+    for g in gaps:
+        crd.append(crd[-1] + g)
+
+    rows = [['#'] * size for y in range(size)]
+    def carve(x, y, c='.'):
+        rows[y][x] = c
+
+    for i, x in enumerate(crd):
+        for j, y in enumerate(crd):
+            carve(x, y)
+            if i + 1 < k:
+                for cx in range(x + 1, crd[i + 1]):
+                    carve(cx, y)
+                carve(x + 1, y, '>')
+                carve(crd[i + 1] - 1, y, '>')
+            if j + 1 < k:
+                for cy in range(y + 1, crd[j + 1]):
+                    carve(x, cy)
+                carve(x, y + 1, 'v')
+                carve(x, crd[j + 1] - 1, 'v')
+
+    # Start and end, connected to the corner junctions
+    for crd_path in [[(1, 0), (1, 1), (1, 2)], [(size - 3, size - 2), (size - 2, size - 2), (size - 2, size - 1)]]:
+        for x, y in crd_path:
+            carve(x, y)
+    return _grid("".join(row) for row in rows)
+
+def day24(rng, size):
+    # Like the puzzle, there is a rock trajectory hitting all hailstones
+    rock_p = [rng.randint(2 * 10**14, 4 * 10**14) for i in range(3)]
+    rock_v = [rng.randint(-300, 300) for i in range(3)]
+    lines = []
+    times = rng.sample(range(10**9, 10**12), size)
+    for t in times:
+        v = [0, 0, 0]
+        while 0 in v:
+            v = [rng.randint(-300, 300) for i in range(3)]
+        p = [rp + (rv - hv) * t for rp, rv, hv in zip(rock_p, rock_v, v)]
+        lines.append(f"{p[0]}, {p[1]}, {p[2]} @ {v[0]}, {v[1]}, {v[2]}")
+    return _grid(lines)
+
+GENERATORS = {
+    1: day01, 2: day02, 3: day03, 4: day04, 5: day05, 6: day06,
+    7: day07, 8: day08, 9: day09, 10: day10, 11: day11, 12: day12,
+    13: day13, 14: day14, 15: day15, 16: day16, 17: day17, 18: day18,
+    19: day19, 20: day20, 21: day21, 22: day22, 23: day23, 24: day24,
+}
+
+def generate(day, size=None, seed=0):
+    """
+    Generate an input for a day number, as a string
+    """
+    if size is None:
+        size = DEFAULT_SIZES[day]
+    # Seed on day too, so days are independent of each other
+    rng = random.Random(f"{seed}:{day}:{size}")
+    return GENERATORS[day](rng, size)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.generate", description="Generate synthetic 2023 inputs")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument("-n", "--size", type=int, default=None, help="day specific size (default: puzzle sized)")
+    parser.add_argument("-o", "--output", default=None, help="output file pattern, formatted with {day} and {num} (default: stdout)")
+    parser.add_argument("days", nargs="+", type=int, help="days to generate")
+    args = parser.parse_args()
+
+    for num in args.days:
+        if num not in GENERATORS:
+            parser.error(f"no generator for day {num}")
+        try:
+            content = generate(num, args.size, args.seed)
+        except ValueError as e:
+            parser.error(f"day {num}: {e}")
+        if args.output is None:
+            sys.stdout.write(content)
+        else:
+            path = os.path.join(ROOT, args.output.format(day=f"day{num:02}", num=num))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
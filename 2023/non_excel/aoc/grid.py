@@ -0,0 +1,185 @@
+"""
+Compact 2D grid, stored row by row in a flat bytearray
+
+Each cell is a small integer 0-255. Grids parsed from text keep the character
+codes of the input, unless translated to other values.
+
+>>> g = Grid.from_lines(["#.#", "..S"])
+>>> g.width, g.height
+(3, 2)
+>>> g.char(2, 1)
+'S'
+>>> g.find(ord('S'))
+(2, 1)
+>>> print(g.transpose())
+#.
+..
+#S
+"""
+
+# Single character strings, to avoid calling chr() in hot paths
+_chars = [chr(i) for i in range(256)]
+
+class Grid:
+    # See aoc.mmgrid for grids that aren't kept in memory
+    in_memory = True
+
+    def __init__(self, width, height, fill=0, data=None):
+        self.width = width
+        self.height = height
+        if data is None:
+            data = bytearray([fill]) * (width * height)
+        if len(data) != width * height:
+            raise ValueError(f"Grid data size {len(data)} doesn't match {width}x{height}")
+        self.data = data
+
+    @classmethod
+    def from_lines(cls, lines, values=None):
+        """
+        Create a grid from lines of text, as str or bytes. Empty lines are
+        skipped
+
+        values is an optional dict mapping characters to cell values
+
+        >>> Grid.from_lines(["12", "34", ""], {str(i): i for i in range(10)}).data
+        bytearray(b'\\x01\\x02\\x03\\x04')
+        """
+        data = bytearray()
+        width = None
+        height = 0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if width is None:
+                width = len(line)
+            elif len(line) != width:
+                raise ValueError(f"Grid line {height} has length {len(line)}, expected {width}")
+            data += line.encode() if type(line) == str else line
+            height += 1
+        grid = cls(width or 0, height, data=data)
+        if values is not None:
+            grid = grid.translate(values)
+        return grid
+
+    def __str__(self):
+        return "\n".join(row.decode() for row in self.rows())
+
+    def __eq__(self, other):
+        return self.width == other.width and self.data == other.data
+
+    def key(self):
+        """
+        Get content as a hashable object, for tracking states
+        """
+        return bytes(self.data)
+
+    def copy(self):
+        return Grid(self.width, self.height, data=bytearray(self.data))
+
+    def blank(self, max_value=255):
+        """
+        Get a grid of zeros of the same size and kind, for values up to
+        max_value
+        """
+        return Grid(self.width, self.height)
+
+    def states(self, length, max_value=255):
+        """
+        Get an array of length zeros for values up to max_value, kept like
+        the grid, for search states of several per cell
+        """
+        return bytearray(length)
+
+    def fill(self, value=0):
+        self.data[:] = bytearray([value]) * len(self.data)
+
+    def translate(self, values):
+        """
+        Get a copy with cell values mapped through a dict. Values not in the
+        dict are kept
+
+        >>> Grid.from_lines(["#.", ".#"]).translate({'#': 1, '.': 0}).data
+        bytearray(b'\\x01\\x00\\x00\\x01')
+        """
+        table = bytearray(range(256))
+        for k, v in values.items():
+            if type(k) == str:
+                k = ord(k)
+            table[k] = v
+        return Grid(self.width, self.height, data=self.data.translate(table))
+
+    def transpose(self):
+        return Grid(
+            self.height, self.width,
+            data=bytearray().join(self.col(x) for x in range(self.width))
+        )
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def within(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x, y):
+        return self.data[y * self.width + x]
+
+    def char(self, x, y):
+        return _chars[self.data[y * self.width + x]]
+
+    def set(self, x, y, value):
+        self.data[y * self.width + x] = value
+
+    def row(self, y):
+        return bytes(self.data[y * self.width:(y + 1) * self.width])
+
+    def col(self, x):
+        return bytes(self.data[x::self.width])
+
+    def rows(self):
+        for y in range(self.height):
+            yield self.row(y)
+
+    def find(self, value):
+        """
+        Get coordinate of first cell with value, or None
+        """
+        i = self.data.find(value)
+        if i < 0:
+            return None
+        return i % self.width, i // self.width
+
+    def count(self, value):
+        return self.data.count(value)
+
+    def count_nonzero(self):
+        return len(self.data) - self.data.count(0)
+
+    def nonzero(self):
+        """
+        Iterate coordinates of all non-zero cells
+
+        >>> list(Grid(2, 2, data=bytearray([0, 1, 1, 0])).nonzero())
+        [(1, 0), (0, 1)]
+        """
+        width = self.width
+        for i, v in enumerate(self.data):
+            if v != 0:
+                yield i % width, i // width
+
+    def neighbours(self, x, y):
+        """
+        Iterate coordinates of neighbours within the grid, as east, south, west
+        and north
+
+        >>> list(Grid(3, 3).neighbours(0, 1))
+        [(1, 1), (0, 2), (0, 0)]
+        """
+        if x + 1 < self.width:
+            yield x + 1, y
+        if y + 1 < self.height:
+            yield x, y + 1
+        if x > 0:
+            yield x - 1, y
+        if y > 0:
+            yield x, y - 1
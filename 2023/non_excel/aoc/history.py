@@ -0,0 +1,250 @@
+"""
+Keep a history of benchmark results per git commit, and detect regressions
+
+Usage:
+  python3 -m aoc.history record [-w warmup] [-r repeat] [-i input] [day ...]
+  python3 -m aoc.history record --report report.json
+  python3 -m aoc.history list
+  python3 -m aoc.history compare <base rev> [<head rev>]
+
+Results are appended as json lines to perf_history.jsonl, keyed on the commit
+checked out when recording. Recording the same commit multiple times adds more
+samples to that commit.
+
+compare runs a one-sided Mann-Whitney U test on the run() timings of each
+day/part, for the same input file content, and flags a regression if the head
+is significantly slower and the median has increased more than a threshold.
+Changed answers are always flagged. Exits with status 1 if anything is flagged.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import subprocess
+import statistics
+
+from aoc.days import ROOT, find_days
+from aoc import bench
+from aoc.cache import file_digest
+
+HISTORY = os.path.join(ROOT, "perf_history.jsonl")
+
+def git(*args):
+    return subprocess.run(
+        ["git", *args], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+def resolve(rev):
+    """
+    Resolve a git revision to a full commit hash
+    """
+    return git("rev-parse", "--verify", f"{rev}^{{commit}}")
+
+def entry_from_report(report):
+    """
+    Convert a report from aoc.bench to a history entry for current commit
+    """
+    results = []
+    for r in report['results']:
+        if 'error' in r:
+            continue
+        results.append({
+            'day': r['day'],
+            'part': r['part'],
+            'input': r['input'],
+            'input_sha256': file_digest(r['input']),
+            'answer': r['answer'],
+            'parse': r['parse']['samples'],
+            'run': r['run']['samples'],
+        })
+    return {
+        'commit': resolve("HEAD"),
+        'dirty': git("status", "--porcelain", "--untracked-files=no") != "",
+        'time': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'meta': report['meta'],
+        'results': results,
+    }
+
+def append(entry, path=HISTORY):
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+def load(path=HISTORY):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip() != ""]
+
+def samples_for(entries, commit):
+    """
+    Pool all samples recorded for a commit
+
+    Returns dict keyed on (day, part, input digest), with values as dict of
+    'run' samples and set of 'answers'
+    """
+    pooled = {}
+    for entry in entries:
+        if entry['commit'] != commit:
+            continue
+        for r in entry['results']:
+            key = (r['day'], r['part'], r['input_sha256'])
+            cur = pooled.setdefault(key, {'run': [], 'answers': set(), 'input': r['input']})
+            cur['run'] += r['run']
+            cur['answers'].add(r['answer'])
+    return pooled
+
+def _rank(values):
+    """
+    Rank values from 1, where ties get the average rank
+
+    >>> _rank([10, 20, 20, 30])
+    [1.0, 2.5, 2.5, 4.0]
+    """
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+def mann_whitney_greater(base, head):
+    """
+    One-sided Mann-Whitney U test, with normal approximation and tie
+    correction
+
+    Returns p-value for the hypothesis that head tends to be larger than base
+
+    >>> round(mann_whitney_greater([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]), 4)
+    0.0061
+    >>> mann_whitney_greater([1, 2, 3], [1, 2, 3]) > 0.5
+    True
+    """
+    n1 = len(base)
+    n2 = len(head)
+    ranks = _rank(list(base) + list(head))
+    u = sum(ranks[n1:]) - n2 * (n2 + 1) / 2
+
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    ties = {}
+    for v in list(base) + list(head):
+        ties[v] = ties.get(v, 0) + 1
+    tie_sum = sum(t**3 - t for t in ties.values())
+    var = n1 * n2 / 12 * ((n + 1) - tie_sum / (n * (n - 1)))
+    if var <= 0:
+        return 0.5
+
+    # Continuity correction
+    z = (u - mean - 0.5) / math.sqrt(var)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def compare(entries, base, head, alpha=0.01, threshold=0.05):
+    """
+    Compare two commits
+
+    Returns a list of dicts, one per day/part/input existing in both
+    """
+    base_samples = samples_for(entries, base)
+    head_samples = samples_for(entries, head)
+    rows = []
+    for key in sorted(base_samples.keys() & head_samples.keys()):
+        b = base_samples[key]
+        h = head_samples[key]
+        base_med = statistics.median(b['run'])
+        head_med = statistics.median(h['run'])
+        ratio = head_med / base_med if base_med > 0 else math.inf
+        p = mann_whitney_greater(b['run'], h['run'])
+        flags = []
+        if p < alpha and ratio > 1 + threshold:
+            flags.append("SLOWER")
+        if b['answers'] != h['answers']:
+            flags.append("ANSWER")
+        rows.append({
+            'day': key[0],
+            'part': key[1],
+            'input': h['input'],
+            'base_median': base_med,
+            'head_median': head_med,
+            'ratio': ratio,
+            'p': p,
+            'flags': flags,
+        })
+    return rows
+
+def print_compare(rows, file=sys.stdout):
+    print(f"{'day':6} {'part':>4} {'base ms':>10} {'head ms':>10} {'ratio':>7} {'p':>8}  flags", file=file)
+    for r in rows:
+        print(
+            f"{r['day']:6} {r['part']:4} {r['base_median']*1000:10.3f} {r['head_median']*1000:10.3f} "
+            f"{r['ratio']:7.3f} {r['p']:8.4f}  {' '.join(r['flags'])}",
+            file=file
+        )
+
+def print_list(entries, file=sys.stdout):
+    commits = {}
+    for entry in entries:
+        commits.setdefault(entry['commit'], []).append(entry)
+    for commit, recs in commits.items():
+        dirty = " (dirty)" if any(e['dirty'] for e in recs) else ""
+        results = sum(len(e['results']) for e in recs)
+        print(f"{commit[:12]} {recs[-1]['time']} {len(recs):3} runs {results:4} results{dirty}", file=file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.history", description="Benchmark history per git commit")
+    parser.add_argument("--history", default=HISTORY, help="history file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="benchmark, and append to history for current commit")
+    rec.add_argument("--report", help="record an existing json report from aoc.bench instead of running")
+    rec.add_argument("-w", "--warmup", type=int, default=1)
+    rec.add_argument("-r", "--repeat", type=int, default=5)
+    rec.add_argument("-i", "--input", default="{day}/input.txt", help="input file pattern, formatted with {day} and {num}")
+    rec.add_argument("days", nargs="*", type=int)
+
+    sub.add_parser("list", help="list recorded commits")
+
+    cmp = sub.add_parser("compare", help="compare head against a base revision")
+    cmp.add_argument("base", help="base revision")
+    cmp.add_argument("head", nargs="?", default="HEAD", help="head revision (default: %(default)s)")
+    cmp.add_argument("--alpha", type=float, default=0.01, help="significance level (default: %(default)s)")
+    cmp.add_argument("--threshold", type=float, default=0.05, help="minimum relative slowdown of median (default: %(default)s)")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        if args.report is not None:
+            with open(args.report) as f:
+                report = json.load(f)
+        else:
+            bench.print_header()
+            report = bench.bench(
+                find_days(nums=args.days or None), args.input,
+                warmup=args.warmup, repeat=args.repeat,
+                progress=bench.print_result
+            )
+        entry = entry_from_report(report)
+        append(entry, args.history)
+        print(f"Recorded {len(entry['results'])} results for {entry['commit'][:12]}")
+
+    elif args.command == "list":
+        print_list(load(args.history))
+
+    elif args.command == "compare":
+        entries = load(args.history)
+        base = resolve(args.base)
+        head = resolve(args.head)
+        rows = compare(entries, base, head, args.alpha, args.threshold)
+        if len(rows) == 0:
+            print(f"No common results recorded for {base[:12]} and {head[:12]}")
+            sys.exit(1)
+        print_compare(rows)
+        if any(r['flags'] for r in rows):
+            sys.exit(1)
@@ -0,0 +1,259 @@
+"""
+Sets of integer intervals, and N-dimensional boxes
+
+IntervalSet keeps a set of integers as sorted, disjoint half-open intervals
+[start, end), in two parallel lists of starts and ends. Overlapping and
+adjacent intervals are always merged, so two equal sets have equal lists.
+
+Bulk construction sorts once, and set operations sweep both sets in linear
+time. Lookups and single interval updates use bisect.
+
+>>> a = IntervalSet([(10, 20), (5, 8), (8, 9), (30, 31), (40, 40)])
+>>> list(a)
+[(5, 9), (10, 20), (30, 31)]
+>>> list(a - IntervalSet([(12, 15), (30, 35)]))
+[(5, 9), (10, 12), (15, 20)]
+>>> list(a & IntervalSet([(7, 11)]))
+[(7, 9), (10, 11)]
+>>> list(a | IntervalSet([(9, 10)]))
+[(5, 20), (30, 31)]
+>>> list(a.clip(6, 12).translate(100))
+[(106, 109), (110, 112)]
+>>> a.size(), a.min(), 15 in a, 9 in a
+(15, 5, True, False)
+
+Box is a product of half-open intervals, one per dimension:
+
+>>> b = Box((1, 1), (11, 5))
+>>> b.volume()
+40
+>>> below, above = b.split(0, 4)
+>>> below, above
+(Box((1, 1), (4, 5)), Box((4, 1), (11, 5)))
+>>> below.split(0, 0)[0].volume()
+0
+"""
+
+from bisect import bisect_left, bisect_right
+
+def overlap1d(s1, e1, s2, e2):
+    """
+    Check if two closed intervals [s1, e1] and [s2, e2] overlap
+
+    if two ends have same coordinates, they overlap still
+
+    >>> overlap1d(3, 4, 5, 7)
+    False
+    >>> overlap1d(3, 5, 5, 7)
+    True
+    >>> overlap1d(3, 6, 5, 7)
+    True
+    >>> overlap1d(3, 12, 5, 7)
+    True
+    >>> overlap1d(3, 5, 0, 7)
+    True
+    >>> overlap1d(10, 12, 5, 7)
+    False
+    """
+    return s1 <= e2 and s2 <= e1
+
+class IntervalSet:
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, intervals=()):
+        """
+        Create from any iterable of (start, end). Empty intervals are ignored
+        """
+        starts = []
+        ends = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if len(ends) > 0 and start <= ends[-1]:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self.starts = starts
+        self.ends = ends
+
+    @classmethod
+    def _from_lists(cls, starts, ends):
+        """
+        Create from lists that are already sorted and merged
+        """
+        result = cls.__new__(cls)
+        result.starts = starts
+        result.ends = ends
+        return result
+
+    def copy(self):
+        return self._from_lists(list(self.starts), list(self.ends))
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __len__(self):
+        """
+        Number of intervals
+        """
+        return len(self.starts)
+
+    def __bool__(self):
+        return len(self.starts) > 0
+
+    def __eq__(self, other):
+        return self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)})"
+
+    def __contains__(self, value):
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value < self.ends[i]
+
+    def size(self):
+        """
+        Number of integers in the set
+        """
+        return sum(self.ends) - sum(self.starts)
+
+    def min(self):
+        if len(self.starts) > 0:
+            return self.starts[0]
+        return None
+
+    def add(self, start, end):
+        """
+        Add a single interval in place
+        """
+        if end <= start:
+            return
+        # Intervals touching or overlapping [start, end) are i..j-1
+        i = bisect_left(self.ends, start)
+        j = bisect_right(self.starts, end)
+        if i < j:
+            start = min(start, self.starts[i])
+            end = max(end, self.ends[j-1])
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+
+    def clip(self, start, end):
+        """
+        Get the part of the set within [start, end)
+        """
+        i = bisect_right(self.ends, start)
+        j = bisect_left(self.starts, end)
+        if i >= j or end <= start:
+            return self._from_lists([], [])
+        starts = self.starts[i:j]
+        ends = self.ends[i:j]
+        starts[0] = max(starts[0], start)
+        ends[-1] = min(ends[-1], end)
+        return self._from_lists(starts, ends)
+
+    def translate(self, offset):
+        return self._from_lists(
+            [s + offset for s in self.starts],
+            [e + offset for e in self.ends]
+        )
+
+    def union(self, other):
+        # Concatenated runs are already sorted, which sorting detects
+        return type(self)(zip(self.starts + other.starts, self.ends + other.ends))
+
+    def intersection(self, other):
+        starts = []
+        ends = []
+        a_starts, a_ends = self.starts, self.ends
+        b_starts, b_ends = other.starts, other.ends
+        i = 0
+        j = 0
+        while i < len(a_starts) and j < len(b_starts):
+            lo = max(a_starts[i], b_starts[j])
+            hi = min(a_ends[i], b_ends[j])
+            if lo < hi:
+                starts.append(lo)
+                ends.append(hi)
+            if a_ends[i] < b_ends[j]:
+                i += 1
+            else:
+                j += 1
+        return self._from_lists(starts, ends)
+
+    def difference(self, other):
+        starts = []
+        ends = []
+        b_starts, b_ends = other.starts, other.ends
+        j = 0
+        for start, end in zip(self.starts, self.ends):
+            # Skip removed intervals before this one
+            while j < len(b_starts) and b_ends[j] <= start:
+                j += 1
+            cur = start
+            k = j
+            while k < len(b_starts) and b_starts[k] < end:
+                if b_starts[k] > cur:
+                    starts.append(cur)
+                    ends.append(b_starts[k])
+                cur = max(cur, b_ends[k])
+                k += 1
+            if cur < end:
+                starts.append(cur)
+                ends.append(end)
+        return self._from_lists(starts, ends)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+class Box:
+    """
+    N-dimensional box, as tuples of lower (inclusive) and upper (exclusive)
+    bounds per dimension
+    """
+    __slots__ = ('lo', 'hi')
+
+    def __init__(self, lo, hi):
+        self.lo = tuple(lo)
+        self.hi = tuple(hi)
+
+    def __repr__(self):
+        return f"Box({self.lo}, {self.hi})"
+
+    def __eq__(self, other):
+        return self.lo == other.lo and self.hi == other.hi
+
+    def is_empty(self):
+        return any(h <= l for l, h in zip(self.lo, self.hi))
+
+    def volume(self):
+        volume = 1
+        for l, h in zip(self.lo, self.hi):
+            if h <= l:
+                return 0
+            volume *= h - l
+        return volume
+
+    def split(self, dim, value):
+        """
+        Split in two boxes along dimension dim, below and from value
+        """
+        lo = self.lo
+        hi = self.hi
+        below = Box(lo, hi[:dim] + (min(hi[dim], value),) + hi[dim+1:])
+        above = Box(lo[:dim] + (max(lo[dim], value),) + lo[dim+1:], hi)
+        return below, above
+
+    def intersection(self, other):
+        return Box(
+            tuple(map(max, self.lo, other.lo)),
+            tuple(map(min, self.hi, other.hi))
+        )
+
+    def overlaps(self, other):
+        return all(
+            l1 < h2 and l2 < h1
+            for l1, h1, l2, h2 in zip(self.lo, self.hi, other.lo, other.hi)
+        )
@@ -0,0 +1,63 @@
+"""
+Counters of work done by the solvers, such as states pushed and popped
+
+Metrics are disabled by default, and enabled with --metrics on day scripts, see
+aoc.phases, which reports the metrics of each phase when it ends. Counting is
+done in aoc.search, so every day using it is covered.
+
+Counters are summed over a phase, and peaks are the maximum over a phase.
+Solvers count in local variables, and only record when enabled:
+
+  if metrics.enabled:
+      metrics.add("bfs.pushed", pushed)
+      metrics.peak("bfs.frontier", frontier)
+
+>>> enable()
+>>> add("demo.pushed", 3)
+>>> add("demo.pushed")
+>>> peak("demo.frontier", 5)
+>>> peak("demo.frontier", 2)
+>>> report(take(), "part1", sys.stdout)
+--- metrics part1
+  demo.frontier               5
+  demo.pushed                 4
+>>> take()
+{}
+>>> disable()
+"""
+
+import sys
+
+# Checked by callers before counting
+enabled = False
+
+_values = {}
+
+def enable():
+    global enabled
+    enabled = True
+
+def disable():
+    global enabled
+    enabled = False
+    _values.clear()
+
+def add(name, n=1):
+    _values[name] = _values.get(name, 0) + n
+
+def peak(name, value):
+    if value > _values.get(name, value - 1):
+        _values[name] = value
+
+def take():
+    """
+    Get all metrics as a dict, and reset them
+    """
+    values = dict(_values)
+    _values.clear()
+    return values
+
+def report(values, name, file=sys.stderr):
+    print(f"--- metrics {name}", file=file)
+    for key in sorted(values):
+        print(f"  {key:20} {values[key]:>8}", file=file)
@@ -0,0 +1,353 @@
+"""
+Grids and state bitmaps stored bit-packed in memory mapped files
+
+For grids too large to keep in memory. Cells are packed 1, 2, 4 or 8 bits each
+into an mmap, either of a file, where paging is left to the OS, or anonymous.
+PackedArray is a mutable sequence of cell values, so it can be used as the
+visited array of aoc.search, and MappedGrid is an aoc.grid.Grid stored in a
+PackedArray.
+
+Bulk operations (fill, count, find, iteration and translate) work a chunk at a
+time, so they never need memory proportional to the grid.
+
+Mapped grids are enabled with --mapped[=DIR] on day scripts, see aoc.phases,
+or with enable(). Days load their grid with load_grid(), which then streams
+the input into a MappedGrid, and arrays created without a path are backed by
+temporary files in DIR (default the system temporary directory), removed as
+soon as they are mapped, so the OS can page them out.
+
+>>> a = PackedArray(10, bits=2)
+>>> a[3] = 2
+>>> a[9] = 3
+>>> a[8:10] = [1, 1]
+>>> list(a), a.count(0), a.find(1)
+([0, 0, 0, 2, 0, 0, 0, 0, 1, 1], 7, 8)
+
+Breadth first search over a mapped grid, with a mapped bitmap of visited cells:
+
+>>> from aoc.search import bfs, grid_neighbours
+>>> g = MappedGrid.from_lines(["..#", "#..", "..."], {'.': 0, '#': 1}, bits=1)
+>>> print(g.translate({0: ord('.'), 1: ord('#')}, bits=8))
+..#
+#..
+...
+>>> visited = g.blank(1)
+>>> nbrs = grid_neighbours(g, lambda v: v == 0, lazy=not g.in_memory)
+>>> [len(layer) for _, layer in bfs([0], nbrs, visited.data)]
+[1, 1, 1, 2, 2]
+>>> visited.count_nonzero()
+7
+"""
+
+import os
+import mmap
+import tempfile
+
+from aoc.grid import Grid
+from aoc.reader import read, lines, iter_lines, is_compressed
+
+# Number of cells or packed bytes handled at a time by bulk operations
+CHUNK = 1 << 20
+
+# Checked by load_grid and PackedArray
+enabled = False
+directory = None
+
+# Per bits, the cell values packed in each byte value, least significant first
+_unpack = {
+    bits: [
+        bytes((b >> (k * bits)) & ((1 << bits) - 1) for k in range(8 // bits))
+        for b in range(256)
+    ]
+    for bits in (1, 2, 4)
+}
+
+def enable(path=None):
+    """
+    Load grids as mapped grids, with temporary files in directory path
+    """
+    global enabled, directory
+    enabled = True
+    directory = path or tempfile.gettempdir()
+
+def disable():
+    global enabled, directory
+    enabled = False
+    directory = None
+
+def load_grid(f):
+    """
+    Load the grid of an input file, with the characters as cell values
+
+    If enabled and f is a filename, the file is streamed into a MappedGrid,
+    otherwise the grid is parsed into memory
+    """
+    if enabled and type(f) == str:
+        return MappedGrid.from_file(f)
+    return Grid.from_lines(lines(read(f)))
+
+def bits_for(max_value):
+    """
+    Smallest supported cell size for values up to max_value
+
+    >>> bits_for(1), bits_for(3), bits_for(9), bits_for(200)
+    (1, 2, 4, 8)
+    """
+    for bits in (1, 2, 4, 8):
+        if max_value < 1 << bits:
+            return bits
+    raise ValueError(f"Value {max_value} doesn't fit in a byte")
+
+class PackedArray:
+    def __init__(self, length, bits=8, path=None):
+        """
+        Array of length values of bits each, mapped from a new file at path.
+        If path is None, a temporary file is used when enabled, otherwise
+        anonymous memory
+        """
+        if bits not in (1, 2, 4, 8):
+            raise ValueError(f"Unsupported cell size {bits} bits")
+        self.length = length
+        self.bits = bits
+        self.per = 8 // bits
+        self.mask = (1 << bits) - 1
+
+        size = max(1, -(-length // self.per))
+        temporary = path is None and enabled
+        if temporary:
+            fd, path = tempfile.mkstemp(prefix="aoc-", suffix=".map", dir=directory)
+            os.close(fd)
+        if path is None:
+            self.map = mmap.mmap(-1, size)
+        else:
+            with open(path, "w+b") as f:
+                f.truncate(size)
+                self.map = mmap.mmap(f.fileno(), size)
+            if temporary:
+                # The mapping keeps the data until closed
+                os.unlink(path)
+
+    def __len__(self):
+        return self.length
+
+    def _index(self, i):
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError(f"Index {i} out of range")
+        return i
+
+    def __getitem__(self, i):
+        if type(i) == slice:
+            start, stop, step = i.indices(self.length)
+            if step == 1:
+                return self._unpack(start, max(start, stop))
+            return bytes(self[j] for j in range(start, stop, step))
+        i = self._index(i)
+        if self.bits == 8:
+            return self.map[i]
+        return self.map[i // self.per] >> (i % self.per * self.bits) & self.mask
+
+    def __setitem__(self, i, value):
+        if type(i) == slice:
+            self._set_slice(i, value)
+            return
+        i = self._index(i)
+        if not 0 <= value <= self.mask:
+            raise ValueError(f"Value {value} doesn't fit in {self.bits} bits")
+        if self.bits == 8:
+            self.map[i] = value
+            return
+        j = i // self.per
+        shift = i % self.per * self.bits
+        self.map[j] = self.map[j] & ~(self.mask << shift) & 0xff | value << shift
+
+    def _unpack(self, start, stop):
+        """
+        Get values start to stop as bytes
+        """
+        if self.bits == 8:
+            return self.map[start:stop]
+        first = start // self.per
+        last = -(-stop // self.per)
+        data = b"".join(map(_unpack[self.bits].__getitem__, self.map[first:last]))
+        offset = start - first * self.per
+        return data[offset:offset + stop - start]
+
+    def _set_slice(self, s, values):
+        start, stop, step = s.indices(self.length)
+        values = bytes(values)
+        if step != 1 or len(values) != stop - start:
+            raise ValueError("Only contiguous slices of the same length can be assigned")
+        if len(values) > 0 and max(values) > self.mask:
+            raise ValueError(f"Value {max(values)} doesn't fit in {self.bits} bits")
+        if self.bits == 8:
+            self.map[start:stop] = values
+            return
+
+        # Unaligned cells at both ends are set one by one
+        pos = 0
+        while start + pos < stop and (start + pos) % self.per != 0:
+            self[start + pos] = values[pos]
+            pos += 1
+        end = pos + (stop - start - pos) // self.per * self.per
+        bits = self.bits
+        self.map[(start + pos) // self.per:(start + end) // self.per] = bytes(
+            sum(values[g + k] << (k * bits) for k in range(self.per))
+            for g in range(pos, end, self.per)
+        )
+        for pos in range(end, stop - start):
+            self[start + pos] = values[pos]
+
+    def __iter__(self):
+        for start in range(0, self.length, CHUNK):
+            yield from self._unpack(start, min(start + CHUNK, self.length))
+
+    def _chunks(self):
+        """
+        Iterate (first cell, values) of all cells, a chunk at a time
+        """
+        for start in range(0, self.length, CHUNK):
+            yield start, self._unpack(start, min(start + CHUNK, self.length))
+
+    def fill(self, value=0):
+        if not 0 <= value <= self.mask:
+            raise ValueError(f"Value {value} doesn't fit in {self.bits} bits")
+        byte = sum(value << (k * self.bits) for k in range(self.per))
+        block = bytes([byte]) * min(CHUNK, len(self.map))
+        for start in range(0, len(self.map), CHUNK):
+            end = min(start + CHUNK, len(self.map))
+            self.map[start:end] = block[:end - start]
+
+    def count(self, value):
+        return sum(values.count(value) for _, values in self._chunks())
+
+    def find(self, value):
+        """
+        Get index of the first cell with value, or -1
+        """
+        if self.bits == 8:
+            return self.map.find(bytes([value]), 0, self.length)
+        for start, values in self._chunks():
+            i = values.find(value)
+            if i >= 0:
+                return start + i
+        return -1
+
+    def raw(self):
+        """
+        Iterate the packed bytes, a chunk at a time
+        """
+        for start in range(0, len(self.map), CHUNK):
+            yield self.map[start:start + CHUNK]
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.map.close()
+
+class MappedGrid(Grid):
+    in_memory = False
+
+    def __init__(self, width, height, bits=8, fill=0, path=None):
+        self.width = width
+        self.height = height
+        self.bits = bits
+        self.data = PackedArray(width * height, bits, path)
+        if fill != 0:
+            self.data.fill(fill)
+
+    @classmethod
+    def from_lines(cls, lines, values=None, bits=8, path=None):
+        """
+        Create a grid from lines of text, as str or bytes. Empty lines are
+        skipped. lines is iterated twice, first to get the size
+
+        values maps characters to cell values, and is needed unless bits is 8
+        """
+        width = None
+        height = 0
+        for line in lines:
+            line = line.strip()
+            if line:
+                width = width or len(line)
+                height += 1
+
+        table = bytes(range(256))
+        if values is not None:
+            table = bytearray(table)
+            for k, v in values.items():
+                table[ord(k) if type(k) == str else k] = v
+
+        grid = cls(width or 0, height, bits, path=path)
+        y = 0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if len(line) != width:
+                raise ValueError(f"Grid line {y} has length {len(line)}, expected {width}")
+            line = line.encode() if type(line) == str else bytes(line)
+            grid.data[y * width:(y + 1) * width] = line.translate(table)
+            y += 1
+        return grid
+
+    @classmethod
+    def from_file(cls, f, values=None, bits=8, path=None):
+        """
+        Create a grid from an input file, streaming it twice instead of
+        reading it into memory
+        """
+        class Lines:
+            def __iter__(self):
+                if is_compressed(f):
+                    yield from iter_lines(f)
+                    return
+                with open(f, "rb") as fh:
+                    yield from iter_lines(fh)
+        return cls.from_lines(Lines(), values, bits, path)
+
+    def blank(self, max_value=255, path=None):
+        """
+        Get a grid of zeros of the same size, for values up to max_value
+        """
+        return MappedGrid(self.width, self.height, bits_for(max_value), path=path)
+
+    def states(self, length, max_value=255):
+        return PackedArray(length, bits_for(max_value))
+
+    def key(self):
+        return b"".join(self.data.raw())
+
+    def copy(self, path=None):
+        grid = MappedGrid(self.width, self.height, self.bits, path=path)
+        pos = 0
+        for block in self.data.raw():
+            grid.data.map[pos:pos + len(block)] = block
+            pos += len(block)
+        return grid
+
+    def fill(self, value=0):
+        self.data.fill(value)
+
+    def translate(self, values, bits=None, path=None):
+        """
+        Get a copy with cell values mapped through a dict, optionally with a
+        different cell size
+        """
+        table = bytearray(range(256))
+        for k, v in values.items():
+            if type(k) == str:
+                k = ord(k)
+            table[k] = v
+        grid = MappedGrid(self.width, self.height, bits or self.bits, path=path)
+        for start, cells in self.data._chunks():
+            grid.data[start:start + len(cells)] = cells.translate(table)
+        return grid
+
+    def transpose(self, path=None):
+        grid = MappedGrid(self.height, self.width, self.bits, path=path)
+        for x in range(self.width):
+            grid.data[x * self.height:(x + 1) * self.height] = self.col(x)
+        return grid
@@ -0,0 +1,213 @@
+"""
+Optional instrumentation of the phases of a day script
+
+Usage: ./parts.py [--profile[=N]] [--memory[=N]] [--metrics] [--trace[=FILE]] [--mapped[=DIR]] [--batch[=FORMAT]] <input file>
+       ./parts.py --batch[=FORMAT] [--jobs=N] <dir, glob or file> ...
+
+Each phase of a day script (parsing the input, and each part) is wrapped with
+phases("name"), which does nothing unless instrumentation is enabled on the
+command line:
+
+--profile[=N]  profile each phase separately with cProfile. Stats are written
+               to <day>_<script>.<phase>.pstats in the current directory, and
+               the top N functions by cumulative time (default 20) are printed
+               to stderr. Inspect saved stats with python3 -m pstats <file>
+
+--memory[=N]   trace memory allocations of each phase with tracemalloc, and
+               print peak and retained memory, and the top N allocation sites
+               of retained memory (default 10) to stderr. Tracing slows down
+               execution a lot
+
+--metrics      count work done by the searches, such as states pushed and
+               popped, and print the counts of each phase to stderr, see
+               aoc.metrics
+
+--trace[=FILE] write trace events of the solvers as json lines to FILE
+               (default stderr), with a span for each phase, see aoc.trace
+
+--mapped[=DIR] load grids of grid days as memory mapped, bit-packed grids,
+               backed by temporary files in DIR (default the system temporary
+               directory), for grids larger than memory, see aoc.mmgrid
+
+--batch[=FORMAT] run all parts of the day against every input file given, in
+               N worker processes (default cpu count), and print results as csv
+               or json (default csv) as they finish, see aoc.batch
+"""
+
+import os
+import sys
+import contextlib
+
+from aoc import trace
+from aoc import metrics
+from aoc.days import Day
+
+# Options taken by Phases, for the usage of day scripts
+OPTIONS = "[--profile[=N]] [--memory[=N]] [--metrics] [--trace[=FILE]] [--mapped[=DIR]] [--batch[=FORMAT]]"
+
+class MemoryTrace:
+    """
+    Trace memory allocations within a with-block
+
+    After the block, peak is the highest memory allocated during the block and
+    retained is memory still allocated after the block, both in bytes and
+    relative to the start of the block
+
+    tracemalloc is imported when used, as it is slow to import
+    """
+    def __init__(self, snapshot=False, frames=1):
+        self.snapshot = snapshot
+        self.frames = frames
+        self.peak = None
+        self.retained = None
+        self.sites = None
+
+    def __enter__(self):
+        import tracemalloc
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start(self.frames)
+        self._before = self._snapshot() if self.snapshot else None
+        tracemalloc.reset_peak()
+        self._base, _ = tracemalloc.get_traced_memory()
+        return self
+
+    def _snapshot(self):
+        import tracemalloc
+        # Allocations by the tracing itself aren't of interest
+        ignore = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, contextlib.__file__),
+        ]
+        return tracemalloc.take_snapshot().filter_traces(ignore)
+
+    def __exit__(self, *exc):
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = peak - self._base
+        self.retained = current - self._base
+        if self.snapshot:
+            after = self._snapshot()
+            self.sites = after.compare_to(self._before, "lineno")
+        if self._started:
+            tracemalloc.stop()
+        self._before = None
+        return False
+
+def format_size(size):
+    """
+    >>> format_size(512)
+    '512 B'
+    >>> format_size(3 << 20)
+    '3.0 MiB'
+    """
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(size) < 1024:
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+class Phases:
+    def __init__(self, argv):
+        """
+        Take instrumentation options from argv, which is modified in place so
+        the script sees only its own arguments
+        """
+        self.profile_top = None
+        self.memory_top = None
+        batch_format = None
+        jobs = None
+
+        rest = []
+        for arg in argv:
+            if arg == "--profile":
+                self.profile_top = 20
+            elif arg.startswith("--profile="):
+                self.profile_top = int(arg[len("--profile="):])
+            elif arg == "--memory":
+                self.memory_top = 10
+            elif arg.startswith("--memory="):
+                self.memory_top = int(arg[len("--memory="):])
+            elif arg == "--metrics":
+                metrics.enable()
+            elif arg == "--trace":
+                trace.enable("-")
+            elif arg.startswith("--trace="):
+                trace.enable(arg[len("--trace="):])
+            elif arg == "--mapped" or arg.startswith("--mapped="):
+                # Imported when used, as only grid days need it
+                from aoc import mmgrid
+                mmgrid.enable(arg[len("--mapped="):] or None)
+            elif arg == "--batch":
+                batch_format = "csv"
+            elif arg.startswith("--batch="):
+                batch_format = arg[len("--batch="):]
+            elif arg.startswith("--jobs="):
+                jobs = int(arg[len("--jobs="):])
+            else:
+                rest.append(arg)
+        argv[:] = rest
+        self.script = argv[0]
+
+        script = os.path.abspath(argv[0])
+        day = os.path.basename(os.path.dirname(script))
+        name = os.path.splitext(os.path.basename(script))[0]
+        self.prefix = f"{day}_{name}"
+
+        if batch_format is not None:
+            # Runs instead of the script
+            from aoc import batch
+            sys.exit(batch.main(Day(os.path.dirname(script)), argv[1:], batch_format, jobs))
+
+    def usage(self, args="<input file>"):
+        """
+        Print usage of the day script, taking args after the options, and exit
+        """
+        print(f"Usage: {self.script} {OPTIONS} {args}")
+        sys.exit(1)
+
+    @contextlib.contextmanager
+    def __call__(self, name):
+        # Callbacks run in reverse order, so reports are printed after both
+        # the profiler and the memory trace are stopped
+        memory = MemoryTrace(snapshot=True)
+        profile = None
+        if self.profile_top is not None:
+            # Imported when used, as pstats is slow to import
+            import cProfile
+            profile = cProfile.Profile()
+        with contextlib.ExitStack() as stack:
+            if self.profile_top is not None:
+                stack.callback(self._report_profile, name, profile)
+            if metrics.enabled:
+                metrics.take()
+                stack.callback(self._report_metrics, name)
+            if self.memory_top is not None:
+                stack.callback(self._report_memory, name, memory)
+                stack.enter_context(memory)
+            if self.profile_top is not None:
+                stack.enter_context(profile)
+            stack.enter_context(trace.span(f"phase.{name}", script=self.prefix))
+            yield
+
+    def _report_profile(self, name, profile):
+        path = f"{self.prefix}.{name}.pstats"
+        profile.dump_stats(path)
+        print(f"--- profile {name}, saved to {path}", file=sys.stderr)
+        import pstats
+        stats = pstats.Stats(profile, stream=sys.stderr)
+        stats.sort_stats("cumulative").print_stats(self.profile_top)
+
+    def _report_metrics(self, name):
+        values = metrics.take()
+        if len(values) > 0:
+            metrics.report(values, name)
+
+    def _report_memory(self, name, memory):
+        print(
+            f"--- memory {name}: peak {format_size(memory.peak)}, "
+            f"retained {format_size(memory.retained)}",
+            file=sys.stderr
+        )
+        for stat in memory.sites[:self.memory_top]:
+            print(f"  {stat}", file=sys.stderr)
@@ -0,0 +1,209 @@
+"""
+Read puzzle input as bytes, and tokenize it without per-line str objects
+
+Every Input accepts a filename, a file-like object, or a bytes-like object
+(bytes, bytearray, memoryview or mmap). read() gives a bytes-like buffer for
+all of them, where files are memory mapped.
+
+Files compressed with gzip, bzip2 or xz are detected by suffix or magic bytes,
+and decompressed transparently. chunks() iterates the input as blocks ending at
+line boundaries, and decompresses in a background thread into a bounded queue.
+Line based parsers using chunks(), findall() or iter_lines() therefore parse
+one block while the next is decompressed.
+
+Parsing is done by precompiled bytes regexes run over the whole buffer, either
+the helpers here or patterns compiled at module level in each day. Matched
+groups are bytes, which int() accepts directly. Only names and labels that are
+used as keys needs to be decoded.
+
+>>> lines(b"ab \\n\\n cd\\r\\n")
+[b'ab', b'cd']
+>>> ints(memoryview(b"seeds: 79 14 -55"))
+[79, 14, -55]
+>>> blocks(b"#.\\n.#\\n\\n..\\n##\\n")
+[b'#.\\n.#\\n', b'..\\n##\\n']
+"""
+
+import re
+import bz2
+import gzip
+import lzma
+import mmap
+import queue
+import threading
+
+_re_int = re.compile(rb"-?[0-9]+")
+_re_block = re.compile(rb"(?:[^\S\r\n]*\S[^\r\n]*(?:\r?\n|$))+")
+
+_suffixes = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+_magic = [
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+]
+
+# Size of each decompressed block, and number of blocks buffered ahead
+CHUNK_SIZE = 1 << 20
+CHUNK_QUEUE = 8
+
+def _decompressor(path):
+    """
+    Get function to open path as a decompressed stream, or None if not
+    compressed
+    """
+    for suffix, opener in _suffixes.items():
+        if path.endswith(suffix):
+            return opener
+    with open(path, "rb") as fh:
+        head = fh.read(6)
+    for magic, opener in _magic:
+        if head.startswith(magic):
+            return opener
+    return None
+
+def is_compressed(path):
+    """
+    Whether the file at path is compressed, and is decompressed when read
+    """
+    return _decompressor(path) is not None
+
+def _produce(fh, blocks, stop, chunk_size):
+    try:
+        with fh:
+            while not stop.is_set():
+                block = fh.read(chunk_size)
+                while not stop.is_set():
+                    try:
+                        blocks.put(block, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if block == b"":
+                    return
+    except Exception as e:
+        blocks.put(e)
+
+def _background(fh, chunk_size):
+    """
+    Read fh in a background thread, and iterate the blocks
+    """
+    blocks = queue.Queue(CHUNK_QUEUE)
+    stop = threading.Event()
+    thread = threading.Thread(target=_produce, args=(fh, blocks, stop, chunk_size), daemon=True)
+    thread.start()
+    try:
+        while True:
+            block = blocks.get()
+            if isinstance(block, Exception):
+                raise block
+            if block == b"":
+                return
+            yield block
+    finally:
+        stop.set()
+
+def _read_block(f, size):
+    data = f.read(size)
+    if type(data) == str:
+        data = data.encode()
+    return data
+
+def chunks(f, chunk_size=CHUNK_SIZE):
+    """
+    Iterate input as blocks of whole lines
+
+    Compressed files are decompressed in a background thread, and file-like
+    objects are read block by block. Uncompressed files and bytes-like objects
+    are given as a single block
+    """
+    if type(f) == str:
+        opener = _decompressor(f)
+        if opener is None:
+            yield read(f)
+            return
+        raw = _background(opener(f, "rb"), chunk_size)
+    elif isinstance(f, (bytes, bytearray, memoryview, mmap.mmap)):
+        yield f
+        return
+    else:
+        raw = iter(lambda: _read_block(f, chunk_size), b"")
+
+    # Realign blocks to end at line boundaries
+    rest = b""
+    for block in raw:
+        end = block.rfind(b"\n") + 1
+        if end == 0:
+            rest += block
+            continue
+        yield rest + block[:end]
+        rest = block[end:]
+    if rest != b"":
+        yield rest
+
+def findall(pattern, f):
+    """
+    Iterate pattern.findall() over all chunks of f
+
+    Matches can't span multiple lines
+    """
+    for block in chunks(f):
+        yield from pattern.findall(block)
+
+def iter_lines(f):
+    """
+    Iterate lines over all chunks of f, as lines()
+    """
+    for block in chunks(f):
+        yield from lines(block)
+
+def read(f):
+    """
+    Get input as a bytes-like object
+
+    f can be either a filename, a file-like object or a bytes-like object
+    """
+    if type(f) == str and is_compressed(f):
+        return b"".join(chunks(f))
+    if type(f) == str:
+        with open(f, "rb") as fh:
+            try:
+                return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped
+                return b""
+    if isinstance(f, (bytes, bytearray, memoryview, mmap.mmap)):
+        return f
+    data = f.read()
+    if type(data) == str:
+        data = data.encode()
+    return data
+
+def lines(buf):
+    """
+    Get all non-empty lines, stripped from whitespace
+    """
+    # A single copy to bytes, and split in C, is faster than a regex scan
+    return [l for l in (l.strip() for l in bytes(buf).splitlines()) if l != b""]
+
+def ints(buf):
+    """
+    Get all integers in buf
+    """
+    return list(map(int, _re_int.findall(buf)))
+
+def blocks(buf):
+    """
+    Get groups of lines separated by empty lines
+    """
+    return _re_block.findall(buf)
+
+def text(buf):
+    """
+    Decode the entire buffer as str
+    """
+    return bytes(buf).decode()
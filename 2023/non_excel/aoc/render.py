@@ -0,0 +1,109 @@
+"""
+Render grids as text for debugging, with highlighted cells
+
+The whole frame is built in one buffer and written at once. Each run of
+highlighted cells in a row gets a single pair of ANSI escapes, instead of one
+pair per cell.
+
+Large grids can be cropped to a viewport (x0, y0, x1, y1), and downsampled by
+an integer scale, where each character shows the top left cell of a scale x
+scale block, highlighted if any cell in the block is.
+
+>>> g = Grid.from_lines(["#..#", "....", "..#.", "...."])
+>>> print(render(g, highlight={1, 2, 5}, on="[", off="]"))
+#[..]#
+.[.]..
+..#.
+....
+>>> print(render(g, highlight={1, 2, 5}, viewport=(1, 0, 4, 2), on="[", off="]"))
+[..]#
+[.]..
+>>> print(render(g, highlight={5}, scale=2, on="[", off="]"))
+[#].
+.#
+"""
+
+import re
+import sys
+
+from aoc.grid import Grid
+
+HIGHLIGHT = "\x1b[44m"
+CLEAR = "\x1b[0m"
+
+_runs = re.compile(rb"[^\x00]+")
+
+def char_table(chars=None):
+    """
+    Get a translation table from cell values to characters, from a dict of
+    values to single characters. Other values are shown as their character code
+    """
+    table = bytearray(range(256))
+    for k, v in (chars or {}).items():
+        table[ord(k) if type(k) == str else k] = ord(v)
+    return bytes(table)
+
+def _mask(highlight, size):
+    """
+    Get highlighted cells as a sequence indexed by cell, from a set of cell
+    indexes, a Grid, or a sequence that is non-zero for highlighted cells
+    """
+    if highlight is None:
+        return None
+    if isinstance(highlight, Grid):
+        return highlight.data
+    if isinstance(highlight, (set, frozenset)):
+        mask = bytearray(size)
+        for i in highlight:
+            mask[i] = 1
+        return mask
+    return highlight
+
+def render(grid, highlight=None, chars=None, viewport=None, scale=1, on=HIGHLIGHT, off=CLEAR):
+    """
+    Render grid as a string, with cells shown through the dict chars, and the
+    cells in highlight shown between on and off
+    """
+    table = char_table(chars)
+    mask = _mask(highlight, grid.width * grid.height)
+    x0, y0, x1, y1 = viewport or (0, 0, grid.width, grid.height)
+    x0, x1 = max(x0, 0), min(x1, grid.width)
+    y0, y1 = max(y0, 0), min(y1, grid.height)
+
+    out = []
+    for y in range(y0, y1, scale):
+        start = y * grid.width
+        row = grid.data[start + x0:start + x1:scale]
+        line = bytes(row).translate(table).decode("latin-1")
+        if mask is None:
+            out.append(line)
+            continue
+
+        if scale == 1:
+            marks = bytes(mask[start + x0:start + x1])
+        else:
+            # Highlighted if any cell of the block is
+            block = bytearray(len(line))
+            for dy in range(min(scale, y1 - y)):
+                first = start + dy * grid.width
+                for m in _runs.finditer(bytes(mask[first + x0:first + x1])):
+                    lo = m.start() // scale
+                    hi = (m.end() - 1) // scale + 1
+                    block[lo:hi] = b"\x01" * (hi - lo)
+            marks = bytes(block)
+
+        pos = 0
+        parts = []
+        for m in _runs.finditer(marks):
+            parts += [line[pos:m.start()], on, line[m.start():m.end()], off]
+            pos = m.end()
+        parts.append(line[pos:])
+        out.append("".join(parts))
+    return "\n".join(out)
+
+def show(grid, highlight=None, chars=None, viewport=None, scale=1, file=sys.stdout):
+    """
+    Write a rendered grid to file, in a single write
+    """
+    file.write(render(grid, highlight, chars, viewport, scale) + "\n")
+    file.flush()
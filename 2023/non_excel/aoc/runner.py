@@ -0,0 +1,147 @@
+"""
+Run all days in parallel, and report timing for each part
+
+Usage: python3 -m aoc.runner [-j jobs] [-i input] [-m] [day ...]
+
+Each part of each day is a separate job in a process pool, so a few slow days
+doesn't keep the other cores idle. The input file for a day is found by
+formatting the --input pattern, relative to the 2023/non_excel directory.
+
+With --memory, allocations are traced with tracemalloc, and peak memory of
+parsing and solving, and memory retained by the parsed input and the solver, are
+reported next to the timings. Tracing slows down execution, so timings aren't
+comparable to runs without it.
+
+Set AOC_CACHE to a directory to cache parsed inputs and intermediate results
+between runs, see aoc.cache.
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aoc.days import ROOT, Day, find_days
+from aoc.cache import load_input
+from aoc.phases import MemoryTrace, format_size
+
+class Result:
+    def __init__(self, day, part, input_path):
+        self.day = day
+        self.part = part
+        self.input_path = input_path
+        self.parse_wall = None
+        self.wall = None
+        self.cpu = None
+        self.parse_peak = None
+        self.parse_retained = None
+        self.peak = None
+        self.retained = None
+        self.answer = None
+        self.error = None
+
+    def __lt__(self, other):
+        return (self.day, self.part) < (other.day, other.part)
+
+def timed(fn):
+    """
+    Call fn, and return the tuple (result, wall time, cpu time)
+    """
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    result = fn()
+    return result, time.perf_counter() - wall, time.process_time() - cpu
+
+def solve(day_path, part, input_path, memory=False, params=None, load=load_input):
+    """
+    Parse input and run a single part. Intended to run in a worker process
+
+    Debug output printed by the solvers is discarded. If memory is set, memory
+    usage of parsing and running is traced. params are passed as keyword
+    arguments to PartN, and load(Input, path) parses the input
+    """
+    day = Day(day_path)
+    result = Result(day.name, part, input_path)
+    try:
+        Input, Part = day.load(part)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            with MemoryTrace() if memory else contextlib.nullcontext() as trace:
+                input, result.parse_wall, _ = timed(lambda: load(Input, input_path))
+            if memory:
+                result.parse_peak, result.parse_retained = trace.peak, trace.retained
+            with MemoryTrace() if memory else contextlib.nullcontext() as trace:
+                # Construction is timed with run(), as some parts prepare there
+                answer, result.wall, result.cpu = timed(lambda: Part(input, **(params or {})).run())
+            if memory:
+                result.peak, result.retained = trace.peak, trace.retained
+        result.answer = str(answer)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+def input_path(day, pattern):
+    return os.path.join(ROOT, pattern.format(day=day.name, num=day.num))
+
+def jobs(days, pattern):
+    """
+    List all (day, part, input path) to run. Days without input are skipped
+    """
+    for day in days:
+        path = input_path(day, pattern)
+        if not os.path.exists(path):
+            print(f"{day}: no input {path}, skipping", file=sys.stderr)
+            continue
+        for part in day.parts():
+            yield day, part, path
+
+def run_all(days, pattern, max_workers=None, memory=False):
+    """
+    Run all parts of days in a process pool, and return list of Result
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(solve, day.path, part, path, memory)
+            for day, part, path in jobs(days, pattern)
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+    results.sort()
+    return results
+
+def _fmt_time(t):
+    return f"{t:9.3f}s" if t is not None else f"{'-':>10}"
+
+def _fmt_size(size):
+    return f"{format_size(size):>10}" if size is not None else f"{'-':>10}"
+
+def print_table(results, file=sys.stdout, memory=False):
+    mem_header = ""
+    if memory:
+        mem_header = f" {'parse peak':>10} {'input':>10} {'peak':>10} {'retained':>10}"
+    print(f"{'day':6} {'part':>4} {'parse':>10} {'wall':>10} {'cpu':>10}{mem_header}  answer", file=file)
+    for r in results:
+        answer = r.answer if r.error is None else f"<{r.error}>"
+        mem = ""
+        if memory:
+            mem = f" {_fmt_size(r.parse_peak)} {_fmt_size(r.parse_retained)} {_fmt_size(r.peak)} {_fmt_size(r.retained)}"
+        print(f"{r.day:6} {r.part:4} {_fmt_time(r.parse_wall)} {_fmt_time(r.wall)} {_fmt_time(r.cpu)}{mem}  {answer}", file=file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python3 -m aoc.runner", description="Run all 2023 days in parallel")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: cpu count)")
+    parser.add_argument("-i", "--input", default="{day}/input.txt", help="input file pattern, formatted with {day} and {num} (default: %(default)s)")
+    parser.add_argument("-m", "--memory", action="store_true", help="trace peak and retained memory, slows down execution")
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default: all)")
+    args = parser.parse_args()
+
+    days = find_days(nums=args.days or None)
+
+    results, wall, cpu = timed(lambda: run_all(days, args.input, args.jobs, args.memory))
+    print_table(results, memory=args.memory)
+
+    cpu_sum = sum(r.cpu for r in results if r.cpu is not None)
+    print(f"\nTotal: {wall:.3f}s wall, {cpu_sum:.3f}s cpu in solvers")
@@ -0,0 +1,268 @@
+"""
+Graph search over states encoded as integers
+
+States are numbered 0..n-1, typically packed from a grid index and a direction
+as index * ndirs + dir, so visited states and best costs are kept in flat
+arrays instead of sets of objects. Neighbours are given either as a function
+of a state, or as a list indexed by state when the transitions are
+precomputed.
+
+When aoc.metrics is enabled, the searches count states pushed and popped,
+states rejected as already visited or not improving, the peak frontier or queue
+size, and for depth first search the number of calls and depth reached.
+
+The visited array is owned by the caller. Any mutable sequence indexed by state
+works, usually a bytearray or the data of an aoc.grid.Grid. States can be
+marked in advance to exclude them from the search, and the array can be
+inspected afterwards.
+
+A 3x3 grid, with a wall in the middle column except at the bottom:
+
+>>> grid = Grid.from_lines(["S#.", ".#.", "..."])
+>>> nbrs = grid_neighbours(grid, lambda v: v != ord('#'))
+>>> [(depth, layer) for depth, layer in bfs([0], nbrs, bytearray(9))]
+[(0, [0]), (1, [3]), (2, [6]), (3, [7]), (4, [8]), (5, [5]), (6, [2])]
+
+Dijkstra where each step costs the value of the cell entered:
+
+>>> costs = [1, 9, 1, 1, 9, 1, 1, 1, 1]
+>>> edges = lambda s: ((n, costs[n]) for n in nbrs[s])
+>>> for cost, s in dial([0], edges, 9, bytearray(9)):
+...     if s == 2:
+...         break
+>>> cost
+6
+"""
+
+from aoc.grid import Grid
+from aoc import metrics
+
+def grid_neighbours(grid, open, lazy=False):
+    """
+    Precompute neighbours of each cell of a grid, as a list indexed by cell
+    index. open(value) tells if a cell can be entered. Closed cells have no
+    neighbours
+
+    With lazy set, a function calculating the neighbours of a cell when called
+    is returned instead, for grids too large for a list of all cells
+    """
+    width = grid.width
+    data = grid.data
+    size = len(data)
+    passable = [open(v) for v in range(256)]
+
+    def neighbours(i):
+        cur = []
+        if passable[data[i]]:
+            x = i % width
+            if x + 1 < width and passable[data[i + 1]]:
+                cur.append(i + 1)
+            if i + width < size and passable[data[i + width]]:
+                cur.append(i + width)
+            if x > 0 and passable[data[i - 1]]:
+                cur.append(i - 1)
+            if i >= width and passable[data[i - width]]:
+                cur.append(i - width)
+        return cur
+
+    if lazy:
+        return neighbours
+    return [neighbours(i) for i in range(size)]
+
+def _counted(fn, stats):
+    """
+    Wrap a neighbour or edge function, counting the items it gives
+    """
+    def counted(s):
+        items = list(fn(s))
+        stats[0] += len(items)
+        return items
+    return counted
+
+def bfs(starts, neighbours, visited, max_depth=None):
+    """
+    Breadth first search from starts
+
+    Iterates (depth, layer), where layer is the list of states first reached at
+    that depth. Reached states are marked in visited. Stops after max_depth if
+    given
+    """
+    if not callable(neighbours):
+        neighbours = neighbours.__getitem__
+    if max_depth is not None and max_depth < 0:
+        return iter([])
+    if metrics.enabled:
+        return _bfs_counted(starts, neighbours, visited, max_depth)
+    return _bfs(starts, neighbours, visited, max_depth)
+
+def _bfs(starts, neighbours, visited, max_depth):
+    layer = []
+    for s in starts:
+        if not visited[s]:
+            visited[s] = 1
+            layer.append(s)
+
+    depth = 0
+    while len(layer) > 0:
+        yield depth, layer
+        if depth == max_depth:
+            return
+        next_layer = []
+        for s in layer:
+            for n in neighbours(s):
+                if not visited[n]:
+                    visited[n] = 1
+                    next_layer.append(n)
+        layer = next_layer
+        depth += 1
+
+def _bfs_counted(starts, neighbours, visited, max_depth):
+    examined = [0]
+    started = 0
+    pushed = 0
+    popped = 0
+    frontier = 0
+    try:
+        for depth, layer in _bfs(starts, _counted(neighbours, examined), visited, max_depth):
+            if depth == 0:
+                started = len(layer)
+            pushed += len(layer)
+            frontier = max(frontier, len(layer))
+            yield depth, layer
+            if depth != max_depth:
+                popped += len(layer)
+    finally:
+        # Neighbours not pushed were already visited
+        metrics.add("bfs.calls")
+        metrics.add("bfs.pushed", pushed)
+        metrics.add("bfs.popped", popped)
+        metrics.add("bfs.rejected", examined[0] - (pushed - started))
+        metrics.peak("bfs.frontier", frontier)
+
+def dial(starts, edges, max_weight, settled, best=None):
+    """
+    Dijkstra's algorithm using Dial's bucket queue, for integer edge weights
+    between 1 and max_weight
+
+    edges(state) iterates (next state, weight). Iterates (cost, state) for each
+    state as it is settled, in order of increasing cost. Settled states are
+    marked in settled, and states are only queued when improving the best
+    known cost, so the queue is kept small
+
+    The best known cost of a state not yet settled is always within
+    max_weight of the current cost, so best costs are kept modulo
+    max_weight + 1, plus one so 0 is unknown. best is a sequence of zeros of
+    the same length as settled, by default a bytearray if the values fit, or
+    for example an aoc.mmgrid.PackedArray for searches too large for memory
+    """
+    counting = metrics.enabled
+    if counting:
+        examined = [0]
+        edges = _counted(edges, examined)
+        settled_before = sum(settled)
+        popped = 0
+        frontier = 0
+
+    size = max_weight + 1
+    buckets = [[] for _ in range(size)]
+    if best is None:
+        best = bytearray(len(settled)) if size < 256 else [0] * len(settled)
+    for s in starts:
+        buckets[0].append(s)
+        best[s] = 1
+    queued = len(buckets[0])
+    started = queued
+
+    cost = 0
+    try:
+        while queued > 0:
+            bucket = buckets[cost % size]
+            if len(bucket) > 0:
+                if counting:
+                    frontier = max(frontier, queued)
+                    popped += len(bucket)
+                buckets[cost % size] = []
+                queued -= len(bucket)
+                current = cost % size + 1
+                for s in bucket:
+                    if settled[s] or best[s] != current:
+                        continue
+                    settled[s] = 1
+                    yield cost, s
+                    for n, weight in edges(s):
+                        new_cost = cost + weight
+                        old = best[n]
+                        if not settled[n] and (old == 0 or new_cost < cost + (old - current) % size):
+                            best[n] = new_cost % size + 1
+                            buckets[new_cost % size].append(n)
+                            queued += 1
+            cost += 1
+    finally:
+        if counting:
+            # Popped states are stale if settled at a lower cost after being
+            # queued, and edges not pushed didn't improve the best cost
+            pushed = popped + queued
+            metrics.add("dial.calls")
+            metrics.add("dial.pushed", pushed)
+            metrics.add("dial.popped", popped)
+            metrics.add("dial.stale", popped - (sum(settled) - settled_before))
+            metrics.add("dial.rejected", examined[0] - (pushed - started))
+            metrics.peak("dial.queue", frontier)
+
+def longest_path(edges, start, end):
+    """
+    Length of the longest path from start to end, not visiting any state twice
+
+    edges is a list indexed by state, of lists of (next state, weight). The
+    visited states along the current path are kept as a bitmask. Returns None
+    if end isn't reachable
+
+    >>> longest_path([[(1, 1), (2, 5)], [(2, 1), (3, 10)], [(1, 1), (3, 1)], []], 0, 3)
+    16
+    """
+    best = None
+
+    def walk(s, visited, length):
+        nonlocal best
+        if s == end:
+            if best is None or best < length:
+                best = length
+            return
+        visited |= 1 << s
+        for n, weight in edges[s]:
+            if not visited >> n & 1:
+                walk(n, visited, length + weight)
+
+    if not metrics.enabled:
+        walk(start, 0, 0)
+        return best
+
+    # Same search, counting calls, paths found, branches not taken since
+    # already on the path, and the depth reached
+    calls = 0
+    paths = 0
+    pruned = 0
+    max_depth = 0
+
+    def walk_counted(s, visited, length, depth):
+        nonlocal best, calls, paths, pruned, max_depth
+        calls += 1
+        max_depth = max(max_depth, depth)
+        if s == end:
+            paths += 1
+            if best is None or best < length:
+                best = length
+            return
+        visited |= 1 << s
+        for n, weight in edges[s]:
+            if not visited >> n & 1:
+                walk_counted(n, visited, length + weight, depth + 1)
+            else:
+                pruned += 1
+
+    walk_counted(start, 0, 0, 0)
+    metrics.add("dfs.calls", calls)
+    metrics.add("dfs.paths", paths)
+    metrics.add("dfs.pruned", pruned)
+    metrics.peak("dfs.depth", max_depth)
+    return best
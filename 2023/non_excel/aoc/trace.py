@@ -0,0 +1,136 @@
+"""
+Structured tracing of solver internals, as json lines
+
+Tracing is disabled by default, and enabled by setting AOC_TRACE to a file
+name, or to "-" for stderr. Day scripts also take --trace[=FILE], see
+aoc.phases. AOC_TRACE_FILTER can be set to a comma separated list of name
+prefixes, to only trace matching events and spans.
+
+Record a single event with event(name, **fields), or time a block with
+"with span(name, **fields):". Each event or finished span is written as one
+json object per line:
+
+  {"t": 0.0123, "event": "day05.stage", "name": "soil", "seeds": 4}
+  {"t": 0.0101, "span": "day05.translate", "dur": 0.0022, "depth": 0}
+
+where t is seconds since tracing started, and for spans the start of the span.
+Fields that aren't json types are written with str().
+
+Both are no-ops when disabled, but the arguments are still evaluated. In hot
+paths, guard the call to make it free when disabled:
+
+  if trace.enabled:
+      trace.event("day08.combine", loc=loc, ghost=str(ghost))
+
+>>> import io
+>>> out = io.StringIO()
+>>> enable(out, clock=lambda: 0.5)
+>>> event("demo.step", n=1, items={2, 1})
+>>> with span("demo.block", size=3):
+...     event("demo.inner")
+>>> print(out.getvalue(), end="")
+{"t": 0.0, "event": "demo.step", "n": 1, "items": "{1, 2}"}
+{"t": 0.0, "event": "demo.inner", "depth": 1}
+{"t": 0.0, "span": "demo.block", "dur": 0.0, "depth": 0, "size": 3}
+>>> disable()
+>>> event("demo.step", n=2)
+>>> out.getvalue().count("\\n")
+3
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import contextlib
+
+# Checked by callers before building event fields
+enabled = False
+
+_out = None
+_clock = time.perf_counter
+_start = 0.0
+_depth = 0
+_prefixes = None
+
+_null_span = contextlib.nullcontext()
+
+def enable(out, prefixes=None, clock=time.perf_counter):
+    """
+    Start tracing to out, which is a file name, "-" for stderr, or a file-like
+    object. prefixes optionally limits tracing to names starting with any of
+    them
+    """
+    global enabled, _out, _clock, _start, _depth, _prefixes
+    disable()
+    if out == "-":
+        out = sys.stderr
+    elif type(out) == str:
+        out = open(out, "w")
+        atexit.register(out.close)
+    _out = out
+    _clock = clock
+    _start = clock()
+    _depth = 0
+    _prefixes = tuple(prefixes) if prefixes else None
+    enabled = True
+
+def disable():
+    global enabled, _out
+    enabled = False
+    if _out is not None:
+        _out.flush()
+    _out = None
+
+def _wanted(name):
+    return _prefixes is None or name.startswith(_prefixes)
+
+def _write(record, fields):
+    record.update(fields)
+    _out.write(json.dumps(record, default=str) + "\n")
+
+def event(name, /, **fields):
+    """
+    Record an event
+    """
+    if not enabled or not _wanted(name):
+        return
+    record = {"t": round(_clock() - _start, 6), "event": name}
+    if _depth > 0:
+        record["depth"] = _depth
+    _write(record, fields)
+
+@contextlib.contextmanager
+def _span(name, fields):
+    global _depth
+    start = _clock()
+    depth = _depth
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth = depth
+        if enabled:
+            end = _clock()
+            record = {
+                "t": round(start - _start, 6),
+                "span": name,
+                "dur": round(end - start, 6),
+                "depth": depth,
+            }
+            _write(record, fields)
+
+def span(name, /, **fields):
+    """
+    Context manager recording the time spent in a block, written when the
+    block exits. Events within the block are written with their depth
+    """
+    if not enabled or not _wanted(name):
+        return _null_span
+    return _span(name, fields)
+
+_env = os.environ.get("AOC_TRACE", "")
+if _env != "":
+    _filter = os.environ.get("AOC_TRACE_FILTER", "")
+    enable(_env, [p for p in _filter.split(",") if p != ""])
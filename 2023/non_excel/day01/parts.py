@@ -1,23 +1,172 @@
 #!/bin/env python3
 
+import os
 import sys
-import re
-import math
+import mmap
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import chunks, text, is_compressed
+from aoc.phases import Phases
+
+# Optional, Part1 is vectorised if available
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def digit_sum(block):
+    """
+    Sum of first digit * 10 + last digit of each line in block, using array
+    operations over the raw bytes. Blank lines are skipped, and other lines
+    without digits raise ValueError, as in Part1.lines_sum. Needs numpy
+
+    >>> np is None or digit_sum(b"a1b2c3\\n\\n7\\n45") == 13 + 77 + 45
+    True
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord('\n'))
+
+    # Lines with anything but whitespace must have digits
+    starts = np.append(0, newlines + 1)
+    starts = starts[starts < len(data)]
+    lines = 0
+    if len(starts) > 0:
+        lines = np.count_nonzero(np.logical_or.reduceat(data > ord(' '), starts))
+
+    pos = np.flatnonzero((data >= ord('0')) & (data <= ord('9')))
+    digits = data[pos].astype(np.int64) - ord('0')
+
+    # Line of each digit is the number of newlines before it. The first and
+    # last digit of a line are where the line number changes
+    line = np.searchsorted(newlines, pos)
+    first = np.flatnonzero(np.diff(line, prepend=-1))
+    last = np.append(first[1:], len(pos)) - 1
+    if len(first) != lines:
+        raise ValueError(f"{lines - len(first)} lines without digits")
+    return int(digits[first].sum() * 10 + digits[last].sum())
 
 class Input:
-    def _parse_values(self, values):
-        return [int(v) for v in values.split(" ") if v != ""]
-    
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
+
+        Uncompressed files are memory mapped when solving, and can be split in
+        chunks that are scanned in parallel. Other input is read here
         """
-        if type(f) == str:
-            f = open(f,"r")
+        self.path = None
+        self.data = None
+        if type(f) == str and not is_compressed(f):
+            self.path = f
+        else:
+            self.data = list(chunks(f))
+
+    def blocks(self):
+        """
+        Iterate the input as blocks of whole lines
+        """
+        if self.path is not None:
+            return chunks(self.path)
+        return self.data
+
+def split(path, count):
+    """
+    Split a file in about count chunks ending at line boundaries, as a list of
+    (offset, length)
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        for i in range(1, count):
+            end = m.find(b"\n", max(size * i // count, bounds[-1]))
+            if end < 0:
+                break
+            if end + 1 > bounds[-1]:
+                bounds.append(end + 1)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return [(start, end - start) for start, end in zip(bounds, bounds[1:])]
+
+# Part instances of a worker process, per class
+_workers = {}
+
+def _chunk_sum(Part, path, offset, length):
+    """
+    Sum of a chunk of the file, in a worker process. The chunk is mapped
+    from the file, so only its position is sent to the worker
+    """
+    if Part not in _workers:
+        _workers[Part] = Part(None)
+    # Mappings must start at a multiple of the allocation granularity
+    start = offset - offset % mmap.ALLOCATIONGRANULARITY
+    with open(path, "rb") as fh:
+        with mmap.mmap(fh.fileno(), offset + length - start, offset=start, access=mmap.ACCESS_READ) as m:
+            return _workers[Part].block_sum(m[offset - start:])
+
+class Automaton:
+    """
+    Aho-Corasick automaton finding the first word of a vocabulary in a text
+
+    words is a dict of word to value. The automaton is compiled to a transition
+    dict per state, so the text is scanned one character at a time, without
+    backtracking, and only until the first match.
 
-            self.lines = [l.strip() for l in f.readlines()]
+    The first match is the word ending first. This is also the word starting
+    first, as long as no word contains another word
+
+    >>> Automaton({"one": 1, "eight": 8, "two": 2}).scan("xeightwo")
+    8
+    >>> Automaton({"eno": 1, "thgie": 8, "owt": 2}).scan(reversed("xeightwo"))
+    2
+    >>> Automaton({"one": 1}).scan("on") is None
+    True
+    """
+    def __init__(self, words):
+        # Trie of the words
+        goto = [{}]
+        self.out = [None]
+        for word, value in words.items():
+            state = 0
+            for c in word:
+                if c not in goto[state]:
+                    goto[state][c] = len(goto)
+                    goto.append({})
+                    self.out.append(None)
+                state = goto[state][c]
+            self.out[state] = value
+
+        # Complete the transitions breadth first, following the failure link
+        # of each state, which is the longest proper suffix that is in the
+        # trie. Characters not in any word go back to the root
+        self.delta = [dict(goto[0])]
+        self.delta += [None] * (len(goto) - 1)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            delta = dict(self.delta[fail[state]])
+            delta.update(goto[state])
+            self.delta[state] = delta
+            for c, next in goto[state].items():
+                fail[next] = self.delta[fail[state]].get(c, 0) if state != 0 else 0
+                if self.out[next] is None:
+                    self.out[next] = self.out[fail[next]]
+                queue.append(next)
+
+    def scan(self, text):
+        """
+        Get the value of the first word in text, or None
+        """
+        delta = self.delta
+        out = self.out
+        state = 0
+        for c in text:
+            state = delta[state].get(c, 0)
+            if out[state] is not None:
+                return out[state]
+        return None
 
 class Part1:
     letters = {
@@ -33,36 +182,64 @@ class Part1:
         "9": 9
     }
 
-    def __init__(self, lines):
-        self.lines = lines
+    # Size of chunks when scanning in parallel
+    chunk_size = 64 << 20
+
+    def __init__(self, input, jobs=None):
+        """
+        With jobs above 1, files are scanned in chunks by that many processes
+        """
+        self.input = input
+        self.jobs = jobs
+        # The last word is the first word of the reversed line, in the
+        # reversed vocabulary
+        self.forward = Automaton(self.letters)
+        self.backward = Automaton({word[::-1]: num for word, num in self.letters.items()})
     
     def first(self, line):
-        ret_idx = -1
-        ret_num = None
-        for word, num in self.letters.items():
-            idx = line.find(word)
-            if (idx >= 0 and idx < ret_idx) or ret_idx < 0:
-                ret_idx = idx
-                ret_num = num
-        return ret_num
+        return self.forward.scan(line)
     
     def last(self, line):
-        ret_idx = -1
-        ret_num = None
-        for word, num in self.letters.items():
-            idx = line.rfind(word)
-            if idx > ret_idx:
-                ret_idx = idx
-                ret_num = num
-        return ret_num
+        return self.backward.scan(reversed(line))
     
     def lineval(self, line):
         first = self.first(line)
+        if first is None:
+            raise ValueError(f"No digits in line {line}")
         last = self.last(line)
         return first * 10 + last
 
+    def lines_sum(self, block):
+        """
+        Sum of the values of each line in block. Blank lines are skipped
+        """
+        lines = (line.strip() for line in text(block).splitlines())
+        return sum(self.lineval(line) for line in lines if line != "")
+
+    def block_sum(self, block):
+        if np is not None:
+            return digit_sum(block)
+        return self.lines_sum(block)
+
+    def run_parallel(self):
+        # Imported when used, as it is slow to import
+        from concurrent.futures import ProcessPoolExecutor
+        path = self.input.path
+        count = max(self.jobs * 4, -(-os.path.getsize(path) // self.chunk_size))
+        chunks = split(path, count)
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+            sums = pool.map(
+                _chunk_sum,
+                [type(self)] * len(chunks),
+                [path] * len(chunks),
+                *zip(*chunks)
+            )
+            return sum(sums)
+
     def run(self):
-        return sum(self.lineval(line) for line in self.lines)
+        if self.jobs is not None and self.jobs > 1 and self.input.path is not None:
+            return self.run_parallel()
+        return sum(self.block_sum(block) for block in self.input.blocks())
 
 class Part2(Part1):
     letters = {
@@ -87,15 +264,27 @@ class Part2(Part1):
         "nine": 9
     }
 
+    def block_sum(self, block):
+        # Words can't be matched with array operations
+        return self.lines_sum(block)
+
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage("<input file> [jobs]")
+
+    with phases("input"):
+        input = Input(sys.argv[1])
 
-    lines = Input(sys.argv[1]).lines
+    jobs = None
+    if len(sys.argv) >= 3:
+        jobs = int(sys.argv[2])
 
-    part1 = Part1(lines)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input, jobs)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(lines)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input, jobs)
+        print(f"Part2: {part2.run()}")
@@ -1,107 +1,234 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 import math
-
-class CubeSet:
-    def __init__(self, r=0, g=0, b=0):
-        self.r = r
-        self.g = g
-        self.b = b
-
-    def __str__(self):
-        return f"CubeSet({self.r},{self.g},{self.b})"
-
-    def __add__(self, other):
-        return CubeSet(self.r + other.r, self.g + other.g, self.b + other.b)
-    
-    def contains(self, other):
-        return self.r >= other.r and self.g >= other.g and self.b >= other.b
-    
-    def power(self):
-        return self.r * self.g * self.b
-
-class Game:
-    def __init__(self, id, sets):
-        self.id = id
-        self.sets = sets
-    
-    def __str__(self):
-        return f"<Game {self.id} {' '.join(str(s) for s in self.sets)}>"
-    
-    def set_all(self):
-        return sum(self.sets, CubeSet())
-    
-    def min_set(self):
-        return CubeSet(
-            max(s.r for s in self.sets),
-            max(s.g for s in self.sets),
-            max(s.b for s in self.sets)
+import bisect
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import findall, read, ints
+from aoc.phases import Phases
+
+# Optional, games are reduced with array operations if available
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class Games:
+    """
+    All draws of all games, stored in columns of red, green and blue counts
+
+    The draws of game i are from offsets[i] up to the next offset. With numpy,
+    the columns are arrays, and games are reduced with array operations
+
+    >>> games = Games([1, 2], [0, 2], [4, 1, 20], [0, 2, 8], [3, 6, 6])
+    >>> [list(map(int, c)) for c in games.min_sets()]
+    [[4, 20], [2, 8], [6, 6]]
+    """
+    def __init__(self, ids, offsets, red, green, blue):
+        if np is not None:
+            ids, offsets, red, green, blue = (
+                np.array(c, dtype=np.int64) for c in (ids, offsets, red, green, blue)
+            )
+        self.ids = ids
+        self.offsets = offsets
+        self.red = red
+        self.green = green
+        self.blue = blue
+
+    def __len__(self):
+        return len(self.ids)
+
+    def min_sets(self):
+        """
+        Get the minimum cubes of each game, as columns (red, green, blue)
+        """
+        columns = (self.red, self.green, self.blue)
+        if len(self) == 0:
+            return ([], [], [])
+        if np is not None:
+            return tuple(np.maximum.reduceat(c, self.offsets) for c in columns)
+        ends = self.offsets[1:] + [len(self.red)]
+        return tuple(
+            [max(c[start:end]) for start, end in zip(self.offsets, ends)]
+            for c in columns
         )
 
-class Input:
-    def _parse_values(self, values):
-        return [int(v) for v in values.split(" ") if v != ""]
-    
-    @staticmethod
-    def _parse_cubeset(desc):
-        vars = {
-            'red': 0,
-            'green': 0,
-            'blue': 0
-        }
-        for vals in desc.split(", "):
-            count, color = vals.strip().split(" ")
-            vars[color] += int(count)
-        return CubeSet(vars['red'], vars['green'], vars['blue'])
+_re_game = re.compile(rb"^Game ([0-9]+): (.*?)\r?$", re.M)
+_re_cubes = re.compile(rb"([0-9]+) ([a-z]+)")
+
+def _bitset(positions, size):
+    """
+    Get an int with the bits at positions set, from a bytearray of size bits
+
+    >>> bin(_bitset([0, 3, 9], 10))
+    '0b1000001001'
+    """
+    bits = bytearray((size + 7) // 8)
+    for i in positions:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+class BagIndex:
+    """
+    Index of the minimum sets of games, answering which games are possible
+    with each of many bags
+
+    For each colour, games are sorted by their minimum, so the games within a
+    bag are a prefix of that order, kept as a bitset of games. The bitsets of
+    every block of prefixes are stored, and other prefixes add at most a block
+    of games. The possible games are the intersection of three prefixes, and
+    are counted, and their ids summed one bit of the ids at a time, by popcount.
+
+    >>> games = Games([1, 2, 3], [0, 1, 2], [4, 20, 1], [2, 8, 3], [6, 6, 1])
+    >>> BagIndex(games).query([(12, 13, 14), (20, 8, 6), (0, 0, 0), (3, 3, 3)])
+    [(2, 4), (3, 6), (0, 0), (1, 3)]
+    """
+    def __init__(self, games):
+        self.size = len(games)
+        self.block = max(1, math.isqrt(self.size))
+        self.colours = [
+            self._projection([int(v) for v in values])
+            for values in games.min_sets()
+        ]
+        ids = [int(id) for id in games.ids]
+        self.id_bits = [
+            _bitset((i for i, id in enumerate(ids) if id >> bit & 1), self.size)
+            for bit in range(max(ids, default=0).bit_length())
+        ]
+
+    def _projection(self, values):
+        """
+        Get games sorted by values, with the values in that order, and the
+        bitsets of the first 0, block, 2 * block, ... games
+        """
+        order = sorted(range(self.size), key=values.__getitem__)
+        bits = bytearray((self.size + 7) // 8)
+        prefixes = [0]
+        for pos, i in enumerate(order, 1):
+            bits[i >> 3] |= 1 << (i & 7)
+            if pos % self.block == 0:
+                prefixes.append(int.from_bytes(bits, "little"))
+        return [values[i] for i in order], order, prefixes
+
+    def _within(self, colour, value):
+        """
+        Get the bitset of games needing at most value cubes of colour
+        """
+        values, order, prefixes = self.colours[colour]
+        end = bisect.bisect_right(values, value)
+        start = end - end % self.block
+        return prefixes[start // self.block] | _bitset(order[start:end], self.size)
 
+    def query(self, bags):
+        """
+        Get (count, id sum) of the possible games for each bag (r, g, b)
+        """
+        results = []
+        for bag in bags:
+            possible = -1
+            for colour, value in enumerate(bag):
+                possible &= self._within(colour, value)
+            id_sum = sum(
+                (possible & bits).bit_count() << bit
+                for bit, bits in enumerate(self.id_bits)
+            )
+            results.append((possible.bit_count(), id_sum))
+        return results
 
+class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
-        """
-        if type(f) == str:
-            f = open(f,"r")
+        f can be either a filename, a file-like object or a bytes-like object
 
-        self.games = []
-        for line in f:
-            id, cubedesc = re.match("^Game ([0-9]+): (.*)$", line).groups()
-            game = Game(int(id), [
-                self._parse_cubeset(s) for s in cubedesc.split(";")
-            ])
-            self.games.append(game)
+        Draws are parsed straight into the columns of Games
+        """
+        ids = []
+        offsets = []
+        red = []
+        green = []
+        blue = []
+        columns = {
+            b'red': red,
+            b'green': green,
+            b'blue': blue
+        }
+        for id, cubedesc in findall(_re_game, f):
+            ids.append(int(id))
+            offsets.append(len(red))
+            for desc in cubedesc.split(b";"):
+                red.append(0)
+                green.append(0)
+                blue.append(0)
+                for count, color in _re_cubes.findall(desc):
+                    columns[color][-1] += int(count)
+        self.games = Games(ids, offsets, red, green, blue)
 
 class Part1:
-    def __init__(self, games):
-        self.games = games
+    def __init__(self, input, bag=(12, 13, 14)):
+        self.games = input.games
+        self.bag = bag
+        self.index = None
 
     def run(self):
+        max_r, max_g, max_b = self.bag
+        red, green, blue = self.games.min_sets()
+        if np is not None and len(self.games) > 0:
+            possible = (red <= max_r) & (green <= max_g) & (blue <= max_b)
+            return int(self.games.ids[possible].sum())
         id_sum = 0
-        all_cubes = CubeSet(12, 13, 14)
-        for game in self.games:
-            if all_cubes.contains(game.min_set()):
-                id_sum += game.id
+        for id, r, g, b in zip(self.games.ids, red, green, blue):
+            if r <= max_r and g <= max_g and b <= max_b:
+                id_sum += id
         return id_sum
 
+    def run_bags(self, bags):
+        """
+        Get (count, id sum) of the possible games for each of many bags,
+        through a BagIndex built on first use
+        """
+        if self.index is None:
+            self.index = BagIndex(self.games)
+        return self.index.query(bags)
+
 class Part2:
-    def __init__(self, games):
-        self.games = games
+    def __init__(self, input):
+        self.games = input.games
 
     def run(self):
-        return sum(g.min_set().power() for g in self.games)
+        red, green, blue = self.games.min_sets()
+        if np is not None and len(self.games) > 0:
+            # Summed as int64 only if it can't overflow
+            bound = int(red.max()) * int(green.max()) * int(blue.max()) * len(self.games)
+            if bound < 1 << 63:
+                return int((red * green * blue).sum())
+        return sum(int(r) * int(g) * int(b) for r, g, b in zip(red, green, blue))
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+    phases = Phases(sys.argv)
 
-    games = Input(sys.argv[1]).games
-
-    part1 = Part1(games)
-    print(f"Part1: {part1.run()}")
-
-    part2 = Part2(games)
-    print(f"Part2: {part2.run()}")
+    if len(sys.argv) < 2:
+        phases.usage("<input file> [bags file]")
+
+    with phases("input"):
+        input = Input(sys.argv[1])
+
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
+
+    if len(sys.argv) >= 3:
+        # Bags as r g b, one per line
+        with phases("bags"):
+            values = ints(read(sys.argv[2]))
+            bags = list(zip(values[0::3], values[1::3], values[2::3]))
+            for bag, (count, id_sum) in zip(bags, part1.run_bags(bags)):
+                print(f"Bag {' '.join(map(str, bag))}: {count} games, id sum {id_sum}")
+
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
@@ -1,9 +1,15 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 import math
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read, lines
+from aoc.phases import Phases
+from aoc import trace
+
 class Obj:
     def __init__(self, x, y, w):
         self.x = x
@@ -42,7 +48,7 @@ class World:
         self.objs = []
     
     def __str__(self):
-        return "Map:\n---\n" + "\n".join(self.map) + "\n---\n" + "\n".join(str(obj) for obj in self.objs) + "\n---\n"
+        return "Map:\n---\n" + "\n".join(l.decode() for l in self.map) + "\n---\n" + "\n".join(str(obj) for obj in self.objs) + "\n---\n"
     
     def get(self,x,y):
         """
@@ -51,10 +57,10 @@ class World:
         If outside of map, just assume it's infinit and blank with .
         """
         if y<0 or y>=len(self.map):
-            return '.'
+            return b'.'
         if x<0 or x>=len(self.map[y]):
-            return '.'
-        return self.map[y][x]
+            return b'.'
+        return self.map[y][x:x+1]
 
     def add_obj(self, obj: Obj):
         self.objs.append(obj)
@@ -63,7 +69,7 @@ class World:
         """
         Return if obj has an adjecent symbol (non-digit or .)
         """
-        non_sym = "0123456789."
+        non_sym = b"0123456789."
 
         # Test directly to the left
         if non_sym.find(self.get(obj.x-1, obj.y)) < 0:
@@ -82,6 +88,9 @@ class World:
 
         return False
         
+_re_num = re.compile(rb"[0-9]+")
+_re_sym = re.compile(rb"[^0-9.]")
+
 class Input:
     def _parse_values(self, values):
         return [int(v) for v in values.split(" ") if v != ""]
@@ -90,26 +99,23 @@ class Input:
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-
-        map = [l.strip() for l in f.readlines() if l.strip() != ""]
+        map = lines(read(f))
         self.world = World(map)
 
         for y, line in enumerate(map):
-            for m in re.finditer(r"([0-9]+)", line):
+            for m in _re_num.finditer(line):
                 x, x2 = m.span()
-                num = int(m.group(1))
+                num = int(m.group())
                 self.world.add_obj(ObjNum(x, y, x2-x, num))
-            for m in re.finditer(r"([^0-9.])", line):
+            for m in _re_sym.finditer(line):
                 x, x2 = m.span()
-                self.world.add_obj(ObjSym(x, y, x2-x, m.group(1)))
+                self.world.add_obj(ObjSym(x, y, x2-x, m.group().decode()))
 
 class Part1:
-    def __init__(self, world):
-        self.world = world
+    def __init__(self, input):
+        self.world = input.world
 
     def run(self):
         num_sum = 0
@@ -120,8 +126,8 @@ class Part1:
         return num_sum
 
 class Part2:
-    def __init__(self, world):
-        self.world = world
+    def __init__(self, input):
+        self.world = input.world
 
     def run(self):
         num_sum = 0
@@ -137,16 +143,21 @@ class Part2:
         return num_sum
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    world = Input(sys.argv[1]).world
+    with phases("input"):
+        input = Input(sys.argv[1])
 
-    #print(f"{world}")
+    if trace.enabled:
+        trace.event("day03.world", world=str(input.world))
 
-    part1 = Part1(world)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(world)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
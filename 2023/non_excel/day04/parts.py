@@ -1,8 +1,13 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import findall
+from aoc.phases import Phases
+
 class Card:
     def __init__(self, id, win, own):
         self.id = id
@@ -15,34 +20,32 @@ class Card:
     def get_value(self):
         return (1<<self.get_matches())>>1
 
+_re_card = re.compile(rb"^Card *([0-9]+): ([0-9 ]*) \| ([0-9 ]*)\r?$", re.M)
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
         self.cards = []
-        for line in f:
-            id_str, win_str, own_str = re.match(r"^Card *([0-9]+): ([0-9 ]*) \| ([0-9 ]*)$", line).groups()
+        for id_str, win_str, own_str in findall(_re_card, f):
             id = int(id_str)
-            win = [int(c) for c in win_str.split(" ") if c != ""]
-            own = [int(c) for c in own_str.split(" ") if c != ""]
+            win = list(map(int, win_str.split()))
+            own = list(map(int, own_str.split()))
             self.cards.append(Card(id, win, own))
 
 class Part1:
-    def __init__(self, cards):
-        self.cards = cards
+    def __init__(self, input):
+        self.cards = input.cards
 
     def run(self):
         return sum(c.get_value() for c in self.cards)
 
 class Part2:
-    def __init__(self, cards):
-        self.cards = cards
+    def __init__(self, input):
+        self.cards = input.cards
 
     def run(self):
         extra = []
@@ -65,14 +68,18 @@ class Part2:
         return total_count
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input.cards)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input.cards)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
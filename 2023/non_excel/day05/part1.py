@@ -1,8 +1,14 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read, ints
+from aoc.phases import Phases
+from aoc import trace
+
 class MapRange:
     """
     A translation range, where a set of numbers may be translated to another
@@ -84,35 +90,32 @@ class Almenac:
             cur_name, map = self.maps[cur_name]
             number = map.translate(number)
 
+# Tokens of the input, one of:
+#   seeds: <numbers>
+#   <src>-to-<dst> map:
+#   <dst> <src> <length>
+_re_token = re.compile(
+    rb"^[ \t]*(?:seeds:([0-9 ]*)|([a-z]+)-to-([a-z]+) map:|([0-9]+) +([0-9]+) +([0-9]+))",
+    re.M
+)
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-
         cur_map = None
         self.almenac = Almenac()
-        for line in f:
-            # make sure there are no whitespaces that interferes
-            line = line.strip()
-
-            match_seeds = m = re.search(r'seeds: (.*)', line)
-            match_map = m = re.search(r'(.*)-to-(.*) map:', line)
-            match_table = m = re.search(r'(.+)', line)
-
-            if match_seeds:
+        for seeds, src_name, dst_name, dst, src, length in _re_token.findall(read(f)):
+            if seeds:
                 # seed line
-                self.seeds = [int(v) for v in match_seeds.group(1).split(" ")]
-
-            elif match_map:
+                self.seeds = ints(seeds)
+            elif src_name:
                 # new map
-                src_name = match_map.group(1)
-                dst_name = match_map.group(2)
+                src_name = src_name.decode()
+                dst_name = dst_name.decode()
 
                 # keeping the Map as an object (such as an instance of a class,
                 # or a list), we can assign the object here, and then keep a
@@ -121,9 +124,8 @@ class Input:
                 cur_map = Map()
                 self.almenac.add_map(src_name, dst_name, cur_map)
             
-            elif match_table:
-                dst, src, length = [int(v) for v in match_table.group(1).split(" ")]
-                cur_map.add_range(MapRange(dst, src, length))
+            else:
+                cur_map.add_range(MapRange(int(dst), int(src), int(length)))
 
     def __str__(self):
         return f"seeds: {self.seeds}\n\n{self.almenac}"
@@ -137,24 +139,31 @@ class Problem:
         min_location = None
         for seed in self.seeds:
             location = self.almenac.translate('seed', 'location', seed)
-            print(f"seed={seed} => location={location}")
+            if trace.enabled:
+                trace.event("day05.seed", seed=seed, location=location)
             if min_location is None or min_location > location:
                 min_location = location
         return min_location
 
+class Part1(Problem):
+    pass
+
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
 
     # Enable for debugging
     #print(input)
 
     print("\nPart1:\n")
 
-    part1 = Problem(input)
-    part1_result = part1.run()
+    with phases("part1"):
+        part1 = Part1(input)
+        part1_result = part1.run()
 
     print(f"\nPart1: {part1_result}\n")
@@ -1,8 +1,15 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.intervals import IntervalSet
+from aoc.reader import read, ints
+from aoc.phases import Phases
+from aoc import trace
+
 class SeedRange:
     """
     Represent a single range of seeds
@@ -39,73 +46,19 @@ class SeedRange:
     def __lt__(self, other):
         return self.start < other.start
 
-    def merge(self, range):
-        """
-        Merge two ranges
-
-        If two ranges can be merged, return a merged range
-        
-        If not possible, return None
-        """
-        if self.end >= range.start and range.end >= self.start:
-            return SeedRange(
-                min(self.start, range.start),
-                max(self.end, range.end)
-            )
-    
-    def remove(self, range):
-        """
-        Remove out a range current range
-
-        Return a list of ranges that corresponds to remaning pieces of the
-        range.
-
-        Note that this does not return a SeedRangeSet.
-        """
-        result = []
-
-        # Is there a part below input range?
-        if self.start < range.start:
-            result.append(SeedRange(self.start, min(self.end,range.start)))
-
-        # Is there a part after input range?
-        if self.end > range.end:
-            result.append(SeedRange(max(self.start,range.end), self.end))
-        
-        return result
-
-class SeedRangeSet:
+class SeedRangeSet(IntervalSet):
     """
-    Represent a set of ranges
+    Represent a set of ranges, kept sorted and merged by IntervalSet
     
     Given the set of ranges, it is possible to add set operations:
 
     - union - combine two sets to a new set, and optimize the use of sets
     - difference - remove one set from the other, and return an optimized set
     """
-    def __init__(self):
-        self.ranges = []
-    
-    def add_range(self, range: SeedRange):
-        result = SeedRangeSet()
+    @property
+    def ranges(self):
+        return [SeedRange(start, end) for start, end in self]
 
-        for cur in self.ranges:
-            merged = cur.merge(range)
-
-            # If a range can be merged, then "consume" it to the input range,
-            # otherwise keep it untouched
-            if merged is None:
-                result.ranges.append(cur)
-            else:
-                range = merged
-        
-        # The input range should be non-overlapping at this point, so add to
-        # result
-        result.ranges.append(range)
-
-        result.ranges.sort()
-        return result
-    
     def __add__(self, seeds):
         """
         Merge two SeedRangeSet or SeedRangeSet with a SeedRange
@@ -116,55 +69,21 @@ class SeedRangeSet:
         or:
         a += c
         """
-        result = self
         if type(seeds) == SeedRange:
-            result = result.add_range(seeds)
-        elif type(seeds) == SeedRangeSet:
-            for range in seeds.ranges:
-                result = result.add_range(range)
+            result = self.copy()
+            result.add(seeds.start, seeds.end)
+        elif isinstance(seeds, SeedRangeSet):
+            result = self.union(seeds)
         else:
             raise TypeError(f"Invalid type {type(seeds)}")
 
         return result
 
-    def __sub__(self, seeds):
-        """
-        Remove one SeedRangeSet from the other
-
-        Can be used both as:
-        a = b - c
-
-        or:
-        a -= c
-        """
-        result = self
-
-        for range in seeds.ranges:
-            new_set = SeedRangeSet()
-            for cur in result.ranges:
-                remains = cur.remove(range)
-                new_set.ranges += remains
-            result = new_set
-        
-        result.ranges.sort()
-        return result
-
     def __str__(self) -> str:
         return ", ".join(str(range) for range in self.ranges)
 
     def short_str(self) -> str:
-        return f"{self.size():11} seeds, {len(self.ranges):3} ranges"
-
-    def size(self) -> int:
-        return sum(range.size() for range in self.ranges)
-
-    def min(self) -> int:
-        # Since the sets are always sorted, min location is simply start of
-        # first element
-        if len(self.ranges) > 0:
-            return self.ranges[0].start
-        else:
-            return None
+        return f"{self.size():11} seeds, {len(self):3} ranges"
 
 class MapRange:
     """
@@ -179,20 +98,6 @@ class MapRange:
     def __str__(self) -> str:
         return f"{self.src} - {self.src+self.length-1} => {self.dst} - {self.dst+self.length-1}"
 
-    def _overlap(self, seeds: SeedRange) -> SeedRange:
-        """
-        Return SeedRange that overlap with input range
-        
-        Return None if not overlapping
-        """
-        range = SeedRange(
-            max(self.src, seeds.start),
-            min(self.src + self.length, seeds.end)
-        )
-        if not range.is_valid():
-            return None
-        return range
-
     def translate(self, seeds: SeedRangeSet) -> (SeedRangeSet, SeedRangeSet):
         """
         Translate a number given the current range
@@ -200,18 +105,8 @@ class MapRange:
         returns a tuple of two SeedRangeSet:s, one with translated values and
         one with source seeds used in translation
         """
-        dst_seeds = SeedRangeSet()
-        src_seeds = SeedRangeSet()
-        for seedrange in seeds.ranges:
-            overlap = self._overlap(seedrange)
-            if overlap is None:
-                continue
-            
-            dst_seeds += SeedRange(
-                    overlap.start + self.dst - self.src,
-                    overlap.end + self.dst - self.src
-                )
-            src_seeds += overlap
+        src_seeds = seeds.clip(self.src, self.src + self.length)
+        dst_seeds = src_seeds.translate(self.dst - self.src)
         return (dst_seeds, src_seeds)
 
 class Map:
@@ -232,19 +127,18 @@ class Map:
         """
         Translate a number given current map
         """
-        result_seeds = SeedRangeSet()
+        translated = []
         for maprange in self.ranges:
             (dst_seeds, src_seeds) = maprange.translate(seeds)
 
             # Remove source seeds from original set
             seeds -= src_seeds
 
-            # Add new seeds to new set
-            result_seeds += dst_seeds
+            translated.append(dst_seeds)
 
-        # Add remaining non-translated seeds
-        result_seeds += seeds
-        return result_seeds
+        # Add remaining non-translated seeds, and merge all at once
+        translated.append(seeds)
+        return SeedRangeSet(r for seeds in translated for r in seeds)
 
 
 class Almenac:
@@ -272,52 +166,47 @@ class Almenac:
                 break
             
             # Do single translation
-            print(f"  - {cur_name:12}: {seeds.short_str()}")
+            if trace.enabled:
+                trace.event("day05.stage", name=cur_name, seeds=seeds.short_str())
             cur_name, map = self.maps[cur_name]
             seeds = map.translate(seeds)
-        print(f"  - {cur_name:12}: {seeds.short_str()}")
+        if trace.enabled:
+            trace.event("day05.stage", name=cur_name, seeds=seeds.short_str())
         return seeds
 
+# Tokens of the input, one of:
+#   seeds: <numbers>
+#   <src>-to-<dst> map:
+#   <dst> <src> <length>
+_re_token = re.compile(
+    rb"^[ \t]*(?:seeds:([0-9 ]*)|([a-z]+)-to-([a-z]+) map:|([0-9]+) +([0-9]+) +([0-9]+))",
+    re.M
+)
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-
         cur_map = None
         self.almenac = Almenac()
-        for line in f:
-            # make sure there are no whitespaces that interferes
-            line = line.strip()
-
-            match_seeds = m = re.search(r'seeds: (.*)', line)
-            match_map = m = re.search(r'(.*)-to-(.*) map:', line)
-            match_table = m = re.search(r'(.+)', line)
-
-            if match_seeds:
-                seednums = [int(v) for v in match_seeds.group(1).split(" ")]
-
+        for seeds, src_name, dst_name, dst, src, length in _re_token.findall(read(f)):
+            if seeds:
+                seednums = ints(seeds)
                 # seed line, as part1
-                self.seeds1 = SeedRangeSet()
-                for v in seednums:
-                    self.seeds1 += SeedRange(v)
+                self.seeds1 = SeedRangeSet((v, v+1) for v in seednums)
                 
-                self.seeds2 = SeedRangeSet()
-                for i in range(0, len(seednums), 2):
-                    self.seeds2 += SeedRange(
-                        seednums[i],
-                        seednums[i] + seednums[i+1]
-                    )
-
-            elif match_map:
+                self.seeds2 = SeedRangeSet(
+                    (seednums[i], seednums[i] + seednums[i+1])
+                    for i in range(0, len(seednums), 2)
+                )
+
+            elif src_name:
                 # new map
-                src_name = match_map.group(1)
-                dst_name = match_map.group(2)
+                src_name = src_name.decode()
+                dst_name = dst_name.decode()
 
                 # keeping the Map as an object (such as an instance of a class,
                 # or a list), we can assign the object here, and then keep a
@@ -326,9 +215,8 @@ class Input:
                 cur_map = Map()
                 self.almenac.add_map(src_name, dst_name, cur_map)
             
-            elif match_table:
-                dst, src, length = [int(v) for v in match_table.group(1).split(" ")]
-                cur_map.add_range(MapRange(dst, src, length))
+            else:
+                cur_map.add_range(MapRange(int(dst), int(src), int(length)))
 
     def __str__(self):
         return \
@@ -344,30 +232,41 @@ class Problem:
     def run(self):
         min_location = None
         seeds = self.seeds
-        print(f"seeds={seeds}")
-        print("")
-        locations = self.almenac.translate('seed', 'location', seeds)
-        print("")
-        print(f"locations={locations}")
+        with trace.span("day05.translate", seeds=seeds):
+            locations = self.almenac.translate('seed', 'location', seeds)
+        if trace.enabled:
+            trace.event("day05.locations", locations=locations)
 
         return locations.min()
 
+class Part1(Problem):
+    def __init__(self, input):
+        super().__init__(input.almenac, input.seeds1)
+
+class Part2(Problem):
+    def __init__(self, input):
+        super().__init__(input.almenac, input.seeds2)
+
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
 
     # Enable for debugging
     print(input)
 
     print("\nPart1:\n")
-    part1 = Problem(input.almenac, input.seeds1)
-    part1_result = part1.run()
-    print(f"\nPart1: {part1_result}\n")
+    with phases("part1"):
+        part1 = Part1(input)
+        part1_result = part1.run()
+        print(f"\nPart1: {part1_result}\n")
 
     print("\nPart2:\n")
-    part2 = Problem(input.almenac, input.seeds2)
-    part2_result = part2.run()
-    print(f"\nPart2: {part2_result}\n")
+    with phases("part2"):
+        part2 = Part2(input)
+        part2_result = part2.run()
+        print(f"\nPart2: {part2_result}\n")
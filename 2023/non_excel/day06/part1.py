@@ -1,29 +1,35 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 import math
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read, ints
+from aoc.phases import Phases
+from aoc import trace
+
+_re_line = re.compile(rb"^[ \t]*([A-Za-z]+):([0-9 ]*)", re.M)
+
 class Input:
     def _parse_values(self, values):
-        return [int(v) for v in values.split(" ") if v != ""]
+        return ints(values)
     
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
         self.lines = {}
+        # Digits of all values of each line, as read, for part 2
+        self.digits = {}
 
-        for line in f.readlines():
-            [header, values] = line.split(": ", 2)
-            header = header.strip()
-            values = self._parse_values(values.strip())
-            self.lines["var_" + header.lower()] = values
+        for header, values in _re_line.findall(read(f)):
+            key = "var_" + header.decode().lower()
+            self.lines[key] = self._parse_values(values)
+            self.digits[key] = values.replace(b" ", b"")
         
         # Get all keys
         keys = list(self.lines.keys())
@@ -86,7 +92,8 @@ class Problem:
             t2 -= 1
 
         opts = t2 - t1 + 1
-        print(f"time: {var_time:10} dist: {var_distance:20} options: {t1:3} {t2:3} {opts:4}")
+        if trace.enabled:
+            trace.event("day06.race", time=var_time, dist=var_distance, t1=t1, t2=t2, options=opts)
         return opts
 
     def run(self):
@@ -95,14 +102,23 @@ class Problem:
             opts *= self.options_race(**race)
         return opts
 
+class Part1(Problem):
+    def __init__(self, input):
+        super().__init__(input.races)
+
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
         
+    with phases("input"):
+        input = Input(sys.argv[1])
+
     print("\nPart1:\n")
 
-    part1 = Problem(Input(sys.argv[1]).races)
-    part1_result = part1.run()
+    with phases("part1"):
+        part1 = Part1(input)
+        part1_result = part1.run()
 
     print(f"\nPart1: {part1_result}\n")
@@ -1,32 +1,42 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 import math
 
 from part1 import *
 
-# Part 2 uses other input parsing...
-class InputPart2(Input):
-    def _parse_values(self, values):
-        return [int(values.replace(" ", ""))]
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.phases import Phases
+
+class Part2(Problem):
+    def __init__(self, input):
+        # Part 2 reads all values of a line as a single number
+        super().__init__([{k: int(digits) for k, digits in input.digits.items()}])
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
         
+    with phases("input"):
+        input = Input(sys.argv[1])
+
     print("\nPart1:\n")
 
-    part1 = Problem(Input(sys.argv[1]).races)
-    part1_result = part1.run()
+    with phases("part1"):
+        part1 = Part1(input)
+        part1_result = part1.run()
 
     print(f"\nPart1: {part1_result}\n")
 
         
     print("\nPart2:\n")
 
-    part2 = Problem(InputPart2(sys.argv[1]).races)
-    part2_result = part2.run()
+    with phases("part2"):
+        part2 = Part2(input)
+        part2_result = part2.run()
 
     print(f"\nPart2: {part2_result}\n")
@@ -1,8 +1,14 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import findall
+from aoc.phases import Phases
+from aoc import trace
+
 cardvalue = {
     '2': 2,  '3': 3,  '4': 4,  '5': 5,
     '6': 6,  '7': 7,  '8': 8,  '9': 9,
@@ -91,40 +97,42 @@ class Hand:
         return st
             
 
+_re_hand = re.compile(rb"^[ \t]*(\S+) +([0-9]+)", re.M)
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
         self.hands = []
-        for line in f:
-            cards, bid = line.strip().split(" ",2)
-            cards = [cardvalue[c] for c in list(cards)]
+        for cards, bid in findall(_re_hand, f):
+            cards = [cardvalue[c] for c in cards.decode()]
             bid = int(bid)
             self.hands.append(Hand(cards, bid))
 
 class Part1:
-    def __init__(self, hands):
-        self.hands = hands
+    def __init__(self, input):
+        self.hands = input.hands
 
     def run(self):
         ranked_hands = self.hands.copy()
         ranked_hands.sort()
-        #for hand in ranked_hands:
-        #    print(f"{hand} {hand.strength()}")
+        if trace.enabled:
+            for hand in ranked_hands:
+                trace.event("day07.hand", hand=hand, strength=hand.strength())
         return sum(c.bid * (i+1) for i,c in enumerate(ranked_hands))
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input.hands)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
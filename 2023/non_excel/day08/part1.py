@@ -1,8 +1,13 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read
+from aoc.phases import Phases
+
 class Path:
     def __init__(self, path):
         self.path = path
@@ -26,26 +31,25 @@ class Map:
     def locations(self):
         return self.directions.keys()
 
+_re_path = re.compile(rb"[LR]+")
+_re_node = re.compile(rb"(...) = \((...), (...)\)")
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
+        buf = read(f)
+
         # First line is path
-        self.path = Path(f.readline().strip())
-        
+        self.path = Path(_re_path.search(buf).group().decode())
+
         # Rest is map
         directions = {}
-        for line in f:
-            m = re.fullmatch(r"(...) = \((...), (...)\)", line.strip())
-            if m:
-                src, left, right = m.groups()
-                directions[src] = (left, right)
+        for src, left, right in _re_node.findall(buf):
+            directions[src.decode()] = (left.decode(), right.decode())
         
         self.map = Map(directions)
         
@@ -65,11 +69,14 @@ class Part1:
         return step
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
@@ -1,10 +1,16 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 import math
 from part1 import *
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.cycle import CycleFinder
+from aoc.phases import Phases
+from aoc import trace
+
 #
 # A ghost in this case is just a periodic interval when the ghost ends up at the
 # same location again, and when the first appers there.
@@ -91,13 +97,12 @@ class Part2:
         """
         step = 0
         location = start
-        visits = {}
-        while not location in visits:
-            if location[-1] == 'Z':
-                visits[location] = step
+        finder = CycleFinder(verify=True)
+        while True:
+            if location[-1] == 'Z' and finder.add(location, step):
+                return finder.prefix, finder.period
             location = self.map.get(location, self.path.get(step))
             step += 1
-        return visits[location], step-visits[location]
 
     def run(self):
         ghosts = []
@@ -110,23 +115,28 @@ class Part2:
         cur_ghost = Ghost()
         for loc, ghost in ghosts:
             cur_ghost = cur_ghost.combine(ghost)
-            print(f"{loc}: {ghost} => {cur_ghost}")
+            if trace.enabled:
+                trace.event("day08.combine", loc=loc, ghost=ghost, combined=cur_ghost)
         
         return cur_ghost.start
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
     # Not all part 2 examples inputs works on part 1
     try:
-        part1 = Part1(input)
-        print(f"Part1: {part1.run()}")
+        with phases("part1"):
+            part1 = Part1(input)
+            print(f"Part1: {part1.run()}")
     except:
         pass
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
@@ -1,8 +1,13 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import iter_lines
+from aoc.phases import Phases
+
 def nums_to_borders(nums):
     """
     Convert a number sequence, as stated in the puzzle, to a list of the last
@@ -48,15 +53,11 @@ class Input:
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
         self.seqs = []
-        for line in f:
-            nums = [int(num) for num in line.split(" ")]
-            self.seqs.append(Sequence(nums))
+        for line in iter_lines(f):
+            self.seqs.append(Sequence(list(map(int, line.split()))))
 
 class Part1:
     def __init__(self, input):
@@ -80,14 +81,18 @@ class Part2:
 
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
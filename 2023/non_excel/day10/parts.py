@@ -1,8 +1,15 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.mmgrid import load_grid
+from aoc.search import bfs
+from aoc.phases import Phases
+from aoc import trace
+
 # Directions are determined as bitmasks
 DIR_N = 0b0001
 DIR_E = 0b0010
@@ -85,8 +92,8 @@ class Ant:
         return True
 
 class Map:
-    def __init__(self, lines):
-        self.lines = lines
+    def __init__(self, grid):
+        self.grid = grid
         self.tags_tag = {}
         self.tags_coord = {}
         self.update_tag('S')
@@ -103,28 +110,35 @@ class Map:
                 exits |= d
         self.tags_tag[tag] = (x,y)
         self.tags_coord[(x,y)] = tag
-        self.lines[y][x] = _pipes_rev[exits]
+        self.grid.set(x, y, ord(_pipes_rev[exits]))
 
 
     def find(self, c):
-        for y, row in enumerate(self.lines):
-            for x, pipe in enumerate(row):
-                if pipe == c:
-                    return x,y
-        return None
+        return self.grid.find(ord(c))
 
     def is_valid(self,x,y):
         """
         Check if location is valid
         """
-        if y<0 or y>=len(self.lines):
-            return False
-        if x<0 or x>=len(self.lines[y]):
-            return False
-        return True
+        return self.grid.within(x, y)
 
     def get(self,x,y):
-        return _pipes[self.lines[y][x]]
+        return _pipes[self.grid.char(x, y)]
+
+    def neighbours(self, i):
+        """
+        Iterate indexes of cells connected to the pipe at cell index i
+        """
+        x = i % self.grid.width
+        y = i // self.grid.width
+        pipe = self.get(x, y)
+        for d in _dirs:
+            if pipe & d:
+                dx, dy = _dir_step[d]
+                nx = x + dx
+                ny = y + dy
+                if self.is_valid(nx, ny) and self.get(nx, ny) & _dir_rev[d]:
+                    yield self.grid.index(nx, ny)
 
     def get_tag(self,c):
         if c in self.tags_tag:
@@ -141,26 +155,26 @@ class Input:
         """
         Parse the input file
 
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-
-        lines = [list(l.strip()) for l in f.readlines() if l.strip() != ""]
-        self.map = Map(lines)
+        self.map = Map(load_grid(f))
 
 class Part1:
     def __init__(self, input):
         self.map = input.map
 
     def run(self):
-        ant = Ant(self.map, *self.map.get_tag('S'))
-        while True:
-            ant.walk()
-            #print(ant)
-            if self.map.at_tag(ant.x, ant.y) == 'S':
-                break
-        return ant.steps // 2
+        # The farthest point of the loop is the last reached searching both
+        # ways from the start
+        grid = self.map.grid
+        start = grid.index(*self.map.get_tag('S'))
+        visited = grid.blank(1).data
+        farthest = 0
+        for depth, layer in bfs([start], self.map.neighbours, visited):
+            if trace.enabled:
+                trace.event("day10.walk", depth=depth, cells=layer)
+            farthest = depth
+        return farthest
 
 class Part2:
     def __init__(self, input):
@@ -216,14 +230,18 @@ class Part2:
 
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
 
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
@@ -1,8 +1,14 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.grid import Grid
+from aoc.reader import read, lines
+from aoc.phases import Phases
+
 def _flatten(xss):
     return [x for xs in xss for x in xs]
 
@@ -40,17 +46,14 @@ class Input:
         """
         Parse the input file
 
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-
-        lines = [l.strip() for l in f.readlines() if l.strip() != ""]
+        grid = Grid.from_lines(lines(read(f)))
 
         # Since the puzzle itself never needs the area, but just counting x and
         # y axis independently, split it up already at the parsing stage
-        counts_x = [sum(1 for c in l if c == '#') for l in lines]
-        counts_y = list(map(lambda *xs: sum(xs), *[[1 if c == '#' else 0 for c in l] for l in lines]))
+        counts_x = [row.count(b'#') for row in grid.rows()]
+        counts_y = [grid.col(x).count(b'#') for x in range(grid.width)]
 
         # It's not important what axis it is, but just treat them indepdentently
 
@@ -61,28 +64,34 @@ class Input:
 
 
 class Part1:
-    def __init__(self, input):
+    def __init__(self, input, expansion=2):
         self.stars = input.stars
+        self.expansion = expansion
 
     def run(self):
-        return sum(stars.process_len(2) for stars in self.stars)
+        return sum(stars.process_len(self.expansion) for stars in self.stars)
 
 class Part2:
-    def __init__(self, input):
+    def __init__(self, input, expansion=1000000):
         self.stars = input.stars
+        self.expansion = expansion
 
     def run(self):
-        return sum(stars.process_len(1000000) for stars in self.stars)
+        return sum(stars.process_len(self.expansion) for stars in self.stars)
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
 
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
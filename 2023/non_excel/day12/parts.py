@@ -1,8 +1,14 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import findall
+from aoc.phases import Phases
+from aoc import trace
+
 class Row:
     def __init__(self, springs, groups):
         self.springs = springs
@@ -133,20 +139,18 @@ class Row:
                             nbucket[nrow] = count
         return tot_count
 
+_re_row = re.compile(rb"^[ \t]*([.#?]+) +([0-9,]+)", re.M)
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
         self.rows = []
-        for line in f:
-            springs, groupsstr = line.strip().split(" ")
-            self.rows.append(Row(springs, [int(g) for g in groupsstr.split(",")]))
+        for springs, groupsstr in findall(_re_row, f):
+            self.rows.append(Row(springs.decode(), list(map(int, groupsstr.split(b",")))))
         
 
 class Part1:
@@ -154,31 +158,45 @@ class Part1:
         self.rows = input.rows
 
     def run(self):
-        #for row in self.rows:
-        #    print(f"{str(row):50}  ---  {row.count()}")
-        return sum(row.count() for row in self.rows)
+        if not trace.enabled:
+            return sum(row.count() for row in self.rows)
+        total = 0
+        for row in self.rows:
+            count = row.count()
+            trace.event("day12.row", row=row, count=count)
+            total += count
+        return total
 
 class Part2:
     def __init__(self, input):
         self.rows = input.rows
 
     def run(self):
-        #for row in self.rows:
-        #    print(f"{str(row):50}  ---  {(row*5).count()}")
-        return sum((row*5).count() for row in self.rows)
+        if not trace.enabled:
+            return sum((row*5).count() for row in self.rows)
+        total = 0
+        for row in self.rows:
+            count = (row*5).count()
+            trace.event("day12.row", row=row, count=count)
+            total += count
+        return total
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
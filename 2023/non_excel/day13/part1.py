@@ -1,18 +1,24 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.grid import Grid
+from aoc.reader import read, lines, blocks
+from aoc.phases import Phases
+
 class Image:
-    def __init__(self, pxls):
-        self.rows = pxls.split("\n")
+    def __init__(self, grid):
+        self.grid = grid
+        self.rows = list(grid.rows())
     
     def flip(self):
         """
         Return a flipped copy of the image, where x and y is reversed
         """
-        pxls = ["".join(row[i] for row in self.rows) for i in range(len(self.rows[0]))]
-        return Image("\n".join(pxls))
+        return Image(self.grid.transpose())
     
     def _is_mirror_y(self, y):
         for ya, yb in zip(range(y,-1,-1),range(y+1,len(self.rows))):
@@ -29,22 +35,18 @@ class Image:
         ]
 
     def __str__(self):
-        return "\n".join(self.rows)
+        return str(self.grid)
 
 class Input:
     def __init__(self, f):
         """
         Parse the input file
 
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-
-        content = f.read()
         self.imgs = []
-        for image in content.split("\n\n"):
-            self.imgs.append(Image(image.strip()))
+        for image in blocks(read(f)):
+            self.imgs.append(Image(Grid.from_lines(lines(image))))
 
 class Part1:
     def __init__(self, input):
@@ -58,11 +60,14 @@ class Part1:
         return mirrorsum
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
 
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
@@ -1,35 +1,32 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
-def flip(rows):
-    """
-    Return a flipped copy of the image, where x and y is reversed
-    """
-    rows = list(rows)
-    cols = ["".join(row[i] for row in rows) for i in range(len(rows[0]))]
-    return cols
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.mmgrid import load_grid
+from aoc.phases import Phases
+
+_ROCK = ord('O')
+_WALL = ord('#')
 
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-        self.rows = [l.strip() for l in f.readlines() if l.strip() != ""]
+        self.grid = load_grid(f)
 
 
 class Part1:
     def __init__(self, input):
-        self.rows = input.rows
+        self.grid = input.grid
 
     def run(self):
-        cols = flip(self.rows)
+        cols = [self.grid.col(x) for x in range(self.grid.width)]
         # Each column can be calculated independently
         load = 0
         for col in cols:
@@ -37,19 +34,22 @@ class Part1:
             # rocks would end up
             next_slot = len(cols)
             for i,slot in enumerate(col):
-                if slot == 'O':
+                if slot == _ROCK:
                     load += next_slot
                     next_slot -= 1
-                elif slot == '#':
+                elif slot == _WALL:
                     next_slot = len(cols) - i - 1
         return load
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
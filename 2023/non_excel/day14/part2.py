@@ -1,53 +1,65 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.cycle import CycleFinder
+from aoc.mmgrid import load_grid
+from aoc.phases import Phases
+
+_ROCK = ord('O')
+_WALL = ord('#')
+_EMPTY = ord('.')
+
 class Panel:
     def __init__(self, field):
         self.field = field
-        self.width = len(field[0])
-        self.height = len(field)
+        self.width = field.width
+        self.height = field.height
     
     def __str__(self):
-        return "\n".join("".join(slot for slot in row) for row in self.field)
+        return str(self.field)
+
+    def key(self):
+        return self.field.key()
 
     def copy(self):
-        return Panel([[x for x in xs] for xs in self.field])
+        return Panel(self.field.copy())
 
-    def _do_move(self, x, y, dx, dy, n):
+    def _do_move(self, start, step, n):
         """
         Do one row/column of rock processing
 
-        starting at (x,y), step (dx,dy) steps for n iterations
+        starting at index start in the field, step for n iterations
         """
-        next_slot = 0
-        for i in range(n):
-            cx = x + dx * i
-            cy = y + dy * i
-            slot = self.field[cy][cx]
-            if slot == 'O':
-                self.field[cy][cx] = '.'
-                self.field[y  + dy*next_slot][x  + dx*next_slot] = 'O'
-                next_slot += 1
-            elif slot == '#':
-                next_slot = i+1
+        data = self.field.data
+        next_slot = start
+        for i in range(start, start + step * n, step):
+            slot = data[i]
+            if slot == _ROCK:
+                data[i] = _EMPTY
+                data[next_slot] = _ROCK
+                next_slot += step
+            elif slot == _WALL:
+                next_slot = i + step
     
     def flip_north(self):
         for x in range(self.width):
-            self._do_move(x, 0, 0, 1, self.height)
+            self._do_move(x, self.width, self.height)
     
     def flip_west(self):
         for y in range(self.height):
-            self._do_move(0, y, 1, 0, self.width)
+            self._do_move(y * self.width, 1, self.width)
     
     def flip_south(self):
         for x in range(self.width):
-            self._do_move(x, -1, 0, -1, self.height)
+            self._do_move((self.height - 1) * self.width + x, -self.width, self.height)
     
     def flip_east(self):
         for y in range(self.height):
-            self._do_move(-1, y, -1, 0, self.width)
+            self._do_move(y * self.width + self.width - 1, -1, self.width)
     
     def spin_cycle(self):
         self.flip_north()
@@ -57,8 +69,8 @@ class Panel:
     
     def get_load(self):
         return sum(
-            (self.height - i) * sum(1 for slot in row if slot == 'O')
-            for i,row in enumerate(self.field)
+            (self.height - i) * row.count(_ROCK)
+            for i,row in enumerate(self.field.rows())
         )
 
 class Input:
@@ -66,12 +78,9 @@ class Input:
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-        self.panel = Panel([list(l.strip()) for l in f.readlines() if l.strip() != ""])
+        self.panel = Panel(load_grid(f))
 
 
 class Part1:
@@ -92,24 +101,19 @@ class Part2:
         target_t = 1000000000
 
         # We assume it will stabilize, so log states and check for old cycles
-        states = {}
+        finder = CycleFinder(Panel.key, verify=True)
         p = self.panel.copy()
         t = 1
         while True:
             p.spin_cycle()
-            strp = str(p)
-            if strp in states:
+            if finder.add(p, t):
                 break
-            states[strp] = t
             t += 1
 
-        # Calculate interval
-        interval = t - states[strp]
-
         # since each interval returns back to original state, just don't do the
         # intervals, but calculate how many more spin cycles are left after last
         # interval
-        t_left = (target_t - t) % interval
+        t_left = finder.remaining(target_t)
 
         for i in range(t_left):
             p.spin_cycle()
@@ -117,14 +121,18 @@ class Part2:
         return p.get_load()
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
     
-    part2 = Part2(input)
-    print(f"Part1: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part1: {part2.run()}")
@@ -1,8 +1,13 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read, text
+from aoc.phases import Phases
+
 def hash(s):
     """
     Hash function
@@ -22,12 +27,9 @@ class Input:
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-        self.steps = f.read().strip().split(',')
+        self.steps = text(read(f)).strip().split(',')
         
 
 class Part1:
@@ -38,14 +40,17 @@ class Part1:
         return sum(hash(step) for step in self.steps)
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
@@ -1,8 +1,14 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read, text
+from aoc.phases import Phases
+from aoc import trace
+
 def hash(s):
     """
     Hash function
@@ -40,17 +46,17 @@ class Box:
             power += (box_nr + 1) * (slot_nr + 1) * focal
         return power
 
+_re_add = re.compile(r"(.*)=([0-9])")
+_re_rem = re.compile(r"(.*)-")
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-        self.steps = f.read().strip().split(',')
+        self.steps = text(read(f)).strip().split(',')
         
 
 class Part1:
@@ -66,39 +72,43 @@ class Part2:
 
     def run(self):
         boxes = [Box() for i in range(256)]
-        re_add = re.compile(r"(.*)=([0-9])")
-        re_rem = re.compile(r"(.*)-")
 
         for step in self.steps:
-            m = re.fullmatch(r"(.*)=([0-9])", step)
+            m = _re_add.fullmatch(step)
             if m:
                 lbl, focal = m.groups()
                 boxes[hash(lbl)].add(lbl, int(focal))
+                continue
 
-            m = re.fullmatch(r"(.*)-", step)
+            m = _re_rem.fullmatch(step)
             if m:
                 lbl, = m.groups()
                 boxes[hash(lbl)].rem(lbl)
         
-        #for i, box in enumerate(boxes):
-        #    if len(box.slots) > 0:
-        #        print(f"{i:3} {box}")
+        if trace.enabled:
+            for i, box in enumerate(boxes):
+                if len(box.slots) > 0:
+                    trace.event("day15.box", box=i, lenses=box)
 
         return sum(box.power(i) for i, box in enumerate(boxes))
             
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
@@ -1,9 +1,15 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
-from collections import deque
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.mmgrid import load_grid
+from aoc.search import bfs
+from aoc.phases import Phases
+from aoc import render
+from aoc import trace
 
 # Directions are determined as bitmasks
 DIR_N = (0, -1)
@@ -11,19 +17,8 @@ DIR_E = (1, 0)
 DIR_S = (0, 1)
 DIR_W = (-1, 0)
 
-_dir_bitmask = {
-    DIR_N: 0b0001,
-    DIR_E: 0b0010,
-    DIR_S: 0b0100,
-    DIR_W: 0b1000
-}
-
-_dir_name = {
-    DIR_N: "N",
-    DIR_E: "E",
-    DIR_S: "S",
-    DIR_W: "W"
-}
+# Directions in the order of the lower two bits of a search state
+_dirs = [DIR_N, DIR_E, DIR_S, DIR_W]
 
 # Mirror behaviour
 _mirrors_output = {
@@ -49,94 +44,85 @@ _mirrors_output = {
     ('\\', DIR_W): [DIR_N],
 }
 
-# For debug output, highlight background
-_bg_set = "\x1b[44m"
-_bg_clr = "\x1b[0m"
-
-class Ant:
-    def __init__(self, field, crd, dir):
-        self.field = field
-        self.crd = crd
-        self.dir = dir
-    
-    def __str__(self):
-        return f"<Ant {_dir_name[self.dir]} {self.crd}>"
-    
-    def step(self):
-        x, y = self.crd
-        dx, dy = self.dir
-        
-        # If exit already visited in reverse, then bail out
-        if not self.field.visit((x, y), (-dx, -dy)):
-            return []
-        
-        # Get outputs
-        cell = self.field.get((x, y))
-        ants = []
-        for odx, ody in _mirrors_output[(cell, (dx, dy))]:
-            # If output is visited, don't exit it again
-            if self.field.visit((x, y), (odx, ody)):
-                ants.append(Ant(self.field, (x + odx, y + ody), (odx, ody)))
-        return ants
-
 class Field:
-    def __init__(self, cells):
-        # Make sure it's a proper 2D array
-        self.cells = [[x for x in xs] for xs in cells]
-        self.state = [[0 for x in xs] for xs in cells]
+    """
+    Search states are cell index * 4 + direction, for a beam entering the cell
+    in that direction
+
+    Transitions are precomputed for grids in memory. For mapped grids, they
+    are calculated when visited, and the states are kept in mapped bitmaps
+    """
+    def __init__(self, cells, transitions=None):
+        # cells and transitions are shared between copies, only state is per
+        # field
+        self.cells = cells
+        self.state = cells.blank(15)
+        if transitions is None:
+            if cells.in_memory:
+                transitions = self._transitions()
+            else:
+                transitions = self._next_states
+        self.transitions = transitions
+
+    def _next_states(self, s):
+        """
+        Get list of next states of a state
+        """
+        cells = self.cells
+        i = s >> 2
+        x = i % cells.width
+        y = i // cells.width
+        nexts = []
+        for odx, ody in _mirrors_output[(cells.char(x, y), _dirs[s & 3])]:
+            if cells.within(x + odx, y + ody):
+                nexts.append(cells.index(x + odx, y + ody) * 4 + _dirs.index((odx, ody)))
+        return nexts
+
+    def _transitions(self):
+        """
+        Get list of next states for each state
+        """
+        return [self._next_states(s) for s in range(self.cells.width * self.cells.height * 4)]
 
-    def visit(self, crd, dir):
-        x,y = crd
+    def energize(self, crd, dir):
+        """
+        Follow a beam entering crd in direction dir, and mark all cells it
+        passes
+        """
+        visited = self.cells.states(self.cells.width * self.cells.height * 4, 1)
+        start = self.cells.index(*crd) * 4 + _dirs.index(dir)
+        data = self.state.data
+        for depth, layer in bfs([start], self.transitions, visited):
+            for s in layer:
+                data[s >> 2] |= 1 << (s & 3)
 
-        # Never possible to visit outside of the field:
-        if y < 0 or y >= len(self.state):
-            return False
-        if x < 0 or x >= len(self.state[y]):
-            return False
-
-        bitmask = _dir_bitmask[dir]
-        if self.state[y][x] & bitmask != 0:
-            return False
-        self.state[y][x] |= bitmask
-        return True
-    
     def width(self):
-        return len(self.cells[0])
+        return self.cells.width
     
     def height(self):
-        return len(self.cells)
+        return self.cells.height
 
     def get(self, crd):
         x,y = crd
-        return self.cells[y][x]
+        return self.cells.char(x, y)
 
     def copy(self):
-        return Field(self.cells)
+        return Field(self.cells, self.transitions)
     
-    def print(self):
-        for crow, srow in zip(self.cells, self.state):
-            line = ""
-            for c, s in zip(crow, srow):
-                if s != 0:
-                    line += _bg_set + c + _bg_clr
-                else:
-                    line += c
-            print(line)
+    def print(self, viewport=None, scale=1):
+        render.show(self.cells, self.state, viewport=viewport, scale=scale)
 
     def count_energized(self):
-        return sum(sum(1 for x in xs if x != 0) for xs in self.state)
+        return self.state.count_nonzero()
 
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-        self.field = Field(list(l.strip()) for l in f if l.strip() != "")
+        self.field = Field(load_grid(f))
 
 class Part1:
     def __init__(self, input):
@@ -144,52 +130,49 @@ class Part1:
 
     def run(self):
         field = self.field.copy()
-        ants = deque([Ant(field, (0,0), DIR_E)])
-        
-        while len(ants) > 0:
-            ant = ants.popleft()
-            ants.extend(ant.step())
+        field.energize((0,0), DIR_E)
 
-        #field.print()
-        return field.count_energized()
+        energized = field.count_energized()
+        if trace.enabled:
+            trace.event("day16.energized", count=energized)
+        return energized
 
 class Part2:
     def __init__(self, input):
         self.field = input.field
 
-    def run_one(self, ant):
-        field = ant.field
-        ants = deque([ant])
-        
-        while len(ants) > 0:
-            ant = ants.popleft()
-            ants.extend(ant.step())
-
+    def run_one(self, crd, dir):
+        field = self.field.copy()
+        field.energize(crd, dir)
         return field.count_energized()
 
     def run(self):
         counts = []
         for x in range(self.field.width()):
-            counts += [self.run_one(Ant(self.field.copy(), (x,0), DIR_S))]
-            counts += [self.run_one(Ant(self.field.copy(), (x,self.field.height()-1), DIR_N))]
+            counts += [self.run_one((x,0), DIR_S)]
+            counts += [self.run_one((x,self.field.height()-1), DIR_N)]
         for y in range(self.field.width()):
-            counts += [self.run_one(Ant(self.field.copy(), (0,y), DIR_E))]
-            counts += [self.run_one(Ant(self.field.copy(), (self.field.width()-1,y), DIR_W))]
+            counts += [self.run_one((0,y), DIR_E)]
+            counts += [self.run_one((self.field.width()-1,y), DIR_W)]
         return max(counts)
         
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
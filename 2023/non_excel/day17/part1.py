@@ -1,135 +1,111 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
-from heapq import heappush, heappop
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.grid import Grid
+from aoc.reader import read, lines
+from aoc.search import dial
+from aoc.phases import Phases
+from aoc import render
+from aoc import trace
 
-# For debug output, highlight background
-_bg_set = "\x1b[44m"
-_bg_clr = "\x1b[0m"
-
-class Ant:
-    def __init__(self, field, x, y, dir_dist = [3,3,3,3], tot_cost = 0, path = []):
-        self.field = field
-        self.x = x
-        self.y = y
-        self.dir_dist = dir_dist
-        self.tot_cost = tot_cost
-        self.path = path
-    
-    def __str__(self):
-        return f"<Ant @{self.tot_cost} {self.x},{self.y} {self.dir_dist}>"
-    
-    def __lt__(self, other):
-        return self.tot_cost < other.tot_cost
-    
-    def _visit_and_store(self, x, y, dir_dist):
-        # Don't accept if we ran out of distance
-        if any(d<0 for d in dir_dist):
-            return []
-
-        # Get if location is good enough
-        if self.field.visit(x, y, dir_dist):
-            # Calculate cost, it's the same for all outgoing ants
-            cost = self.tot_cost + self.field.cost(x,y)
-            return [Ant(self.field, x, y, dir_dist, cost, self.path + [(x,y)])]
-        
-        # otherwise skip
-        return []
-
-    def step(self):
-        x = self.x
-        y = self.y
-        de, ds, dw, dn = self.dir_dist
-        ants = []
-        ants += self._visit_and_store(x+1, y, [de-1, 3, 0, 3])
-        ants += self._visit_and_store(x, y+1, [3, ds-1, 3, 0])
-        ants += self._visit_and_store(x-1, y, [0, 3, dw-1, 3])
-        ants += self._visit_and_store(x, y-1, [3, 0, 3, dn-1])
-        return ants
+# Cell values are the digits of the input
+_digits = {str(i): i for i in range(10)}
+_chars = {i: str(i) for i in range(10)}
 
 class Field:
+    """
+    Search states are cell index * 2 + axis, where axis is the direction of
+    the next move, 0 for horizontal and 1 for vertical. A move goes min_d to
+    max_d cells in either direction along the axis, and then turns
+    """
     def __init__(self, cells):
-        # Make sure it's a proper 2D array
-        self.cells = [[int(x) for x in xs] for xs in cells]
-        self.best = [[[0] * 4 for x in xs] for xs in cells]
-
-    def visit(self, x, y, dir_dist):
-        # Never possible to visit outside of the field:
-        if y < 0 or y >= len(self.cells):
-            return False
-        if x < 0 or x >= len(self.cells[y]):
-            return False
-
-        # Accept if any direction is beter
-        if any(old < new for old, new in zip(self.best[y][x], dir_dist)):
-            self.best[y][x] = [max(old,new) for old,new in zip(self.best[y][x], dir_dist)]
-            return True
-        return False
-    
+        # cells is shared between copies
+        self.cells = cells
+
+    def within(self, x, y):
+        return 0 <= x < self.cells.width and 0 <= y < self.cells.height
+
     def width(self):
-        return len(self.cells[0])
+        return self.cells.width
     
     def height(self):
-        return len(self.cells)
+        return self.cells.height
 
     def cost(self, x, y):
-        return self.cells[y][x]
+        return self.cells.data[y * self.cells.width + x]
+
+    def edges(self, min_d, max_d):
+        """
+        Get function iterating (next state, cost) from a state
+        """
+        width = self.cells.width
+        height = self.cells.height
+        data = self.cells.data
+
+        def edges(state):
+            i = state >> 1
+            axis = state & 1
+            # Index step, and number of cells until the border
+            if axis == 0:
+                x = i % width
+                moves = ((1, width - 1 - x), (-1, x))
+            else:
+                y = i // width
+                moves = ((width, height - 1 - y), (-width, y))
+            turn = axis ^ 1
+            for step, room in moves:
+                cost = 0
+                j = i
+                for dist in range(1, min(max_d, room) + 1):
+                    j += step
+                    cost += data[j]
+                    if dist >= min_d:
+                        yield (j << 1) | turn, cost
+        return edges
 
     def copy(self):
         return Field(self.cells)
     
-    def print(self, path):
-        for y, crow in enumerate(self.cells):
-            line = ""
-            for x, c in enumerate(crow):
-                if (y,x) in path:
-                    line += _bg_set + str(c) + _bg_clr
-                else:
-                    line += str(c)
-            print(line)
+    def print(self, path, viewport=None, scale=1):
+        """
+        Print the heat loss of each cell, with cells (x, y) in path highlighted
+        """
+        path = {self.cells.index(x, y) for x, y in path}
+        render.show(self.cells, path, _chars, viewport, scale)
 
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-        self.field = Field(list(l.strip()) for l in f if l.strip() != "")
+        self.field = Field(Grid.from_lines(lines(read(f)), _digits))
 
 class Part1:
     def __init__(self, input):
         self.field = input.field
+        self.min_d = 1
+        self.max_d = 3
 
     def run(self):
-        field = self.field.copy()
-        ants = [Ant(field,0,0)]
-        
-        goal_x = field.width()-1
-        goal_y = field.height()-1
-
-        best_cost = None
-
-        while len(ants) > 0:
-            ant = heappop(ants)
-            
-            if ant.x == goal_x and ant.y == goal_y:
-                if best_cost == None:
-                    best_cost = ant.tot_cost
-                #if best_cost == ant.tot_cost:
-                #    print("---")
-                #    field.print(ant.path)
-
-            for newant in ant.step():
-                heappush(ants, newant)
-
-        #field.print()
-        return best_cost
+        field = self.field
+        cells = field.width() * field.height()
+        goal = cells - 1
+
+        # Start at top left, with either first move horizontal or vertical
+        settled = bytearray(2 * cells)
+        edges = field.edges(self.min_d, self.max_d)
+        for cost, state in dial([0, 1], edges, 9 * self.max_d, settled):
+            if state >> 1 == goal:
+                if trace.enabled:
+                    trace.event("day17.best", cost=cost, state=state)
+                return cost
+        return None
 
 class Part2:
     def __init__(self, input):
@@ -139,17 +115,21 @@ class Part2:
         return None
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
@@ -1,8 +1,13 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read
+from aoc.phases import Phases
+
 _dirs = {
     'R': (1, 0),
     'D': (0, 1),
@@ -44,22 +49,18 @@ class Ant:
         
         return self.area + self.steps//2 +  1
 
+_re_step = re.compile(rb"([RULD]) ([0-9]+) \(#([0-9a-fA-F]+)\)")
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
 
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-
         self.steps = []
-        for line in f:
-            m = re.fullmatch(r"([RULD]) ([0-9]+) \(#([0-9a-fA-F]+)\)", line.strip())
-            if m:
-                direction, distance, color = m.groups()
-                self.steps.append((direction, int(distance), color))
+        for direction, distance, color in _re_step.findall(read(f)):
+            self.steps.append((direction.decode(), int(distance), color.decode()))
         
 
 class Part1:
@@ -90,14 +91,18 @@ class Part2:
 
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
 
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
@@ -1,8 +1,13 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read, lines
+from aoc.phases import Phases
+
 _comp = {
     '<': lambda a, b: a < b,
     '>': lambda a, b: a > b,
@@ -32,49 +37,52 @@ class Workflow:
         rules_str = ', '.join(f"{var}{op}{value}:{dest}" if var is not None else f"{dest}" for var,op,value,dest in self.rules)
         return f"{self.name} {rules_str}"
 
+_re_workflow = re.compile(rb"([a-z]+){(.*)}")
+_re_compare = re.compile(rb"([xmas])([<>])([0-9]+):([a-zA-Z]+)")
+_re_dest = re.compile(rb"([a-zA-Z]+)")
+_re_rating = re.compile(rb"{(.*)}")
+_re_value = re.compile(rb"([a-z]+)=([0-9]+)")
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
 
         self.wfs = {}
         self.ratings = []
 
-        for l in f:
-            l = l.strip()
-
-            m = re.fullmatch(r"([a-z]+){(.*)}",l)
+        for l in lines(read(f)):
+            m = _re_workflow.fullmatch(l)
             if m:
                 # workflow line
                 wfname, rules = m.groups()
+                wfname = wfname.decode()
 
                 wf = Workflow(wfname)
                 self.wfs[wfname] = wf
 
-                for rule in rules.split(','):
-                    m = re.fullmatch(r"([xmas])([<>])([0-9]+):([a-zA-Z]+)", rule)
+                for rule in rules.split(b','):
+                    m = _re_compare.fullmatch(rule)
                     if m:
                         name, op, value, dest = m.groups()
-                        wf.add_compare(name, op, int(value), dest)
+                        wf.add_compare(name.decode(), op.decode(), int(value), dest.decode())
                         continue
                     
-                    m = re.fullmatch(r"([a-zA-Z]+)", rule)
+                    m = _re_dest.fullmatch(rule)
                     if m:
                         dest, = m.groups()
-                        wf.add_fallback(dest)
+                        wf.add_fallback(dest.decode())
                         continue
 
-                    print(f"Unknown rule {l}")
+                    print(f"Unknown rule {l.decode()}")
 
-            m = re.fullmatch(r"{(.*)}",l)
+            m = _re_rating.fullmatch(l)
             if m:
                 # rating line
-                rating = {k: int(v) for k,v in (kv.split('=',2) for kv in m.group(1).split(","))}
+                rating = {k.decode(): int(v) for k,v in _re_value.findall(m.group(1))}
                 self.ratings.append(rating)
         
 
@@ -96,14 +104,17 @@ class Part1:
         return sum_accepted
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
@@ -1,8 +1,14 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.intervals import Box
+from aoc.reader import read, lines
+from aoc.phases import Phases
+
 _comp = {
     '<': lambda a, b: a < b,
     '<=': lambda a, b: a <= b,
@@ -11,8 +17,16 @@ _comp = {
 }
 
 class Subset:
+    """
+    A box of ratings, with one dimension per rating name
+    """
     def __init__(self, ranges):
-        self.ranges = ranges
+        # Dimension of each rating name, shared by all derived subsets
+        self.dims = {name: i for i, name in enumerate(ranges)}
+        self.box = Box(
+            (lo for lo, hi in ranges.values()),
+            (hi for lo, hi in ranges.values())
+        )
         # Keeping as 1 rating for subsets means interval will be treated as
         # options when multiplying count to rating
         self.rating = 1
@@ -30,41 +44,33 @@ class Subset:
         subset.rating = sum(values.values())
         return subset
 
-    def copy(self):
-        subset = Subset({k: v for k,v in self.ranges.items()})
+    def _derive(self, box):
+        subset = Subset.__new__(Subset)
+        subset.dims = self.dims
+        subset.box = box
         subset.rating = self.rating
         return subset
 
-    def _copy_update(self, name, lo, hi):
-        result = self.copy()
-        if hi <= lo:
-            # no matches
-            result.ranges = {k: (0,0) for k,v in self.ranges.items()}
-        else:
-            result.ranges[name] = lo, hi
-        return result
-    
+    def copy(self):
+        return self._derive(self.box)
+
     def copy_clear(self):
         # update to match no elements should clear
-        return self._copy_update('x', 0, 0)
-
-    def filter_ge(self, name, value):
-        lo, hi = self.ranges[name]
-        if lo < value:
-            lo = value
-        return self._copy_update(name, lo, hi)
-
-    def filter_lt(self, name, value):
-        lo, hi = self.ranges[name]
-        if hi > value:
-            hi = value
-        return self._copy_update(name, lo, hi)
+        return self._derive(Box(self.box.lo, self.box.lo))
+
+    def split(self, name, value):
+        """
+        Split in the subsets below value, and from value, for a rating name
+
+        >>> below, above = Subset({'x': (1, 11), 'm': (1, 3)}).split('m', 2)
+        >>> below.count(), above.count()
+        (10, 10)
+        """
+        below, above = self.box.split(self.dims[name], value)
+        return self._derive(below), self._derive(above)
     
     def count(self):
-        count = 1
-        for lo, hi in self.ranges.values():
-            count *= hi-lo
-        return count
+        return self.box.volume()
     
 
 class Workflow:
@@ -89,11 +95,13 @@ class Workflow:
                 yield dest, subset
                 subset = subset.copy_clear() # nothing left
             elif op == '<':
-                yield dest, subset.filter_lt(name, value)
-                subset = subset.filter_ge(name, value)
+                below, above = subset.split(name, value)
+                yield dest, below
+                subset = above
             elif op == '>=':
-                yield dest, subset.filter_ge(name, value)
-                subset = subset.filter_lt(name, value)
+                below, above = subset.split(name, value)
+                yield dest, above
+                subset = below
             else:
                 print(f"Shouldn't happen: {name} {op} {value} => {dest}")
 
@@ -125,50 +133,53 @@ class WorkflowSet:
                 sum_accepted += self.process(next_subset, next_wf)
         return sum_accepted
 
+_re_workflow = re.compile(rb"([a-z]+){(.*)}")
+_re_compare = re.compile(rb"([xmas])([<>])([0-9]+):([a-zA-Z]+)")
+_re_dest = re.compile(rb"([a-zA-Z]+)")
+_re_rating = re.compile(rb"{(.*)}")
+_re_value = re.compile(rb"([a-z]+)=([0-9]+)")
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
 
         self.wfs = WorkflowSet()
         self.ratings = []
 
-        for l in f:
-            l = l.strip()
-
-            m = re.fullmatch(r"([a-z]+){(.*)}",l)
+        for l in lines(read(f)):
+            m = _re_workflow.fullmatch(l)
             if m:
                 # workflow line
                 wfname, rules = m.groups()
+                wfname = wfname.decode()
 
                 wf = Workflow(wfname)
 
-                for rule in rules.split(','):
-                    m = re.fullmatch(r"([xmas])([<>])([0-9]+):([a-zA-Z]+)", rule)
+                for rule in rules.split(b','):
+                    m = _re_compare.fullmatch(rule)
                     if m:
                         name, op, value, dest = m.groups()
-                        wf.add_compare(name, op, int(value), dest)
+                        wf.add_compare(name.decode(), op.decode(), int(value), dest.decode())
                         continue
                     
-                    m = re.fullmatch(r"([a-zA-Z]+)", rule)
+                    m = _re_dest.fullmatch(rule)
                     if m:
                         dest, = m.groups()
-                        wf.add_fallback(dest)
+                        wf.add_fallback(dest.decode())
                         continue
 
-                    print(f"Unknown rule {l}")
+                    print(f"Unknown rule {l.decode()}")
                 
                 self.wfs.add(wf)
 
-            m = re.fullmatch(r"{(.*)}",l)
+            m = _re_rating.fullmatch(l)
             if m:
                 # rating line
-                rating = Subset.init_single({k: int(v) for k,v in (kv.split('=',2) for kv in m.group(1).split(","))})
+                rating = Subset.init_single({k.decode(): int(v) for k,v in _re_value.findall(m.group(1))})
                 self.ratings.append(rating)
         
 
@@ -198,17 +209,21 @@ class Part2:
         return self.wfs.process(subset)
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
     
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
@@ -1,11 +1,16 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 import copy
 
 from collections import deque
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import read
+from aoc.phases import Phases
+
 _sig_inv = {
     'low': 'high',
     'high': 'low'
@@ -90,29 +95,25 @@ class Network:
                     signals.append((dest, new_dest, new_value))
         return sigcount
 
+_re_module = re.compile(rb"^[ \t]*([&%]*)([a-z]*) -> ([a-z, ]*)", re.M)
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
         self.network = Network()
-        for l in f:
-            m = re.fullmatch(r"([&%]*)([a-z]*) -> (.*)", l.strip())
-            if m:
-                mod_type, mod_name, outputs_str = m.groups()
-                outputs = [outp.strip() for outp in outputs_str.split(',')]
-                if mod_type == '':
-                    module = Broadcast(outputs)
-                elif mod_type == '%':
-                    module = FlipFlop(outputs)
-                elif mod_type == '&':
-                    module = Conjunction(outputs)
-                self.network.add_module(mod_name, module)
+        for mod_type, mod_name, outputs_str in _re_module.findall(read(f)):
+            outputs = [outp.strip().decode() for outp in outputs_str.split(b',')]
+            if mod_type == b'':
+                module = Broadcast(outputs)
+            elif mod_type == b'%':
+                module = FlipFlop(outputs)
+            elif mod_type == b'&':
+                module = Conjunction(outputs)
+            self.network.add_module(mod_name.decode(), module)
 
 class Part1:
     def __init__(self, input):
@@ -129,14 +130,17 @@ class Part1:
         return count_low * count_high
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
@@ -1,5 +1,6 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 import copy
@@ -7,6 +8,13 @@ import math
 
 from collections import deque
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.cache import load_input, artifact
+from aoc.cycle import CycleFinder
+from aoc.reader import read
+from aoc.phases import Phases
+from aoc import trace
+
 _sig_inv = {
     'low': 'high',
     'high': 'low'
@@ -229,11 +237,12 @@ class FilteredConjunction(Module):
         
         if can_be_periodic:
             mod_names = upstream.modules.keys()
-            states = {}
+            finder = CycleFinder(verify=True)
             i = 0
             log = LogModule()
             upstream.add_module('log', log)
             upstream.modules[name].outputs.append('log')
+            lows = []
             offset = None
             while True:
                 log.log = []
@@ -241,15 +250,20 @@ class FilteredConjunction(Module):
                 if log.log != []:
                     src, value = log.log[0]
                     if value == 'low':
-                        offset = i
-                #    print(f"t[{i}] = {log.log}")
-
-                statearg = "|".join(upstream.modules[name].state_str() for name in mod_names)
-                if i > 0 and statearg in states:
-                    #print(f"Repeat {states[statearg]} -> {i} offset {offset}")
-                    interval = states[statearg] - i
+                        lows.append(i)
+                if trace.enabled:
+                    trace.event("day20.presses", i=i, log=log.log)
+
+                state = tuple(upstream.modules[name].state_str() for name in mod_names)
+                if finder.add(state, i):
+                    # Confirmed one period after the first repeat, so lows
+                    # are only taken up to the first repeat
+                    repeat = finder.prefix + finder.period
+                    offset = max((t for t in lows if t <= repeat), default=None)
+                    if trace.enabled:
+                        trace.event("day20.repeat", first=finder.prefix, i=i, offset=offset)
+                    interval = -finder.period
                     break
-                states[statearg] = i
                 i += 1
             
             if offset != None:
@@ -383,9 +397,11 @@ class Network:
     def send(self, source = 'button', value = 'low', dest = 'broadcaster'):
         signals = deque([(source, dest, value)])
         sigcount = {'low': 0, 'high': 0}
+        tracing = trace.enabled
         while len(signals) > 0:
             source, dest, value = signals.popleft()
-            #print(f"{source} -{value}-> {dest}")
+            if tracing:
+                trace.event("day20.signal", source=source, value=value, dest=dest)
             sigcount[value] += 1
             if dest in self.modules:
                 for new_dest, new_value in self.modules[dest].signal(source, value):
@@ -467,42 +483,43 @@ class Network:
         print("}", file=file)
 
 
+_re_module = re.compile(rb"^[ \t]*([&%]*)([a-z]*) -> ([a-z, ]*)", re.M)
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
         self.network = Network()
-        for l in f:
-            m = re.fullmatch(r"([&%]*)([a-z]*) -> (.*)", l.strip())
-            if m:
-                mod_type, mod_name, outputs_str = m.groups()
-                outputs = [outp.strip() for outp in outputs_str.split(',')]
-                if mod_type == '':
-                    module = Broadcast(outputs)
-                elif mod_type == '%':
-                    module = FlipFlop(outputs)
-                elif mod_type == '&':
-                    module = Conjunction(outputs)
-                self.network.add_module(mod_name, module)
+        for mod_type, mod_name, outputs_str in _re_module.findall(read(f)):
+            outputs = [outp.strip().decode() for outp in outputs_str.split(b',')]
+            if mod_type == b'':
+                module = Broadcast(outputs)
+            elif mod_type == b'%':
+                module = FlipFlop(outputs)
+            elif mod_type == b'&':
+                module = Conjunction(outputs)
+            self.network.add_module(mod_name.decode(), module)
 
 class Part2:
     def __init__(self, input):
+        self.input = input
         self.network = copy.deepcopy(input.network)
         self.output = Output()
         self.network.add_module('rx', self.output)
         self.network.connect()
 
-    def run(self):
+    def _optimize(self):
         network = self.network
         need_optimize = True
         while need_optimize:
             network, need_optimize = network.optimize()
+        return network
+
+    def run(self):
+        network = artifact(self.input, "optimized_network", self._optimize)
         
         #network.todot(file=open('input1.dot','w'))
 
@@ -516,14 +533,17 @@ class Part2:
         
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = load_input(Input, sys.argv[1])
     
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
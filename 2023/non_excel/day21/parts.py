@@ -1,117 +1,71 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
-from collections import deque
-
-_bg_set = "\x1b[44m"
-_bg_clr = "\x1b[0m"
-
-class Ant:
-    def __init__(self, x, y, dist):
-        self.x = x
-        self.y = y
-        self.dist = dist
-    
-    def __lt__(self, other):
-        return self.dist < other.dist
-
-    def __str__(self):
-        return f"<Ant @{self.dist} {self.x},{self.y}>"
-    
-    def walk(self):
-        yield Ant(self.x+1, self.y, self.dist+1)
-        yield Ant(self.x, self.y+1, self.dist+1)
-        yield Ant(self.x-1, self.y, self.dist+1)
-        yield Ant(self.x, self.y-1, self.dist+1)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.cache import load_input, artifact
+from aoc.mmgrid import load_grid
+from aoc.search import bfs, grid_neighbours
+from aoc.phases import Phases
+from aoc import render
+from aoc import trace
 
 class Field:
-    def __init__(self, cells):
-        cells = [[x for x in xs] for xs in cells]
-        self.cells = [[x == '#' for x in xs] for xs in cells]
-        
-        self.start = None
-        for y,row in enumerate(cells):
-            for x,c in enumerate(row):
-                if c == 'S':
-                    self.start = (x,y)
-        
-        self.reset()
+    def __init__(self, grid):
+        self.start = grid.find(ord('S'))
+        self.cells = grid.translate({'#': 1, '.': 0, 'S': 0})
+        self.visited = self.cells.blank(1)
+        self.nbrs = grid_neighbours(self.cells, lambda v: v == 0, lazy=not grid.in_memory)
     
     def reset(self):
-        self.visited = [[False for x in xs] for xs in self.cells]
-
-    def can_visit(self, x, y):
-        if y<0 or y>=len(self.visited):
-            return False
-        if x<0 or x>=len(self.visited[y]):
-            return False
-        if self.visited[y][x]:
-            return False
-        if self.cells[y][x]:
-            return False
-        return True
-
-    def visit(self, x, y):
-        if not self.can_visit(x, y):
-            return False
-        self.visited[y][x] = True
-        return True
-    
-    def print(self):
-        tiles = {
-            (True, False): '#',
-            (False, True): 'o',
-            (False, False): '.',
-        }
-        for vrow, crow in zip(self.visited, self.cells):
-            line = ""
-            for v, c in zip(vrow, crow):
-                line += tiles[(c,v)]
-            print(line)
+        self.visited.fill(0)
+
+    def walk(self, x, y, max_dist):
+        """
+        Visit all cells reachable from x, y within max_dist steps
+
+        Returns the number of cells reached in an even and odd number of steps
+        """
+        counts = [0, 0]
+        start = self.cells.index(x, y)
+        if self.cells.data[start]:
+            return counts
+        for dist, layer in bfs([start], self.nbrs, self.visited.data, max_dist):
+            counts[dist % 2] += len(layer)
+        return counts
+
+    def print(self, viewport=None, scale=1):
+        render.show(self.cells, self.visited, {0: '.', 1: '#'}, viewport, scale)
         
     def count_visited(self, fn = None):
         if fn is None:
             fn = lambda x, y: 1
-        return sum(
-            sum(fn(x,y) for x,vis in enumerate(vrow) if vis)
-            for y,vrow in enumerate(self.visited)
-        )
+        return sum(fn(x,y) for x,y in self.visited.nonzero())
 
     def dimensions(self):
-        return len(self.cells[0]), len(self.cells)
+        return self.cells.width, self.cells.height
 
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-
-        self.field = Field(list(l.strip()) for l in f if l.strip() != "")
+        self.field = Field(load_grid(f))
         
 
 class Part1:
-    def __init__(self, input, max_dist):
+    def __init__(self, input, max_dist=64):
         self.field = input.field
         self.max_dist = max_dist
 
     def run(self):
         self.field.reset()
         start_x, start_y = self.field.start
-
-        queue = deque()
-        queue.append(Ant(start_x, start_y, 0))
-
-        while len(queue) > 0:
-            ant = queue.popleft()
-            if ant.dist <= self.max_dist:
-                if self.field.visit(ant.x, ant.y):
-                    queue.extend(a for a in ant.walk() if self.field.can_visit(a.x, a.y))
+        self.field.walk(start_x, start_y, self.max_dist)
 
         #self.field.print()
 
@@ -120,35 +74,25 @@ class Part1:
         #return self.field.count_visited(lambda x, y: (x+y)%2 == parity)
         
 class Part2:
-    def __init__(self, input):
+    def __init__(self, input, steps=26501365):
+        self.input = input
         self.field = input.field
+        self.steps = steps
 
     def _coverage(self, sx, sy, steps):
         self.field.reset()
+        even, odd = self.field.walk(sx, sy, steps)
 
-        queue = deque()
-        queue.append(Ant(sx, sy, 0))
-        
-        while len(queue) > 0:
-            ant = queue.popleft()
-            if ant.dist <= steps:
-                if self.field.visit(ant.x, ant.y):
-                    queue.extend(a for a in ant.walk() if self.field.can_visit(a.x, a.y))
-
-        #print("---")
-        #self.field.print()
-
-        return (
-            self.field.count_visited(lambda x, y: (x+y)%2 == 0),
-            self.field.count_visited(lambda x, y: (x+y)%2 == 1)
-        )
+        # Parity of x+y changes with every step
+        if (sx + sy) % 2 == 1:
+            even, odd = odd, even
+        return (even, odd)
 
     def run(self):
         self.field.reset()
         
         # Input data:
-        steps = 26501365
-        #steps = 20
+        steps = self.steps
 
 
         # There are some important properties for this to easily working
@@ -171,26 +115,26 @@ class Part2:
         #    from corner to corner as quickly as possible, without being
         #    affected by field
         #
-        if any(self.field.cells[0]):
+        if any(self.field.cells.row(0)):
             print("Top border is obstructed")
             return None
-        if any(self.field.cells[dy-1]):
+        if any(self.field.cells.row(dy-1)):
             print("Bottom border is obstructed")
             return None
-        if any(crow[0] for crow in self.field.cells):
+        if any(self.field.cells.col(0)):
             print("Left border is obstructed")
             return None
-        if any(crow[dx-1] for crow in self.field.cells):
+        if any(self.field.cells.col(dx-1)):
             print("Right border is obstructed")
             return None
         #
         # 4. Cross from start location to borders are free, so it's quick to
         #    reach
         #
-        if any(self.field.cells[sy]):
+        if any(self.field.cells.row(sy)):
             print("Start horizontal line is obstructed")
             return None
-        if any(crow[sx] for crow in self.field.cells):
+        if any(self.field.cells.col(sx)):
             print("Start vertical line is obstructed")
             return None
         #
@@ -292,13 +236,14 @@ class Part2:
             ovf += dim
             tiles -= 1
 
-        #print(self.field.dimensions())
-        #print(self.field.start)
-#
-        #print(ovf)
-        #print(tiles)
+        if trace.enabled:
+            trace.event(
+                "day21.tiles",
+                dimensions=self.field.dimensions(), start=self.field.start,
+                ovf=ovf, tiles=tiles
+            )
 
-        coverage = {
+        coverage = artifact(self.input, "coverage", lambda: {
             'i': self._coverage(mid,   mid, mid + mid + 30), # full tile
             
             'l': self._coverage(dim-1, mid  , ovf-dim),
@@ -318,7 +263,7 @@ class Part2:
             '5': self._coverage(0    , 0    , ovf-1-mid+dim),
             '6': self._coverage(dim-1, 0    , ovf-1-mid),
             '7': self._coverage(dim-1, 0    , ovf-1-mid+dim),
-        }
+        }, ovf)
 
         even_n = tiles//2+1
         odd_n = (tiles+1)//2
@@ -360,7 +305,8 @@ class Part2:
 
         count = 0
         for ttype in tile_count.keys():
-            #print(f"{ttype} - {tile_count[ttype]} - {coverage[ttype]}")
+            if trace.enabled:
+                trace.event("day21.tile", ttype=ttype, count=tile_count[ttype], coverage=coverage[ttype])
             tile_e, tile_o = tile_count[ttype]
             cov_e, cov_o = coverage[ttype]
             if flip:
@@ -385,21 +331,25 @@ class Part2:
         return count
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file> <steps>")
-        sys.exit(1)
+        phases.usage("<input file> <steps>")
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = load_input(Input, sys.argv[1])
     
     max_dist = 64
     if len(sys.argv) >= 3:
         max_dist = int(sys.argv[2])
 
-    part1 = Part1(input, max_dist)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input, max_dist)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
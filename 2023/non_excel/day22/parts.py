@@ -1,30 +1,16 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
 import copy
 
-def overlap1d(s1, e1, s2, e2):
-    """
-    Check if overlapping in one dimesion
-    
-    if two ends have same coordinates, they overlap still
-
-    >>> overlap1d(3, 4, 5, 7)
-    False
-    >>> overlap1d(3, 5, 5, 7)
-    True
-    >>> overlap1d(3, 6, 5, 7)
-    True
-    >>> overlap1d(3, 12, 5, 7)
-    True
-    >>> overlap1d(3, 5, 0, 7)
-    True
-    >>> overlap1d(10, 12, 5, 7)
-    False
-    """
-    return s1 <= e2 and s2 <= e1
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.cache import load_input, artifact
+from aoc.reader import read
+from aoc.phases import Phases
+from aoc.intervals import overlap1d
 
 class Brick:
     def __init__(self, xa, ya, za, xb, yb, zb):
@@ -131,32 +117,37 @@ class Stack:
     def calc_depends(self, brick_nr):
         return self.bricks[brick_nr].calc_depends([False] * len(self.bricks))
 
+def packed_stack(input):
+    """
+    Get a packed copy of the stack, shared between parts
+    """
+    def pack():
+        stack = copy.deepcopy(input.stack)
+        stack.pack()
+        return stack
+    return artifact(input, "packed_stack", pack)
+
+
+_re_brick = re.compile(rb"([0-9]+),([0-9]+),([0-9]+)~([0-9]+),([0-9]+),([0-9]+)")
 
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-        re_brick = re.compile(r"([0-9]+),([0-9]+),([0-9]+)~([0-9]+),([0-9]+),([0-9]+)")
-
         self.stack = Stack()
-        for l in f:
-            m = re_brick.fullmatch(l.strip())
-            if m:
-                self.stack.add_brick(Brick(*[int(crd) for crd in m.groups()]))
+        for crds in _re_brick.findall(read(f)):
+            self.stack.add_brick(Brick(*[int(crd) for crd in crds]))
         
 
 class Part1:
     def __init__(self, input):
-        self.stack = copy.deepcopy(input.stack)
+        self.input = input
 
     def run(self):
-        self.stack.pack()
+        self.stack = packed_stack(self.input)
 
         # Nodes that can't be desintegrated is if any brick in contact_up has
         # only one contact_down
@@ -169,24 +160,28 @@ class Part1:
 
 class Part2:
     def __init__(self, input):
-        self.stack = copy.deepcopy(input.stack)
+        self.input = input
 
     def run(self):
-        self.stack.pack()
+        self.stack = packed_stack(self.input)
         return sum(self.stack.calc_depends(i) for i in range(self.stack.num_bricks()))
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = load_input(Input, sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
@@ -1,8 +1,17 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.cache import load_input, artifact
+from aoc.grid import Grid
+from aoc.reader import read, lines
+from aoc.search import longest_path
+from aoc.phases import Phases
+from aoc import trace
+
 def multirange(*dims):
     """
     generate a multi-dimensional range
@@ -26,22 +35,22 @@ def multirange(*dims):
 
 class PxlMap:
     def __init__(self, pxls):
-        self.pxls = [[x for x in xs] for xs in pxls]
+        self.pxls = pxls
     
     def __str__(self):
-        return "\n".join("".join(row) for row in self.pxls)
+        return str(self.pxls)
 
     def width(self):
-        return len(self.pxls[0])
+        return self.pxls.width
 
     def height(self):
-        return len(self.pxls)
+        return self.pxls.height
     
     def get(self, x, y):
-        if x < 0 or y < 0 or x >= self.width() or y >= self.width():
+        if x < 0 or y < 0 or x >= self.pxls.width or y >= self.pxls.height:
             return '#'
         else:
-            return self.pxls[y][x]
+            return self.pxls.char(x, y)
     
     def exits(self, x, y):
         if self.get(x,y) != '#':
@@ -69,15 +78,17 @@ class PxlMap:
     
     def _walk(self, x, y, visited):
         steps = 1
+        tracing = trace.enabled
         while True:
-            #print(f"walk {x},{y}")
-            visited[y][x] = True
+            if tracing:
+                trace.event("day23.walk", x=x, y=y)
+            visited.set(x, y, 1)
 
             if y == 0 or y == self.height()-1:
                 return (x, y, steps)
             
             exits = list(self.exits(x, y))
-            new_exits = [(ex,ey) for ex,ey in exits if not visited[ey][ex]]
+            new_exits = [(ex,ey) for ex,ey in exits if not visited.get(ex, ey)]
             
             if len(exits) > 2:
                 return (x, y, steps)
@@ -87,10 +98,11 @@ class PxlMap:
             steps += 1
 
     def get_nbr_nodes(self, x, y):
-        visited = [[False for x in xs] for xs in self.pxls]
-        visited[y][x] = True
+        visited = Grid(self.pxls.width, self.pxls.height)
+        visited.set(x, y, 1)
         for nx, ny in self.exits(x, y):
-            #print(f"exits {nx},{ny}")
+            if trace.enabled:
+                trace.event("day23.exit", x=nx, y=ny)
             nbr = self._walk(nx, ny, visited)
             if nbr is not None:
                 yield nbr
@@ -111,67 +123,48 @@ class NodeMap:
         # links
         self.nbrs = [[(self.ids[(nbrx, nbry)], steps) for nbrx, nbry, steps in self.pxlmap.get_nbr_nodes(*crd)] for crd, variant in nodes]
     
-    def _get_paths(self, cur, end, visited):
-        if cur == end:
-            yield (0, [cur])
-            return
-
-        visited[cur] = True
-        
-        for nbr, steps in self.nbrs[cur]:
-            if visited[nbr] == False:
-                for remain, remain_path in self._get_paths(nbr, end, visited):
-                    yield steps + remain, [cur] + remain_path
-
-        visited[cur] = False
-
     def longest_path(self):
-        visited = [False for x in self.coords]
-        return self._get_paths(self.start, self.end, visited)
+        return longest_path(self.nbrs, self.start, self.end)
 
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
-        self.pxlmap = PxlMap((pxl for pxl in line.strip()) for line in f.readlines() if line.strip() != "")
+        self.pxlmap = PxlMap(Grid.from_lines(lines(read(f))))
 
 class Part2:
     def __init__(self, input):
+        self.input = input
         self.pxlmap = input.pxlmap
 
     def run(self):
-        #print(str(self.pxlmap))
-        
-        nodemap = NodeMap(self.pxlmap)
-        #print(nodemap.coords)
-        #print(nodemap.nbrs)
+        if trace.enabled:
+            trace.event("day23.pxlmap", pxlmap=str(self.pxlmap))
 
-        
-        longest_len = -1
-        for length, path in nodemap.longest_path():
-            if longest_len < length:
-                longest_len = length
+        nodemap = artifact(self.input, "nodemap", lambda: NodeMap(self.pxlmap))
+        if trace.enabled:
+            trace.event("day23.nodemap", coords=nodemap.coords, nbrs=nodemap.nbrs)
 
-        return longest_len
+        return nodemap.longest_path()
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     failures, tests = doctest.testmod()
     if failures > 0:
         sys.exit(1)
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = load_input(Input, sys.argv[1])
     
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")
 
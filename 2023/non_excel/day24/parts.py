@@ -1,28 +1,12 @@
 #!/bin/env python3
 
+import os
 import sys
 import re
 
-def overlap1d(s1, e1, s2, e2):
-    """
-    Check if overlapping in one dimesion
-    
-    if two ends have same coordinates, they overlap still
-
-    >>> overlap1d(3, 4, 5, 7)
-    False
-    >>> overlap1d(3, 5, 5, 7)
-    True
-    >>> overlap1d(3, 6, 5, 7)
-    True
-    >>> overlap1d(3, 12, 5, 7)
-    True
-    >>> overlap1d(3, 5, 0, 7)
-    True
-    >>> overlap1d(10, 12, 5, 7)
-    False
-    """
-    return s1 <= e2 and s2 <= e1
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aoc.reader import findall
+from aoc.phases import Phases
 
 class Hail:
     def __init__(self, x, y, z, dx, dy, dz):
@@ -54,23 +38,18 @@ class Hail:
         return (ax + at*adx, ay + at*ady)
         
 
+_re_hail = re.compile(rb"^ *([-0-9]+), *([-0-9]+), *([-0-9]+) *@ *([-0-9]+), *([-0-9]+), *([-0-9]+)", re.M)
+
 class Input:
     def __init__(self, f):
         """
         Parse the input file
         
-        f can be either a filename or a file-like object
+        f can be either a filename, a file-like object or a bytes-like object
         """
-        if type(f) == str:
-            f = open(f,"r")
-        
         self.hails = []
-        for l in f:
-            l = l.strip()
-            m = re.fullmatch(r" *([-0-9]+), *([-0-9]+), *([-0-9]+) *@ *([-0-9]+), *([-0-9]+), *([-0-9]+) *", l)
-            if m:
-                crds = m.groups()
-                self.hails.append(Hail(*(int(c) for c in crds)))
+        for crds in findall(_re_hail, f):
+            self.hails.append(Hail(*(int(c) for c in crds)))
 
 class Part1:
     def __init__(self, input):
@@ -100,17 +79,21 @@ class Part2:
         return None
 
 if __name__ == "__main__":
+    phases = Phases(sys.argv)
+
     import doctest
     doctest.testmod()
 
     if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <input file>")
-        sys.exit(1)
+        phases.usage()
 
-    input = Input(sys.argv[1])
+    with phases("input"):
+        input = Input(sys.argv[1])
     
-    part1 = Part1(input)
-    print(f"Part1: {part1.run()}")
+    with phases("part1"):
+        part1 = Part1(input)
+        print(f"Part1: {part1.run()}")
 
-    part2 = Part2(input)
-    print(f"Part2: {part2.run()}")
+    with phases("part2"):
+        part2 = Part2(input)
+        print(f"Part2: {part2.run()}")